@@ -24,6 +24,8 @@ class TTSBackend(Protocol):
         audio_path: str,
         reference_text: str,
         use_cache: bool = True,
+        model_size: Optional[str] = None,
+        cache_key: Optional[str] = None,
     ) -> Tuple[dict, bool]:
         """
         Create voice prompt from reference audio.
@@ -33,6 +35,10 @@ class TTSBackend(Protocol):
         """
         ...
     
+    def get_cached_prompt(self, cache_key: str, model_size: Optional[str] = None) -> Optional[dict]:
+        """Look up a cached voice prompt without reading any audio (None on a miss)."""
+        ...
+    
     async def combine_voice_prompts(
         self,
         audio_paths: List[str],
@@ -53,6 +59,7 @@ class TTSBackend(Protocol):
         language: str = "en",
         seed: Optional[int] = None,
         instruct: Optional[str] = None,
+        model_size: Optional[str] = None,
     ) -> Tuple[np.ndarray, int]:
         """
         Generate audio from text.
@@ -62,14 +69,22 @@ class TTSBackend(Protocol):
         """
         ...
     
-    def unload_model(self) -> None:
-        """Unload model to free memory."""
+    def unload_model(self, model_size: Optional[str] = None) -> None:
+        """Unload one model size, or all resident models, to free memory."""
         ...
     
     def is_loaded(self) -> bool:
         """Check if model is loaded."""
         ...
     
+    def get_resident_model_sizes(self) -> List[str]:
+        """Get the model sizes currently loaded in memory."""
+        ...
+    
+    def get_resident_models(self) -> List[dict]:
+        """Get resident models with model_size and, if known, memory_mb and last_used."""
+        ...
+    
     def _get_model_path(self, model_size: str) -> str:
         """
         Get model path for a given size.
@@ -8,12 +8,19 @@ import numpy as np
 from pathlib import Path
 
 from . import TTSBackend, STTBackend
-from ..utils.cache import get_cache_key, get_cached_voice_prompt, cache_voice_prompt
-from ..utils.audio import normalize_audio, load_audio
+from ..utils.cache import (
+    get_sample_cache_key,
+    get_cached_voice_prompt,
+    cache_voice_prompt,
+    release_prompt_namespace,
+)
+from ..utils.audio import normalize_audio
+from ..utils.audio_cache import load_audio_cached
 from ..utils.progress import get_progress_manager
 from ..utils.hf_progress import HFProgressTracker, create_hf_progress_callback
 from ..utils.tasks import get_task_manager
 from ..utils.lexicon import enhance_text_with_lexicon
+from ..utils.cancellation import CancellationToken, GenerationCancelled, cancellation_scope, check_cancelled
 
 
 class MLXTTSBackend:
@@ -197,19 +204,64 @@ class MLXTTSBackend:
             task_manager.error_download(model_name, str(e))
             raise
     
-    def unload_model(self):
-        """Unload the model to free memory."""
+    def unload_model(self, model_size: Optional[str] = None):
+        """
+        Unload the model to free memory.
+        
+        Args:
+            model_size: Only unload if this size is loaded; any size when None
+        """
+        if model_size is not None and model_size != self._current_model_size:
+            return
         if self.model is not None:
+            release_prompt_namespace("mlx", self._get_model_path(self._current_model_size))
             del self.model
             self.model = None
             self._current_model_size = None
             print("MLX TTS model unloaded")
     
+    def get_resident_model_sizes(self) -> List[str]:
+        """Get the loaded model size (MLX keeps one model at a time)."""
+        return [self._current_model_size] if self.model is not None else []
+    
+    def get_resident_models(self) -> List[dict]:
+        """Get the loaded model in the same shape as the PyTorch pool."""
+        return [{"model_size": size} for size in self.get_resident_model_sizes()]
+    
+    def get_cached_prompt(self, cache_key: str, model_size: Optional[str] = None) -> Optional[dict]:
+        """
+        Look up a cached voice prompt without reading any audio.
+        
+        MLX prompts reference their audio file, so a prompt whose file is
+        gone counts as a miss.
+        
+        Args:
+            cache_key: Cache key the prompt was stored under
+            model_size: Model size the prompt was built with (defaults to the current one)
+            
+        Returns:
+            Cached voice prompt, or None on a miss
+        """
+        if model_size is None:
+            model_size = self.model_size
+        cached_prompt = get_cached_voice_prompt(cache_key, self._get_model_path(model_size), "mlx")
+        # Return cached prompt (should be dict format)
+        if isinstance(cached_prompt, dict):
+            # Validate that the cached audio file still exists
+            cached_audio_path = cached_prompt.get("ref_audio") or cached_prompt.get("ref_audio_path")
+            if cached_audio_path and Path(cached_audio_path).exists():
+                return cached_prompt
+            # Cached file no longer exists, invalidate cache
+            print(f"Cached audio file not found: {cached_audio_path}, regenerating prompt")
+        return None
+    
     async def create_voice_prompt(
         self,
         audio_path: str,
         reference_text: str,
         use_cache: bool = True,
+        model_size: Optional[str] = None,
+        cache_key: Optional[str] = None,
     ) -> Tuple[dict, bool]:
         """
         Create voice prompt from reference audio.
@@ -221,26 +273,23 @@ class MLXTTSBackend:
             audio_path: Path to reference audio file
             reference_text: Transcript of reference audio
             use_cache: Whether to use cached prompt if available
+            model_size: Model size to use (defaults to the current one)
+            cache_key: Precomputed cache key of the sample (looked up if None)
             
         Returns:
             Tuple of (voice_prompt_dict, was_cached)
         """
-        await self.load_model_async(None)
+        await self.load_model_async(model_size)
+        model_id = self._get_model_path(self._current_model_size)
+        
+        if use_cache and cache_key is None:
+            cache_key, _ = get_sample_cache_key(str(audio_path), reference_text)
         
         # Check cache if enabled
         if use_cache:
-            cache_key = get_cache_key(audio_path, reference_text)
-            cached_prompt = get_cached_voice_prompt(cache_key)
+            cached_prompt = self.get_cached_prompt(cache_key, self._current_model_size)
             if cached_prompt is not None:
-                # Return cached prompt (should be dict format)
-                if isinstance(cached_prompt, dict):
-                    # Validate that the cached audio file still exists
-                    cached_audio_path = cached_prompt.get("ref_audio") or cached_prompt.get("ref_audio_path")
-                    if cached_audio_path and Path(cached_audio_path).exists():
-                        return cached_prompt, True
-                    else:
-                        # Cached file no longer exists, invalidate cache
-                        print(f"Cached audio file not found: {cached_audio_path}, regenerating prompt")
+                return cached_prompt, True
         
         # MLX voice prompt format - store audio path and text
         # The model will process this during generation
@@ -251,8 +300,7 @@ class MLXTTSBackend:
         
         # Cache if enabled
         if use_cache:
-            cache_key = get_cache_key(audio_path, reference_text)
-            cache_voice_prompt(cache_key, voice_prompt_items)
+            cache_voice_prompt(cache_key, voice_prompt_items, model_id, "mlx")
         
         return voice_prompt_items, False
     
@@ -274,7 +322,7 @@ class MLXTTSBackend:
         combined_audio = []
         
         for audio_path in audio_paths:
-            audio, sr = load_audio(audio_path)
+            audio, sr = load_audio_cached(audio_path)
             audio = normalize_audio(audio)
             combined_audio.append(audio)
         
@@ -294,6 +342,7 @@ class MLXTTSBackend:
         language: str = "en",
         seed: Optional[int] = None,
         instruct: Optional[str] = None,
+        model_size: Optional[str] = None,
     ) -> Tuple[np.ndarray, int]:
         """
         Generate audio from text using voice prompt.
@@ -304,11 +353,12 @@ class MLXTTSBackend:
             language: Language code (en, zh, tl, nl, nl_be, etc.) - may not be fully supported by MLX
             seed: Random seed for reproducibility
             instruct: Natural language instruction (may not be supported by MLX)
+            model_size: Model size to use (defaults to the current one)
 
         Returns:
             Tuple of (audio_array, sample_rate)
         """
-        await self.load_model_async(None)
+        await self.load_model_async(model_size)
 
         # Enhance text with lexicon for better pronunciation
         enhanced_text = enhance_text_with_lexicon(text, language)
@@ -351,22 +401,28 @@ class MLXTTSBackend:
                         for result in self.model.generate(enhanced_text, ref_audio=ref_audio, ref_text=ref_text):
                             audio_chunks.append(np.array(result.audio))
                             sample_rate = result.sample_rate
+                            check_cancelled()
                     else:
                         # Fallback: generate without voice cloning
                         for result in self.model.generate(enhanced_text):
                             audio_chunks.append(np.array(result.audio))
                             sample_rate = result.sample_rate
+                            check_cancelled()
                 else:
                     # No voice prompt, generate normally
                     for result in self.model.generate(enhanced_text):
                         audio_chunks.append(np.array(result.audio))
                         sample_rate = result.sample_rate
+                        check_cancelled()
+            except GenerationCancelled:
+                raise
             except Exception as e:
                 # If voice cloning fails, try without it
                 print(f"Warning: Voice cloning failed, generating without voice prompt: {e}")
                 for result in self.model.generate(enhanced_text):
                     audio_chunks.append(np.array(result.audio))
                     sample_rate = result.sample_rate
+                    check_cancelled()
             
             # Concatenate all chunks
             if audio_chunks:
@@ -377,8 +433,19 @@ class MLXTTSBackend:
             
             return audio, sample_rate
 
+        token = CancellationToken()
+
+        def _generate_cancellable():
+            # Each yielded segment is a cancellation point
+            with cancellation_scope([token]):
+                return _generate_sync()
+
         # Run blocking inference in thread pool
-        audio, sample_rate = await asyncio.to_thread(_generate_sync)
+        try:
+            audio, sample_rate = await asyncio.to_thread(_generate_cancellable)
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
 
         return audio, sample_rate
 
@@ -2,29 +2,58 @@
 PyTorch backend implementation for TTS and STT.
 """
 
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
+from collections import OrderedDict
 import asyncio
+import gc
+import time
 import torch
 import numpy as np
 from pathlib import Path
 
 from . import TTSBackend, STTBackend
-from ..utils.cache import get_cache_key, get_cached_voice_prompt, cache_voice_prompt
+from ..utils.cache import (
+    get_sample_cache_key,
+    get_cached_voice_prompt,
+    cache_voice_prompt,
+    release_prompt_namespace,
+)
 from ..utils.audio import normalize_audio, load_audio
+from ..utils.audio_cache import load_audio_cached
 from ..utils.progress import get_progress_manager
 from ..utils.hf_progress import HFProgressTracker, create_hf_progress_callback
 from ..utils.tasks import get_task_manager
 from ..utils.lexicon import enhance_text_with_lexicon
+from ..utils.batching import MicroBatcher
+from ..utils.cancellation import CancellationToken, cancellation_scope, check_cancelled
+from ..utils.process_pool import InferenceProcessPool, WorkerUnavailable
+from .. import config
 
 
 class PyTorchTTSBackend:
     """PyTorch-based TTS backend using Qwen3-TTS."""
     
     def __init__(self, model_size: str = "1.7B"):
-        self.model = None
+        self.model = None  # Most recently used resident model
         self.model_size = model_size
         self.device = self._get_device()
         self._current_model_size = None
+        # Resident models by size, least recently used first
+        self._resident_models: "OrderedDict[str, Any]" = OrderedDict()
+        self._resident_bytes: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._memory_budget = config.get_model_memory_budget_bytes()
+        self._load_lock: Optional[asyncio.Lock] = None
+        # Optional worker processes sharing one model's weights
+        self._process_pool: Optional[InferenceProcessPool] = None
+        self._pool_model = None
+        self._pool_model_size: Optional[str] = None
+        # Concurrent unseeded generate calls are merged into batched forward passes
+        self._batcher = MicroBatcher(
+            self._generate_batch_sync,
+            max_batch_size=config.get_batch_max_size(),
+            window_ms=config.get_batch_window_ms(),
+        )
     
     def _get_device(self) -> str:
         """Get the best available device."""
@@ -117,28 +146,150 @@ class PyTorchTTSBackend:
         """
         Lazy load the TTS model with automatic downloading from HuggingFace Hub.
         
+        Several sizes can stay resident within the memory budget; loading a
+        size that does not fit evicts the least recently used ones first.
+        
         Args:
             model_size: Model size to load (1.7B or 0.6B)
         """
+        await self._acquire_model(model_size)
+    
+    async def _acquire_model(self, model_size: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        Make a model size resident and mark it as most recently used.
+        
+        Returns:
+            Tuple of (model_size, model). Use the returned model rather than
+            self.model, which may switch while a request is running.
+        """
         if model_size is None:
             model_size = self.model_size
-            
-        # If already loaded with correct size, return
-        if self.model is not None and self._current_model_size == model_size:
-            return
         
-        # Unload existing model if different size requested
-        if self.model is not None and self._current_model_size != model_size:
-            self.unload_model()
+        if model_size not in self._resident_models:
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if model_size not in self._resident_models:
+                    # Make room first so peak memory stays within the budget
+                    self._evict_for(self._estimate_model_bytes(model_size))
+                    # Run blocking load in thread pool; only the event loop
+                    # touches the shared model fields
+                    model = await asyncio.to_thread(self._load_model_sync, model_size)
+                    self._register_resident(model_size, model)
         
-        # Run blocking load in thread pool
-        await asyncio.to_thread(self._load_model_sync, model_size)
+        return model_size, self._use_model(model_size)
+    
+    def _use_model(self, model_size: str) -> Any:
+        """Mark a resident model as most recently used and make it current."""
+        self._resident_models.move_to_end(model_size)
+        self._last_used[model_size] = time.time()
+        self.model = self._resident_models[model_size]
+        self._current_model_size = model_size
+        self.model_size = model_size
+        return self.model
+    
+    def _register_resident(self, model_size: str, model: Any) -> None:
+        """Add a freshly loaded model to the pool and enforce the budget."""
+        self._install_cancellation_hook(model)
+        measured = self._measure_model_bytes(model)
+        self._resident_bytes[model_size] = measured or self._estimate_model_bytes(model_size)
+        self._resident_models[model_size] = model
+        self._use_model(model_size)
+        # The estimate may have been low; never evict the model just loaded
+        self._evict_for(0, keep=model_size)
+    
+    def _evict_for(self, incoming_bytes: int, keep: Optional[str] = None) -> None:
+        """
+        Evict least recently used models until incoming_bytes fits the budget.
+        
+        A budget of 0 keeps a single model resident. The model shared with
+        worker processes is never evicted.
+        """
+        def evictable() -> List[str]:
+            return [
+                size for size in self._resident_models
+                if size != keep and size != self._pool_model_size
+            ]
+        
+        def over_budget() -> bool:
+            if not evictable():
+                return False
+            if self._memory_budget <= 0:
+                return True
+            used = sum(self._resident_bytes.get(size, 0) for size in self._resident_models)
+            return used + incoming_bytes > self._memory_budget
+        
+        evicted = False
+        while over_budget():
+            self._evict(evictable()[0])
+            evicted = True
+        
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+    
+    def _evict(self, model_size: str) -> None:
+        """Drop a resident model. Requests already using it keep their reference."""
+        model = self._resident_models.pop(model_size)
+        self._resident_bytes.pop(model_size, None)
+        self._last_used.pop(model_size, None)
+        if self.model is model:
+            self.model = None
+            self._current_model_size = None
+        # Prompts are model-specific; free this model's and keep the others warm
+        release_prompt_namespace("pytorch", self._get_model_path(model_size))
+        print(f"TTS model {model_size} evicted")
+    
+    def _measure_model_bytes(self, model: Any) -> int:
+        """Count parameter and buffer bytes of a loaded model (0 if unknown)."""
+        module = getattr(model, "model", model)
+        if not isinstance(module, torch.nn.Module):
+            return 0
+        tensors = list(module.parameters()) + list(module.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    
+    def _estimate_model_bytes(self, model_size: str) -> int:
+        """Estimate the memory a model size needs before it is loaded."""
+        if model_size in self._resident_bytes:
+            return self._resident_bytes[model_size]
+        try:
+            from huggingface_hub import constants as hf_constants
+            repo_cache = Path(hf_constants.HF_HUB_CACHE) / (
+                "models--" + self._get_model_path(model_size).replace("/", "--")
+            )
+            weights = list((repo_cache / "snapshots").rglob("*.safetensors"))
+            disk_bytes = sum(f.stat().st_size for f in weights)
+        except Exception:
+            return 0
+        # Checkpoints are stored in half precision; CPU loads them as float32
+        return disk_bytes * 2 if self.device == "cpu" else disk_bytes
+    
+    def get_resident_models(self) -> List[Dict[str, Any]]:
+        """Get resident model sizes, least recently used first."""
+        return [
+            {
+                "model_size": size,
+                "memory_mb": self._resident_bytes.get(size, 0) / (1024 * 1024),
+                "last_used": self._last_used.get(size),
+            }
+            for size in self._resident_models
+        ]
+    
+    def get_memory_budget(self) -> int:
+        """Get the model memory budget in bytes (0 means one model at a time)."""
+        return self._memory_budget
     
     # Alias for compatibility
     load_model = load_model_async
     
-    def _load_model_sync(self, model_size: str):
-        """Synchronous model loading."""
+    def _load_model_sync(self, model_size: str) -> Any:
+        """
+        Synchronous model loading.
+        
+        Runs in a worker thread, so it returns the model instead of setting
+        self.model; the caller registers it on the event loop.
+        """
         try:
             progress_manager = get_progress_manager()
             task_manager = get_task_manager()
@@ -185,13 +336,13 @@ class PyTorchTTSBackend:
                 # causes "Cannot copy out of meta tensor" when moving to CPU.
                 # Instead load directly then call .to(device) if needed.
                 if self.device == "cpu":
-                    self.model = Qwen3TTSModel.from_pretrained(
+                    model = Qwen3TTSModel.from_pretrained(
                         model_path,
                         torch_dtype=torch.float32,
                         low_cpu_mem_usage=False,
                     )
                 else:
-                    self.model = Qwen3TTSModel.from_pretrained(
+                    model = Qwen3TTSModel.from_pretrained(
                         model_path,
                         device_map=self.device,
                         torch_dtype=torch.bfloat16,
@@ -205,10 +356,8 @@ class PyTorchTTSBackend:
                 progress_manager.mark_complete(model_name)
                 task_manager.complete_download(model_name)
             
-            self._current_model_size = model_size
-            self.model_size = model_size
-            
             print(f"TTS model {model_size} loaded successfully")
+            return model
             
         except ImportError as e:
             print(f"Error: qwen_tts package not found. Install with: pip install git+https://github.com/QwenLM/Qwen3-TTS.git")
@@ -228,23 +377,183 @@ class PyTorchTTSBackend:
             task_manager.error_download(model_name, str(e))
             raise
     
-    def unload_model(self):
-        """Unload the model to free memory."""
-        if self.model is not None:
-            del self.model
-            self.model = None
-            self._current_model_size = None
+    def _install_cancellation_hook(self, model: Any) -> None:
+        """
+        Make the decoding loop a cancellation point.
+
+        generate_voice_clone does not forward stopping criteria to the talker's
+        generate, so a forward pre-hook on the talker (run once per decoding
+        step) checks the calling thread's cancellation tokens instead.
+        """
+        wrapped = getattr(model, "model", None)
+        module = getattr(wrapped, "talker", wrapped)
+        if isinstance(module, torch.nn.Module):
+            module.register_forward_pre_hook(lambda _module, _args: check_cancelled())
+
+    def unload_model(self, model_size: Optional[str] = None):
+        """
+        Unload models to free memory.
+        
+        Args:
+            model_size: Size to unload; all resident models when None
+        """
+        sizes = [model_size] if model_size else list(self._resident_models)
+        sizes = [size for size in sizes if size in self._resident_models]
+        if not sizes:
+            return
+        
+        if self._pool_model_size in sizes:
+            self.stop_process_pool()
+        
+        for size in sizes:
+            self._evict(size)
+        
+        # Fall back to the most recently used remaining model, if any
+        if self._resident_models:
+            self._use_model(next(reversed(self._resident_models)))
+        
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        
+        print("TTS model unloaded")
+    
+    def get_resident_model_sizes(self) -> List[str]:
+        """Get the model sizes currently resident in memory."""
+        return list(self._resident_models)
+    
+    async def start_process_pool(
+        self,
+        num_processes: int,
+        model_size: Optional[str] = None,
+        threads_per_process: int = 0,
+    ) -> bool:
+        """
+        Serve generation for one model size from forked worker processes.
+        
+        The model is loaded here first and the workers are forked after, so
+        they share its weights copy-on-write. Requests for other sizes keep
+        running in this process.
+        
+        Call it at startup, before anything has run inference here. OpenMP
+        thread pools do not survive fork, so the load runs on a single
+        intra-op thread and the thread count is restored once the workers
+        exist; the workers then start their own pools.
+        
+        Args:
+            num_processes: Number of worker processes
+            model_size: Model size the workers serve
+            threads_per_process: torch threads per worker (0 = its core slice)
             
+        Returns:
+            True if the workers were started
+        """
+        if self._process_pool is not None:
+            return True
+        if self.device != "cpu" or not InferenceProcessPool.is_supported():
+            # CUDA state does not survive fork, and spawn would copy the weights
+            print("Inference worker processes need a CPU device and fork(); running in-process")
+            return False
+        
+        num_threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+        try:
+            model_size, model = await self._acquire_model(model_size)
+            pool = InferenceProcessPool(
+                lambda request: self._run_worker_request(model, request),
+                num_processes=num_processes,
+                threads_per_process=threads_per_process,
+            )
+            pool.start()
+        finally:
+            torch.set_num_threads(num_threads)
+        self._process_pool = pool
+        self._pool_model = model
+        self._pool_model_size = model_size
+        return True
+    
+    def stop_process_pool(self) -> None:
+        """Stop the worker processes; generation continues in-process."""
+        pool, self._process_pool = self._process_pool, None
+        self._pool_model = None
+        self._pool_model_size = None
+        if pool is not None:
+            pool.stop()
+    
+    @staticmethod
+    def _run_worker_request(model: Any, request: dict) -> Tuple[list, int]:
+        """Run one generate_voice_clone call inside a worker process."""
+        seed = request.pop("seed", None)
+        if seed is not None:
+            torch.manual_seed(seed)
+        return model.generate_voice_clone(**request)
+    
+    def _generate_voice_clone(
+        self,
+        model: Any,
+        tokens: List[CancellationToken],
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> Tuple[list, int]:
+        """
+        Run generate_voice_clone on a worker process if one serves this
+        model, otherwise in the calling thread.
+        
+        Blocking; call from a worker thread.
+        """
+        pool = self._process_pool
+        if pool is not None and model is self._pool_model and pool.available:
+            try:
+                return pool.call({**kwargs, "seed": seed}, tokens)
+            except WorkerUnavailable as e:
+                print(f"{e}; generating in-process")
+        
+        if seed is not None:
+            torch.manual_seed(seed)
             if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+                torch.cuda.manual_seed(seed)
+        with cancellation_scope(tokens):
+            return model.generate_voice_clone(**kwargs)
+    
+    def get_process_pool_stats(self) -> Optional[dict]:
+        """Get worker process stats, or None when running in-process."""
+        if self._process_pool is None:
+            return None
+        return {"model_size": self._pool_model_size, **self._process_pool.get_stats()}
+    
+    def get_cached_prompt(self, cache_key: str, model_size: Optional[str] = None) -> Optional[dict]:
+        """
+        Look up a cached voice prompt without reading any audio.
+        
+        Args:
+            cache_key: Cache key the prompt was stored under
+            model_size: Model size the prompt was built with (defaults to the current one)
             
-            print("TTS model unloaded")
+        Returns:
+            Cached voice prompt, or None on a miss
+        """
+        if model_size is None:
+            model_size = self.model_size
+        cached_prompt = get_cached_voice_prompt(cache_key, self._get_model_path(model_size), "pytorch")
+        # Cache stores as torch.Tensor but actual prompt is a list of
+        # prompt items (or a dict). Convert if needed
+        if isinstance(cached_prompt, (list, dict)):
+            # For PyTorch backend, the prompt should contain tensors, not file paths
+            # So we can safely return it
+            return cached_prompt
+        if isinstance(cached_prompt, torch.Tensor):
+            # Legacy cache format - convert to dict
+            # This shouldn't happen in practice, but handle it
+            return {"prompt": cached_prompt}
+        return None
     
     async def create_voice_prompt(
         self,
         audio_path: str,
         reference_text: str,
         use_cache: bool = True,
+        model_size: Optional[str] = None,
+        cache_key: Optional[str] = None,
     ) -> Tuple[dict, bool]:
         """
         Create voice prompt from reference audio.
@@ -253,31 +562,27 @@ class PyTorchTTSBackend:
             audio_path: Path to reference audio file
             reference_text: Transcript of reference audio
             use_cache: Whether to use cached prompt if available
+            model_size: Model size to use (defaults to the current one)
+            cache_key: Precomputed cache key of the sample (looked up if None)
             
         Returns:
             Tuple of (voice_prompt_dict, was_cached)
         """
-        await self.load_model_async(None)
+        model_size, model = await self._acquire_model(model_size)
+        model_id = self._get_model_path(model_size)
+        
+        if use_cache and cache_key is None:
+            cache_key, _ = get_sample_cache_key(str(audio_path), reference_text)
         
         # Check cache if enabled
         if use_cache:
-            cache_key = get_cache_key(audio_path, reference_text)
-            cached_prompt = get_cached_voice_prompt(cache_key)
+            cached_prompt = self.get_cached_prompt(cache_key, model_size)
             if cached_prompt is not None:
-                # Cache stores as torch.Tensor but actual prompt is dict
-                # Convert if needed
-                if isinstance(cached_prompt, dict):
-                    # For PyTorch backend, the dict should contain tensors, not file paths
-                    # So we can safely return it
-                    return cached_prompt, True
-                elif isinstance(cached_prompt, torch.Tensor):
-                    # Legacy cache format - convert to dict
-                    # This shouldn't happen in practice, but handle it
-                    return {"prompt": cached_prompt}, True
+                return cached_prompt, True
         
         def _create_prompt_sync():
             """Run synchronous voice prompt creation in thread pool."""
-            return self.model.create_voice_clone_prompt(
+            return model.create_voice_clone_prompt(
                 ref_audio=str(audio_path),
                 ref_text=reference_text,
                 x_vector_only_mode=False,
@@ -288,8 +593,7 @@ class PyTorchTTSBackend:
         
         # Cache if enabled
         if use_cache:
-            cache_key = get_cache_key(audio_path, reference_text)
-            cache_voice_prompt(cache_key, voice_prompt_items)
+            cache_voice_prompt(cache_key, voice_prompt_items, model_id, "pytorch")
         
         return voice_prompt_items, False
     
@@ -311,7 +615,7 @@ class PyTorchTTSBackend:
         combined_audio = []
         
         for audio_path in audio_paths:
-            audio, sr = load_audio(audio_path)
+            audio, sr = load_audio_cached(audio_path)
             audio = normalize_audio(audio)
             combined_audio.append(audio)
         
@@ -331,6 +635,7 @@ class PyTorchTTSBackend:
         language: str = "en",
         seed: Optional[int] = None,
         instruct: Optional[str] = None,
+        model_size: Optional[str] = None,
     ) -> Tuple[np.ndarray, int]:
         """
         Generate audio from text using voice prompt.
@@ -341,37 +646,95 @@ class PyTorchTTSBackend:
             language: Language code (en, zh, tl, nl, nl_be, etc.)
             seed: Random seed for reproducibility
             instruct: Natural language instruction for speech delivery control
+            model_size: Model size to use (defaults to the current one)
 
         Returns:
             Tuple of (audio_array, sample_rate)
         """
-        # Load model
-        await self.load_model_async(None)
+        # Load model; keep a reference so an eviction cannot pull it mid-call
+        model_size, model = await self._acquire_model(model_size)
 
         # Enhance text with lexicon for better pronunciation
         enhanced_text = enhance_text_with_lexicon(text, language)
 
+        # Unseeded calls with a single-item prompt can share a forward pass.
+        # Seeded calls run alone so the global RNG state stays reproducible.
+        if (
+            self._batcher.enabled
+            and seed is None
+            and isinstance(voice_prompt, list)
+            and len(voice_prompt) == 1
+        ):
+            token = CancellationToken()
+            try:
+                return await self._batcher.submit(
+                    (enhanced_text, voice_prompt, instruct, token, model),
+                    group_key=(model_size, instruct),
+                )
+            except asyncio.CancelledError:
+                token.cancel()
+                raise
+
+        token = CancellationToken()
+
         def _generate_sync():
             """Run synchronous generation in thread pool."""
-            # Set seed if provided
-            if seed is not None:
-                torch.manual_seed(seed)
-                if torch.cuda.is_available():
-                    torch.cuda.manual_seed(seed)
-
             # Generate audio - this is the blocking operation
-            wavs, sample_rate = self.model.generate_voice_clone(
+            wavs, sample_rate = self._generate_voice_clone(
+                model,
+                [token],
+                seed=seed,
                 text=enhanced_text,
                 voice_clone_prompt=voice_prompt,
                 instruct=instruct,
             )
             return wavs[0], sample_rate
 
-        # Run blocking inference in thread pool to avoid blocking event loop
-        audio, sample_rate = await asyncio.to_thread(_generate_sync)
+        # Run blocking inference in thread pool to avoid blocking event loop.
+        # The thread cannot be interrupted, so a cancelled caller flags the
+        # token and decoding stops at its next step.
+        try:
+            audio, sample_rate = await asyncio.to_thread(_generate_sync)
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
 
         return audio, sample_rate
 
+    def _generate_batch_sync(
+        self,
+        items: List[Tuple[str, list, Optional[str], CancellationToken, Any]],
+    ) -> List[Tuple[np.ndarray, int]]:
+        """
+        Generate several texts in one batched forward pass.
+
+        Args:
+            items: (text, voice_prompt, instruct, token, model) tuples sharing
+                one instruct and model; the batch stops early only if every
+                token is cancelled
+
+        Returns:
+            List of (audio_array, sample_rate) in input order
+        """
+        texts = [text for text, _, _, _, _ in items]
+        # One prompt item per text; the model pairs them up by index
+        prompt_items = [prompt[0] for _, prompt, _, _, _ in items]
+        instruct = items[0][2]
+        model = items[0][4]
+
+        wavs, sample_rate = self._generate_voice_clone(
+            model,
+            [token for _, _, _, token, _ in items],
+            text=texts,
+            voice_clone_prompt=prompt_items,
+            instruct=instruct,
+        )
+        return [(wav, sample_rate) for wav in wavs]
+
+    def get_batching_stats(self) -> dict:
+        """Get micro-batching configuration and batch-size histogram."""
+        return self._batcher.get_stats()
+
 
 class PyTorchSTTBackend:
     """PyTorch-based STT backend using Whisper."""
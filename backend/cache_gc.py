@@ -0,0 +1,145 @@
+"""
+Garbage collection of the voice prompt cache directory.
+
+Prompts and combined sample audio are written for every sample, sample set
+and model, and are otherwise only removed by clearing the whole cache. The
+collector works out which cache keys the current profiles still use, then
+deletes orphans and evicts least recently used files down to a disk quota
+(see collect_cache_garbage). It runs periodically and on demand.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+import asyncio
+
+from . import config, database, profiles
+from .database import ProfileSample as DBProfileSample
+from .utils.cache import _get_cache_dir, collect_cache_garbage
+from .utils.result_cache import get_result_cache
+
+
+async def get_live_cache_entries() -> Tuple[Set[str], Set[str]]:
+    """
+    Get the cache keys and combined audio files current profiles use.
+
+    Returns:
+        Tuple of (prompt cache keys, combined audio file names)
+    """
+    live_keys: Set[str] = set()
+    live_combined: Set[str] = set()
+    cache_dir = _get_cache_dir()
+    db = database.SessionLocal()
+    try:
+        profile_ids = [row[0] for row in db.query(DBProfileSample.profile_id).distinct()]
+        for profile_id in profile_ids:
+            # Same query as prompt creation, so samples come in the same order
+            samples = db.query(DBProfileSample).filter_by(profile_id=profile_id).all()
+            try:
+                sample_keys = await profiles._get_sample_cache_keys(samples, db)
+            except OSError as e:
+                # A sample file is unreadable; keep whatever this profile has
+                print(f"Cache GC keeps all entries of profile {profile_id}: {e}")
+                live_keys.update(s.cache_key for s in samples if s.cache_key)
+                live_combined.update(p.name for p in cache_dir.glob(f"combined_{profile_id}_*.wav"))
+                continue
+            live_keys.update(sample_keys)
+            if len(samples) > 1:
+                combined_key = profiles.combined_prompt_key(sample_keys)
+                live_keys.add(combined_key)
+                live_combined.add(profiles.combined_audio_name(profile_id, combined_key))
+    finally:
+        db.close()
+    return live_keys, live_combined
+
+
+class CacheCollector:
+    """Runs cache garbage collection on a schedule and on demand."""
+
+    def __init__(self):
+        self.runs = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_result: Optional[Dict[str, int]] = None
+        self.interval_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def start(self, interval_seconds: float) -> None:
+        """
+        Start periodic collection.
+
+        Must be called from within the running event loop.
+
+        Args:
+            interval_seconds: Time between runs (0 disables the schedule)
+        """
+        if interval_seconds <= 0 or self._task is not None:
+            return
+        self.interval_seconds = interval_seconds
+        self._task = asyncio.create_task(self._loop(interval_seconds))
+
+    async def stop(self) -> None:
+        """Stop periodic collection."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _loop(self, interval_seconds: float) -> None:
+        """Collect every interval_seconds."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.collect()
+            except Exception as e:
+                print(f"Cache GC failed: {e}")
+
+    async def collect(self) -> Dict[str, int]:
+        """
+        Run one collection now.
+
+        Returns:
+            Counts of deleted files and the remaining usage
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Persist result cache recency batched up since the last save
+            await asyncio.to_thread(get_result_cache().flush)
+            live_keys, live_combined = await get_live_cache_entries()
+            result = await asyncio.to_thread(
+                collect_cache_garbage,
+                config.get_cache_max_bytes(),
+                live_keys,
+                live_combined,
+            )
+            self.runs += 1
+            self.last_run_at = datetime.utcnow()
+            self.last_result = result
+        if result["orphans_deleted"] or result["evicted"]:
+            print(
+                f"Cache GC removed {result['orphans_deleted']} orphaned and "
+                f"{result['evicted']} least recently used files"
+            )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the quota, schedule and outcome of the last run."""
+        return {
+            "max_bytes": config.get_cache_max_bytes(),
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_result": self.last_result,
+        }
+
+
+# Global cache collector instance
+_cache_collector: Optional[CacheCollector] = None
+
+
+def get_cache_collector() -> CacheCollector:
+    """Get or create the global cache collector."""
+    global _cache_collector
+    if _cache_collector is None:
+        _cache_collector = CacheCollector()
+    return _cache_collector
@@ -73,3 +73,342 @@ def get_models_dir() -> Path:
     path = _data_dir / "models"
     path.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def _get_env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"[config] Ignoring invalid integer for {name}: {value!r}")
+        return default
+
+
+def _get_env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"[config] Ignoring invalid number for {name}: {value!r}")
+        return default
+
+
+def _get_env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting (1/true/yes/on) from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_generation_workers() -> int:
+    """
+    Get the number of inference workers draining the generation job queue.
+
+    Set EBURON_ECHO_GENERATION_WORKERS to tune throughput per host.
+    """
+    return max(1, _get_env_int("EBURON_ECHO_GENERATION_WORKERS", 1))
+
+
+def get_generation_queue_size() -> int:
+    """
+    Get the maximum number of queued generation jobs.
+
+    Set EBURON_ECHO_GENERATION_QUEUE_SIZE to bound the backlog.
+    """
+    return max(1, _get_env_int("EBURON_ECHO_GENERATION_QUEUE_SIZE", 100))
+
+
+def get_scheduler_affinity_max_skips() -> int:
+    """
+    Get how many times a queued job may be passed over for model affinity.
+
+    The job scheduler prefers jobs that reuse the last job's model size and
+    profile; this bounds how long other jobs of equal priority can wait. Set
+    EBURON_ECHO_AFFINITY_MAX_SKIPS to 0 for strict FIFO within a priority.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_AFFINITY_MAX_SKIPS", 8))
+
+
+def get_batch_max_size() -> int:
+    """
+    Get the maximum number of generate calls merged into one forward pass.
+
+    Micro-batching is off by default (1): every batched call waits out the
+    batch window, which only pays off under concurrent load. Set
+    EBURON_ECHO_BATCH_MAX_SIZE above 1 on busy servers to enable it.
+    """
+    return max(1, _get_env_int("EBURON_ECHO_BATCH_MAX_SIZE", 1))
+
+
+def get_batch_window_ms() -> float:
+    """
+    Get how long (ms) a generate call waits for others to batch with.
+
+    Set EBURON_ECHO_BATCH_WINDOW_MS to trade latency for batch size.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_BATCH_WINDOW_MS", 30.0))
+
+
+def get_long_form_threshold() -> int:
+    """
+    Get the text length (characters) above which long-form mode kicks in.
+
+    Applies when a request leaves long_form unset. Set
+    EBURON_ECHO_LONG_FORM_THRESHOLD to change it.
+    """
+    return max(1, _get_env_int("EBURON_ECHO_LONG_FORM_THRESHOLD", 600))
+
+
+def get_long_form_max_chunk_chars() -> int:
+    """
+    Get the target maximum characters per long-form chunk.
+
+    Set EBURON_ECHO_LONG_FORM_MAX_CHUNK_CHARS to change it.
+    """
+    return max(20, _get_env_int("EBURON_ECHO_LONG_FORM_MAX_CHUNK_CHARS", 300))
+
+
+def get_long_form_concurrency() -> int:
+    """
+    Get how many long-form chunks of one request render at once.
+
+    Concurrent chunks are merged by the backend's micro-batcher when it is
+    enabled. Set EBURON_ECHO_LONG_FORM_CONCURRENCY to change it.
+    """
+    return max(1, _get_env_int("EBURON_ECHO_LONG_FORM_CONCURRENCY", 4))
+
+
+def get_long_form_silence_ms() -> float:
+    """
+    Get the silence (ms) inserted between long-form chunks.
+
+    Set EBURON_ECHO_LONG_FORM_SILENCE_MS=0 to crossfade chunks directly.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_LONG_FORM_SILENCE_MS", 120.0))
+
+
+def get_result_cache_max_bytes() -> int:
+    """
+    Get the disk budget of the generation result cache.
+
+    Set EBURON_ECHO_RESULT_CACHE_MAX_MB (default 512); 0 disables the cache.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_RESULT_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+
+def get_result_cache_reuse_entry() -> bool:
+    """
+    Whether a result cache hit returns the original history entry.
+
+    By default a hit creates a new history entry pointing at a link to the
+    cached audio. Set EBURON_ECHO_RESULT_CACHE_REUSE_ENTRY=1 to return the
+    original entry instead (while it still exists).
+    """
+    return _get_env_bool("EBURON_ECHO_RESULT_CACHE_REUSE_ENTRY", False)
+
+
+# Default concurrency per inference endpoint class
+_DEFAULT_ADMISSION_CONCURRENCY = {
+    "generate": 4,
+    "stream": 2,
+    "transcribe": 1,
+}
+
+
+def get_admission_concurrency(endpoint_class: str) -> int:
+    """
+    Get how many requests of an endpoint class may run at once.
+
+    Set EBURON_ECHO_GENERATE_CONCURRENCY, EBURON_ECHO_STREAM_CONCURRENCY or
+    EBURON_ECHO_TRANSCRIBE_CONCURRENCY to tune each class.
+    """
+    default = _DEFAULT_ADMISSION_CONCURRENCY.get(endpoint_class, 1)
+    return max(1, _get_env_int(f"EBURON_ECHO_{endpoint_class.upper()}_CONCURRENCY", default))
+
+
+def get_admission_queue_size() -> int:
+    """
+    Get how many requests per endpoint class may wait for a slot.
+
+    Requests beyond this are rejected with 429. Set
+    EBURON_ECHO_ADMISSION_QUEUE_SIZE to change it.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_ADMISSION_QUEUE_SIZE", 16))
+
+
+def get_admission_queue_timeout() -> float:
+    """
+    Get how long (seconds) a request may wait for a slot before a 503.
+
+    Set EBURON_ECHO_ADMISSION_QUEUE_TIMEOUT to change it.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_ADMISSION_QUEUE_TIMEOUT", 60.0))
+
+
+def get_model_memory_budget_bytes() -> int:
+    """
+    Get the memory budget for resident TTS models.
+
+    Models of different sizes stay loaded while they fit in
+    EBURON_ECHO_MODEL_MEMORY_BUDGET_MB; the least recently used one is evicted
+    to make room. The default 0 keeps a single model loaded at a time.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_MODEL_MEMORY_BUDGET_MB", 0)) * 1024 * 1024
+
+
+def get_inference_processes() -> int:
+    """
+    Get the number of forked inference worker processes.
+
+    Set EBURON_ECHO_INFERENCE_PROCESSES to run generation for one model size
+    in that many processes sharing the loaded weights (PyTorch on CPU only).
+    The default 0 runs inference in the server process.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_INFERENCE_PROCESSES", 0))
+
+
+def get_inference_threads_per_process() -> int:
+    """
+    Get the torch thread count of each inference worker process.
+
+    Set EBURON_ECHO_INFERENCE_THREADS_PER_PROCESS; the default 0 uses the
+    number of cores pinned to the worker.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_INFERENCE_THREADS_PER_PROCESS", 0))
+
+
+def get_inference_model_size() -> str:
+    """
+    Get the model size loaded at startup by worker processes and warm-up.
+
+    Set EBURON_ECHO_INFERENCE_MODEL_SIZE (default 1.7B).
+    """
+    return os.environ.get("EBURON_ECHO_INFERENCE_MODEL_SIZE", "1.7B")
+
+
+def get_audio_cache_max_bytes() -> int:
+    """
+    Get the memory budget of the decoded audio cache.
+
+    Set EBURON_ECHO_AUDIO_CACHE_MAX_MB (default 256); 0 disables it.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_AUDIO_CACHE_MAX_MB", 256)) * 1024 * 1024
+
+
+def get_resampler() -> str:
+    """
+    Get the resampler used when audio is read at a rate other than its own.
+
+    Set EBURON_ECHO_RESAMPLER to soxr_vhq, soxr_hq (default), soxr_mq,
+    soxr_lq, soxr_qq, polyphase, or any librosa res_type. Files already at
+    the target rate are never resampled.
+    """
+    return os.environ.get("EBURON_ECHO_RESAMPLER", "soxr_hq").strip() or "soxr_hq"
+
+
+def get_audio_storage_format() -> str:
+    """
+    Get the codec new generations and profile samples are stored with.
+
+    Set EBURON_ECHO_AUDIO_STORAGE_FORMAT to flac (default, lossless), opus
+    (lossy, for archive tiers) or wav. Existing files keep their format and
+    are read transparently.
+    """
+    value = os.environ.get("EBURON_ECHO_AUDIO_STORAGE_FORMAT", "flac").strip().lower()
+    return value if value in ("flac", "opus", "wav") else "flac"
+
+
+def get_peaks_backfill_enabled() -> bool:
+    """
+    Get whether missing waveform peaks are computed in the background at startup.
+
+    Set EBURON_ECHO_PEAKS_BACKFILL (default true). Peaks missing when
+    requested are computed on demand either way.
+    """
+    return _get_env_bool("EBURON_ECHO_PEAKS_BACKFILL", True)
+
+
+def get_prompt_cache_max_bytes() -> int:
+    """
+    Get the memory budget of each in-memory voice prompt cache namespace.
+
+    Set EBURON_ECHO_PROMPT_CACHE_MAX_MB (default 256). Prompts evicted from
+    memory are reloaded from the disk cache on next use.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_PROMPT_CACHE_MAX_MB", 256)) * 1024 * 1024
+
+
+def get_prompt_cache_ttl_seconds() -> float:
+    """
+    Get how long a voice prompt may stay in the in-memory cache.
+
+    Set EBURON_ECHO_PROMPT_CACHE_TTL_S; the default 0 keeps prompts until
+    they are evicted.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_PROMPT_CACHE_TTL_S", 0.0))
+
+
+def get_cache_max_bytes() -> int:
+    """
+    Get the disk quota of stored voice prompts and combined sample audio.
+
+    Set EBURON_ECHO_CACHE_MAX_MB (default 2048); 0 removes the quota, leaving
+    only orphans to be collected. Least recently used files go first.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_CACHE_MAX_MB", 2048)) * 1024 * 1024
+
+
+def get_cache_gc_interval_seconds() -> float:
+    """
+    Get the time between cache garbage collection runs.
+
+    Set EBURON_ECHO_CACHE_GC_INTERVAL_S (default 3600); 0 runs it only on
+    demand through POST /cache/gc.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_CACHE_GC_INTERVAL_S", 3600.0))
+
+
+def get_prompt_precompute_enabled() -> bool:
+    """
+    Whether sample changes queue a background rebuild of the profile's prompt.
+
+    Set EBURON_ECHO_PRECOMPUTE_PROMPTS=0 to build prompts on first use only.
+    """
+    return _get_env_bool("EBURON_ECHO_PRECOMPUTE_PROMPTS", True)
+
+
+def get_prompt_precompute_all_resident() -> bool:
+    """
+    Whether background prompt rebuilds cover every resident model size.
+
+    By default only the most recently used model is warmed. Set
+    EBURON_ECHO_PRECOMPUTE_ALL_RESIDENT=1 to warm all of them.
+    """
+    return _get_env_bool("EBURON_ECHO_PRECOMPUTE_ALL_RESIDENT", False)
+
+
+def get_warmup_profiles() -> int:
+    """
+    Get how many of the most-used profiles have their prompts warmed at startup.
+
+    Set EBURON_ECHO_WARMUP_PROFILES; the default 0 skips warm-up, so no model
+    is loaded until the first request.
+    """
+    return max(0, _get_env_int("EBURON_ECHO_WARMUP_PROFILES", 0))
+
+
+def get_warmup_budget_seconds() -> float:
+    """
+    Get the time budget of the startup warm-up, model load included.
+
+    Set EBURON_ECHO_WARMUP_BUDGET_S (default 120). Profiles not reached within
+    the budget are built on first use.
+    """
+    return max(0.0, _get_env_float("EBURON_ECHO_WARMUP_BUDGET_S", 120.0))
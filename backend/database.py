@@ -35,6 +35,18 @@ class ProfileSample(Base):
     profile_id = Column(String, ForeignKey("profiles.id"), nullable=False)
     audio_path = Column(String, nullable=False)
     reference_text = Column(Text, nullable=False)
+    # Voice prompt cache key and the audio file's stat signature it was
+    # computed for; NULL until first computed
+    cache_key = Column(String, nullable=True)
+    audio_size = Column(Integer, nullable=True)
+    audio_mtime_ns = Column(Integer, nullable=True)
+    audio_inode = Column(Integer, nullable=True)
+    # Measured once at upload from the decoded audio; NULL for older samples
+    duration = Column(Float, nullable=True)
+    rms = Column(Float, nullable=True)
+    peak = Column(Float, nullable=True)
+    num_samples = Column(Integer, nullable=True)
+    sample_rate = Column(Integer, nullable=True)
 
 
 class Generation(Base):
@@ -52,6 +64,25 @@ class Generation(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class GenerationJob(Base):
+    """Queued generation job database model."""
+    __tablename__ = "generation_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False, default="generation")
+    status = Column(String, nullable=False, default="queued")  # queued, running, complete, error, cancelled
+    priority = Column(Integer, nullable=False, default=0)
+    profile_id = Column(String, ForeignKey("profiles.id"), nullable=False)
+    model_size = Column(String, nullable=True)
+    request = Column(Text, nullable=False)  # GenerationRequest as JSON
+    error = Column(Text, nullable=True)
+    # Set once complete; the generation may since have been deleted
+    generation_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+
 class Story(Base):
     """Story database model."""
     __tablename__ = "stories"
@@ -172,6 +203,29 @@ def _run_migrations(engine):
     
     inspector = inspect(engine)
     
+    # Migration: Add sample fingerprint columns to profile_samples
+    if 'profile_samples' in inspector.get_table_names():
+        columns = {col['name'] for col in inspector.get_columns('profile_samples')}
+        new_columns = [
+            ("cache_key", "VARCHAR"),
+            ("audio_size", "INTEGER"),
+            ("audio_mtime_ns", "INTEGER"),
+            ("audio_inode", "INTEGER"),
+            ("duration", "FLOAT"),
+            ("rms", "FLOAT"),
+            ("peak", "FLOAT"),
+            ("num_samples", "INTEGER"),
+            ("sample_rate", "INTEGER"),
+        ]
+        missing = [(name, sql_type) for name, sql_type in new_columns if name not in columns]
+        if missing:
+            print("Migrating profile_samples: adding fingerprint and audio metadata columns")
+            with engine.connect() as conn:
+                for name, sql_type in missing:
+                    conn.execute(text(f"ALTER TABLE profile_samples ADD COLUMN {name} {sql_type}"))
+                conn.commit()
+                print(f"Added {', '.join(name for name, _ in missing)} to profile_samples")
+    
     # Check if story_items table exists
     if 'story_items' not in inspector.get_table_names():
         return  # Table doesn't exist yet, will be created fresh
@@ -17,6 +17,11 @@ from .database import VoiceProfile as DBVoiceProfile, ProfileSample as DBProfile
 from .profiles import create_profile, add_profile_sample
 from .models import VoiceProfileCreate
 from . import config
+from .utils.audio import AUDIO_FORMATS, get_storage_suffix, load_audio, save_audio
+from .utils.peaks import write_peaks_for_audio
+
+# Audio suffixes accepted in archives (older archives only contain .wav)
+_ARCHIVE_AUDIO_SUFFIXES = tuple(fmt["suffix"] for fmt in AUDIO_FORMATS.values())
 
 
 def _get_profiles_dir() -> Path:
@@ -102,7 +107,7 @@ def export_profile_to_zip(profile_id: str, db: Session) -> bytes:
         profile_dir = _get_profiles_dir() / profile_id
 
         for sample in samples:
-            # Get filename from audio_path (should be {sample_id}.wav)
+            # Get filename from audio_path ({sample_id} plus the storage suffix)
             audio_path = Path(sample.audio_path)
             filename = audio_path.name
 
@@ -206,8 +211,10 @@ async def import_profile_from_zip(file_bytes: bytes, db: Session) -> VoiceProfil
 
             for filename, reference_text in samples_data.items():
                 # Validate filename
-                if not filename.endswith('.wav'):
-                    raise ValueError(f"Invalid sample filename: {filename} (must be .wav)")
+                if not filename.lower().endswith(_ARCHIVE_AUDIO_SUFFIXES):
+                    raise ValueError(
+                        f"Invalid sample filename: {filename} (must be {', '.join(_ARCHIVE_AUDIO_SUFFIXES)})"
+                    )
                 
                 # Extract audio file to temp location
                 zip_path = f"samples/{filename}"
@@ -217,7 +224,7 @@ async def import_profile_from_zip(file_bytes: bytes, db: Session) -> VoiceProfil
                 
                 # Extract to temporary file
                 import tempfile
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp:
                     tmp.write(zip_file.read(zip_path))
                     tmp_path = tmp.name
                 
@@ -356,7 +363,10 @@ async def import_generation_from_zip(file_bytes: bytes, db: Session) -> dict:
                     raise ValueError(f"Invalid manifest.json: missing generation.{field}")
             
             # Find audio file in archive
-            audio_files = [f for f in namelist if f.startswith("audio/") and f.endswith(".wav")]
+            audio_files = [
+                f for f in namelist
+                if f.startswith("audio/") and f.lower().endswith(_ARCHIVE_AUDIO_SUFFIXES)
+            ]
             if not audio_files:
                 raise ValueError("No audio file found in ZIP archive")
             
@@ -383,7 +393,7 @@ async def import_generation_from_zip(file_bytes: bytes, db: Session) -> dict:
                     raise ValueError("No voice profiles found. Please create a profile before importing generations.")
             
             # Extract audio file to temporary location
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            with tempfile.NamedTemporaryFile(suffix=Path(audio_file_path).suffix, delete=False) as tmp:
                 tmp.write(zip_file.read(audio_file_path))
                 tmp_path = tmp.name
             
@@ -395,9 +405,15 @@ async def import_generation_from_zip(file_bytes: bytes, db: Session) -> dict:
                 # Generate new ID for this generation
                 new_generation_id = str(__import__('uuid').uuid4())
                 
-                # Copy audio to generations directory
-                audio_dest = generations_dir / f"{new_generation_id}.wav"
-                shutil.copy(tmp_path, audio_dest)
+                # Copy audio to generations directory, re-encoding it to the
+                # storage format when the archive holds another one
+                audio_dest = generations_dir / f"{new_generation_id}{get_storage_suffix()}"
+                if Path(tmp_path).suffix.lower() == audio_dest.suffix:
+                    shutil.copy(tmp_path, audio_dest)
+                else:
+                    audio, sr = load_audio(tmp_path, sample_rate=None)
+                    save_audio(audio, str(audio_dest), sr)
+                write_peaks_for_audio(audio_dest)
                 
                 # Create generation record
                 db_generation = DBGeneration(
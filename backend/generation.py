@@ -0,0 +1,400 @@
+"""
+Speech generation pipeline shared by the synchronous and queued endpoints.
+"""
+
+import asyncio
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .models import GenerationRequest, GenerationResponse
+from . import profiles, history, tts, config, database
+from .utils.audio import save_audio, join_audio_chunks, fade_edges, get_storage_suffix
+from .utils.peaks import write_peaks_for_audio
+from .utils.metrics import LatencyTracker
+from .utils.result_cache import get_result_cache, make_result_key, link_or_copy, normalize_text
+from .utils.single_flight import SingleFlight
+from .utils.text_chunking import split_text_into_chunks
+
+
+# Edge fade applied to each streamed chunk to avoid clicks at the seams
+_STREAM_FADE_MS = 15.0
+
+# The first streamed chunk is kept short so audio starts quickly
+_STREAM_FIRST_CHUNK_CHARS = 80
+
+# Time from request arrival to the first streamed audio byte
+_stream_ttfb = LatencyTracker()
+
+# Identical /generate requests in flight at the same time share one render
+_in_flight = SingleFlight()
+
+
+def use_long_form(data: GenerationRequest) -> bool:
+    """Decide whether a request is rendered as sentence chunks."""
+    if data.long_form is not None:
+        return data.long_form
+    return len(data.text) > config.get_long_form_threshold()
+
+
+def chunk_text(data: GenerationRequest, streaming: bool = False) -> List[str]:
+    """
+    Split the request text into synthesis chunks.
+
+    Returns a single chunk holding the whole text when long-form mode is off.
+    Streaming requests are chunked unless long_form is explicitly False, so
+    the first sentence can play while the rest renders.
+    """
+    if streaming:
+        if data.long_form is False:
+            return [data.text]
+    elif not use_long_form(data):
+        return [data.text]
+    chunks = split_text_into_chunks(
+        data.text,
+        data.language,
+        config.get_long_form_max_chunk_chars(),
+    )
+    if streaming and chunks:
+        head = split_text_into_chunks(chunks[0], data.language, _STREAM_FIRST_CHUNK_CHARS)
+        chunks = head[:1] + ([" ".join(head[1:])] if len(head) > 1 else []) + chunks[1:]
+    return chunks or [data.text]
+
+
+async def render_chunks(
+    tts_model,
+    chunks: List[str],
+    voice_prompt,
+    language: str,
+    seed: Optional[int] = None,
+    instruct: Optional[str] = None,
+    first_alone: bool = False,
+    model_size: Optional[str] = None,
+) -> AsyncIterator[Tuple[np.ndarray, int]]:
+    """
+    Render text chunks concurrently and yield their audio in order.
+
+    Up to EBURON_ECHO_LONG_FORM_CONCURRENCY chunks are in flight at once, so
+    the backend can batch them; earlier chunks are started first. Seeded
+    requests render one chunk at a time because concurrent seeded calls
+    would race on the global RNG.
+
+    Args:
+        tts_model: TTS backend
+        chunks: Text chunks in playback order
+        voice_prompt: Voice prompt for the profile
+        language: Language code
+        seed: Random seed (applied to every chunk)
+        instruct: Delivery instruction (applied to every chunk)
+        first_alone: Render the first chunk on its own before starting the
+            rest, so it is not held back by a batch of longer chunks
+        model_size: Model size to render with
+
+    Yields:
+        Tuple of (audio_array, sample_rate) per chunk
+    """
+    limit = 1 if seed is not None else config.get_long_form_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+    first_done = asyncio.Event()
+
+    async def _render(index: int, chunk: str) -> Tuple[np.ndarray, int]:
+        if first_alone and index > 0:
+            await first_done.wait()
+        async with semaphore:
+            try:
+                return await tts_model.generate(
+                    chunk, voice_prompt, language, seed, instruct, model_size=model_size
+                )
+            finally:
+                if index == 0:
+                    first_done.set()
+
+    tasks = [asyncio.ensure_future(_render(i, chunk)) for i, chunk in enumerate(chunks)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # Stop outstanding chunks if the consumer gave up or a chunk failed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def open_speech_stream(
+    data: GenerationRequest,
+    tts_model,
+    voice_prompt,
+    audio_format: str = "wav",
+    started_at: Optional[float] = None,
+) -> Tuple[AsyncIterator[bytes], int]:
+    """
+    Start rendering a request and return its audio as a byte stream.
+
+    The first chunk is rendered before returning so that errors surface as
+    normal HTTP errors and the sample rate is known up front. Later chunks
+    render concurrently while earlier ones are being sent.
+
+    Args:
+        data: Generation request
+        tts_model: TTS backend with the requested model loaded
+        voice_prompt: Voice prompt for the profile
+        audio_format: "wav" (streaming header of unknown length) or "pcm"
+            (raw little-endian 16-bit mono samples)
+        started_at: time.perf_counter() value at request arrival, for TTFB
+
+    Returns:
+        Tuple of (byte iterator, sample_rate)
+    """
+    if started_at is None:
+        started_at = time.perf_counter()
+
+    chunks = chunk_text(data, streaming=True)
+    rendered = render_chunks(
+        tts_model,
+        chunks,
+        voice_prompt,
+        data.language,
+        data.seed,
+        data.instruct,
+        first_alone=True,
+        model_size=data.model_size or "1.7B",
+    )
+    try:
+        first_audio, sample_rate = await rendered.__anext__()
+    except BaseException:
+        await rendered.aclose()
+        raise
+
+    silence = tts.audio_to_pcm16_bytes(
+        np.zeros(int(sample_rate * config.get_long_form_silence_ms() / 1000), dtype=np.float32)
+    )
+
+    def _encode(audio: np.ndarray, index: int) -> bytes:
+        audio = fade_edges(
+            audio,
+            sample_rate,
+            _STREAM_FADE_MS,
+            fade_in=index > 0,
+            fade_out=index < len(chunks) - 1,
+        )
+        return tts.audio_to_pcm16_bytes(audio)
+
+    async def _stream() -> AsyncIterator[bytes]:
+        try:
+            first = _encode(first_audio, 0)
+            if audio_format == "wav":
+                first = tts.wav_stream_header(sample_rate) + first
+            _stream_ttfb.record((time.perf_counter() - started_at) * 1000)
+            yield first
+
+            index = 1
+            async for audio, _ in rendered:
+                yield silence + _encode(audio, index)
+                index += 1
+        finally:
+            await rendered.aclose()
+
+    return _stream(), sample_rate
+
+
+def get_streaming_stats() -> Dict[str, Any]:
+    """Get streaming latency statistics."""
+    return {"time_to_first_byte_ms": _stream_ttfb.summary()}
+
+
+async def synthesize(
+    data: GenerationRequest,
+    db: Session,
+) -> Tuple[np.ndarray, int]:
+    """
+    Render a generation request to audio without saving it.
+
+    Args:
+        data: Generation request
+        db: Database session
+
+    Returns:
+        Tuple of (audio_array, sample_rate)
+    """
+    tts_model = tts.get_tts_model()
+    model_size = data.model_size or "1.7B"
+
+    # Load the requested model before building the voice prompt
+    await tts_model.load_model_async(model_size)
+
+    voice_prompt = await profiles.create_voice_prompt_for_profile(
+        data.profile_id,
+        db,
+        model_size=model_size,
+    )
+
+    chunks = chunk_text(data)
+    if len(chunks) == 1:
+        return await tts_model.generate(
+            data.text,
+            voice_prompt,
+            data.language,
+            data.seed,
+            data.instruct,
+            model_size=model_size,
+        )
+
+    rendered = []
+    sample_rate = 24000
+    async for chunk_audio, sample_rate in render_chunks(
+        tts_model,
+        chunks,
+        voice_prompt,
+        data.language,
+        data.seed,
+        data.instruct,
+        model_size=model_size,
+    ):
+        rendered.append(chunk_audio)
+    audio = join_audio_chunks(
+        rendered,
+        sample_rate,
+        silence_ms=config.get_long_form_silence_ms(),
+    )
+    return audio, sample_rate
+
+
+def _flight_key(data: GenerationRequest) -> tuple:
+    """Identity of a request for single-flight coalescing."""
+    return (
+        data.profile_id,
+        normalize_text(data.text),
+        data.language,
+        data.seed,
+        normalize_text(data.instruct) if data.instruct else None,
+        data.model_size or "1.7B",
+        use_long_form(data),
+    )
+
+
+def get_single_flight_stats() -> Dict[str, int]:
+    """Get single-flight coalescing counters."""
+    return _in_flight.get_stats()
+
+
+async def _result_cache_key(data: GenerationRequest, db: Session) -> Optional[str]:
+    """Get the result cache key for a request, or None if it is not cacheable."""
+    if data.seed is None or not get_result_cache().enabled:
+        return None
+    fingerprint = await profiles.get_profile_fingerprint(data.profile_id, db)
+    return make_result_key(
+        fingerprint,
+        data.text,
+        data.language,
+        data.seed,
+        data.instruct,
+        data.model_size or "1.7B",
+        use_long_form(data),
+    )
+
+
+async def _generation_from_cache(
+    data: GenerationRequest,
+    cache_key: str,
+    cached: Dict[str, Any],
+    db: Session,
+) -> GenerationResponse:
+    """Answer a request from a result cache entry."""
+    reuse_entry = config.get_result_cache_reuse_entry()
+    if reuse_entry and cached.get("generation_id"):
+        existing = await history.get_generation(cached["generation_id"], db)
+        if existing:
+            return existing
+
+    # Each history entry owns its file, so link the cached audio under a new name
+    audio_path = config.get_generations_dir() / f"{uuid.uuid4()}{Path(cached['path']).suffix}"
+    link_or_copy(Path(cached["path"]), audio_path)
+    await asyncio.to_thread(write_peaks_for_audio, audio_path)
+
+    generation = await history.create_generation(
+        profile_id=data.profile_id,
+        text=data.text,
+        language=data.language,
+        audio_path=str(audio_path),
+        duration=cached["duration"],
+        seed=data.seed,
+        db=db,
+        instruct=data.instruct,
+    )
+
+    if reuse_entry:
+        # The original entry was deleted; later hits return this one
+        await asyncio.to_thread(get_result_cache().set_generation_id, cache_key, generation.id)
+
+    return generation
+
+
+async def generate_speech(
+    data: GenerationRequest,
+    db: Session,
+) -> GenerationResponse:
+    """
+    Run a generation request end to end and record it in history.
+
+    Seeded requests are answered from the result cache when the same voice
+    samples, text and settings were rendered before, and identical requests
+    already in flight share a single render.
+
+    The requested model must already be downloaded; callers are responsible
+    for triggering a download when it is not.
+
+    Args:
+        data: Generation request
+        db: Database session
+
+    Returns:
+        Created generation entry
+    """
+    profile = await profiles.get_profile(data.profile_id, db)
+    if not profile:
+        raise ValueError(f"Profile {data.profile_id} not found")
+
+    result_cache = get_result_cache()
+    cache_key = await _result_cache_key(data, db)
+    cached = await asyncio.to_thread(result_cache.get, cache_key)
+    if cached:
+        return await _generation_from_cache(data, cache_key, cached, db)
+
+    async def render():
+        # The render outlives a cancelled leader, whose session closes with
+        # its request, so it runs on a session of its own
+        flight_db = database.SessionLocal()
+        try:
+            return await synthesize(data, flight_db)
+        finally:
+            flight_db.close()
+
+    # Concurrent duplicates (client retries, several dashboards) await the
+    # same render; each still gets its own file and history entry
+    audio, sample_rate = await _in_flight.do(_flight_key(data), render)
+
+    duration = len(audio) / sample_rate
+
+    audio_path = config.get_generations_dir() / f"{uuid.uuid4()}{get_storage_suffix()}"
+    # Encoding and the peak pyramid take a while for long renders
+    await asyncio.to_thread(save_audio, audio, str(audio_path), sample_rate)
+    await asyncio.to_thread(write_peaks_for_audio, audio_path, audio, sample_rate)
+
+    generation = await history.create_generation(
+        profile_id=data.profile_id,
+        text=data.text,
+        language=data.language,
+        audio_path=str(audio_path),
+        duration=duration,
+        seed=data.seed,
+        db=db,
+        instruct=data.instruct,
+    )
+
+    await asyncio.to_thread(result_cache.put, cache_key, str(audio_path), duration, generation.id)
+
+    return generation
@@ -13,6 +13,7 @@ from sqlalchemy import or_
 from .models import GenerationRequest, GenerationResponse, HistoryQuery, HistoryResponse, HistoryListResponse
 from .database import Generation as DBGeneration, VoiceProfile as DBVoiceProfile
 from . import config
+from .utils.peaks import delete_peaks
 
 
 def _get_generations_dir() -> Path:
@@ -174,6 +175,7 @@ async def delete_generation(
     audio_path = Path(generation.audio_path)
     if audio_path.exists():
         audio_path.unlink()
+    delete_peaks(audio_path)
     
     # Delete from database
     db.delete(generation)
@@ -204,6 +206,7 @@ async def delete_generations_by_profile(
         audio_path = Path(generation.audio_path)
         if audio_path.exists():
             audio_path.unlink()
+        delete_peaks(audio_path)
         
         # Delete from database
         db.delete(generation)
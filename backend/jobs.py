@@ -0,0 +1,203 @@
+"""
+Persistent generation jobs.
+
+Jobs queued through POST /generate/jobs are scheduled by the TaskManager in
+utils/tasks.py and recorded in the generation_jobs table, which is updated
+on every status change and serves job status. At startup, jobs left queued
+are put back on the queue in their original order, and jobs left running
+(the server stopped mid-render) are marked as failed.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import uuid
+
+from sqlalchemy.orm import Session
+
+from . import database
+from . import generation as generation_pipeline
+from .database import Generation as DBGeneration, GenerationJob as DBGenerationJob
+from .models import GenerationJobResponse, GenerationRequest, GenerationResponse
+from .utils.tasks import (
+    JOB_ERROR,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    MAX_FINISHED_JOBS,
+    GenerationJob,
+    get_task_manager,
+)
+
+
+INTERRUPTED_JOB_ERROR = "Server stopped before the job finished"
+
+
+def _job_recorder(request_json: str) -> Callable[[GenerationJob], None]:
+    """Build the on_update callback that writes a job's state to its row."""
+    def record(job: GenerationJob) -> None:
+        db = database.SessionLocal()
+        try:
+            db.merge(DBGenerationJob(
+                id=job.job_id,
+                kind=job.kind,
+                status=job.status,
+                priority=job.priority,
+                profile_id=job.profile_id,
+                model_size=job.model_size,
+                request=request_json,
+                error=job.error,
+                generation_id=getattr(job.result, "id", None),
+                created_at=job.created_at,
+                started_at=job.started_at,
+                completed_at=job.completed_at,
+            ))
+            db.commit()
+        finally:
+            db.close()
+    return record
+
+
+async def submit_generation_job(
+    request: GenerationRequest,
+    priority: int = 0,
+    model_size: Optional[str] = None,
+    job_id: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+) -> GenerationJob:
+    """
+    Queue a generation and record it in the database.
+
+    Args:
+        request: Generation to run
+        priority: Scheduling priority (higher runs first)
+        model_size: Model size the job needs
+        job_id: ID of a job restored after a restart (new jobs get one)
+        created_at: Original submission time of a restored job
+
+    Returns:
+        The queued job
+
+    Raises:
+        QueueFullError: If the queue is at capacity (new jobs only)
+    """
+    async def run_job():
+        job_db = database.SessionLocal()
+        try:
+            return await generation_pipeline.generate_speech(request, job_db)
+        finally:
+            job_db.close()
+
+    return await get_task_manager().submit_job(
+        job_id=job_id or str(uuid.uuid4()),
+        profile_id=request.profile_id,
+        text=request.text,
+        run=run_job,
+        priority=priority,
+        model_size=model_size,
+        on_update=_job_recorder(request.model_dump_json()),
+        created_at=created_at,
+        restore=job_id is not None,
+    )
+
+
+def get_job_response(job_id: str, db: Session) -> Optional[GenerationJobResponse]:
+    """
+    Get a job's status (and result, once complete) from its database row.
+
+    Args:
+        job_id: Job ID
+        db: Database session
+
+    Returns:
+        Job response, or None if no such job was recorded
+    """
+    row = db.query(DBGenerationJob).filter_by(id=job_id).first()
+    if row is None:
+        return None
+
+    generation = None
+    if row.generation_id is not None:
+        db_generation = db.query(DBGeneration).filter_by(id=row.generation_id).first()
+        if db_generation is not None:
+            generation = GenerationResponse.model_validate(db_generation)
+
+    queue_position = None
+    if row.status == JOB_QUEUED:
+        queue_position = get_task_manager().get_queue_position(row.id)
+
+    return GenerationJobResponse(
+        id=row.id,
+        status=row.status,
+        priority=row.priority,
+        profile_id=row.profile_id,
+        model_size=row.model_size,
+        queue_position=queue_position,
+        created_at=row.created_at,
+        started_at=row.started_at,
+        completed_at=row.completed_at,
+        error=row.error,
+        generation=generation,
+    )
+
+
+async def restore_jobs() -> Dict[str, int]:
+    """
+    Recover recorded jobs after a restart.
+
+    Jobs left running are marked as failed, queued jobs are queued again
+    in submission order, and finished jobs beyond MAX_FINISHED_JOBS are
+    deleted. Must be called from within the running event loop, before
+    the job workers start.
+
+    Returns:
+        Number of requeued and interrupted jobs
+    """
+    db = database.SessionLocal()
+    try:
+        interrupted = db.query(DBGenerationJob).filter_by(status=JOB_RUNNING).all()
+        for row in interrupted:
+            row.status = JOB_ERROR
+            row.error = INTERRUPTED_JOB_ERROR
+            row.completed_at = datetime.utcnow()
+
+        finished = (
+            db.query(DBGenerationJob.id)
+            .filter(DBGenerationJob.status.notin_([JOB_QUEUED, JOB_RUNNING]))
+            .order_by(DBGenerationJob.completed_at.desc(), DBGenerationJob.created_at.desc())
+            .offset(MAX_FINISHED_JOBS)
+            .all()
+        )
+        if finished:
+            db.query(DBGenerationJob).filter(
+                DBGenerationJob.id.in_([job_id for job_id, in finished])
+            ).delete(synchronize_session=False)
+        db.commit()
+
+        pending = []
+        queued = (
+            db.query(DBGenerationJob)
+            .filter_by(status=JOB_QUEUED)
+            .order_by(DBGenerationJob.created_at)
+            .all()
+        )
+        for row in queued:
+            try:
+                request = GenerationRequest.model_validate_json(row.request)
+            except ValueError as e:
+                row.status = JOB_ERROR
+                row.error = f"Could not restore job: {e}"
+                row.completed_at = datetime.utcnow()
+                continue
+            pending.append((row.id, request, row.priority, row.model_size, row.created_at))
+        db.commit()
+    finally:
+        db.close()
+
+    for job_id, request, priority, model_size, created_at in pending:
+        await submit_generation_job(
+            request,
+            priority=priority,
+            model_size=model_size,
+            job_id=job_id,
+            created_at=created_at,
+        )
+    return {"requeued": len(pending), "interrupted": len(interrupted)}
@@ -4,14 +4,16 @@ FastAPI application for Eburon Echo backend.
 Handles voice cloning, generation history, and server mode.
 """
 
-from fastapi import FastAPI, Depends, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, Depends, UploadFile, File, Form, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 import asyncio
+import time
 import uvicorn
 import argparse
 import torch
@@ -22,6 +24,7 @@ import uuid
 import asyncio
 import signal
 import os
+import mimetypes
 from urllib.parse import quote
 
 
@@ -41,11 +44,26 @@ def _safe_content_disposition(disposition_type: str, filename: str) -> str:
     )
 
 
-from . import database, models, profiles, history, tts, transcribe, config, export_import, channels, stories, __version__
+from . import database, models, profiles, history, tts, transcribe, config, export_import, channels, stories, jobs, __version__
+from . import generation as generation_pipeline
 from .database import get_db, Generation as DBGeneration, VoiceProfile as DBVoiceProfile
 from .utils.progress import get_progress_manager
-from .utils.tasks import get_task_manager
-from .utils.cache import clear_voice_prompt_cache
+from .utils.tasks import get_task_manager, QueueFullError, JOB_KIND_PRECOMPUTE
+from .utils.cache import clear_voice_prompt_cache, get_prompt_memory_cache, get_prompt_disk_usage
+from .utils.result_cache import get_result_cache
+from .utils.audio_cache import get_decoded_audio_cache
+from .utils.file_serving import (
+    ServedFile,
+    bytes_response,
+    file_response,
+    get_served_file_map,
+    make_etag,
+    not_modified_response,
+)
+from .utils.admission import get_admission_controller, get_admission_stats, AdmissionRejected
+from .warmup import get_cache_warmer
+from .cache_gc import get_cache_collector
+from .peaks_backfill import get_peaks_backfill
 from .platform_detect import get_backend_type
 
 app = FastAPI(
@@ -197,6 +215,8 @@ async def health():
     except Exception:
         pass
     
+    warmer = get_cache_warmer()
+    
     return models.HealthResponse(
         status="healthy",
         model_loaded=model_loaded,
@@ -206,6 +226,8 @@ async def health():
         gpu_type=gpu_type,
         vram_used_mb=vram_used,
         backend_type=backend_type,
+        ready=warmer.ready,
+        warmup=models.WarmupStatus(**warmer.get_status()),
     )
 
 
@@ -292,6 +314,7 @@ async def delete_profile(
     success = await profiles.delete_profile(profile_id, db)
     if not success:
         raise HTTPException(status_code=404, detail="Profile not found")
+    get_served_file_map().discard("avatar", profile_id)
     return {"message": "Profile deleted successfully"}
 
 
@@ -349,6 +372,7 @@ async def delete_profile_sample(
     success = await profiles.delete_profile_sample(sample_id, db)
     if not success:
         raise HTTPException(status_code=404, detail="Sample not found")
+    get_served_file_map().discard("sample", sample_id)
     return {"message": "Sample deleted successfully"}
 
 
@@ -380,6 +404,7 @@ async def upload_profile_avatar(
 
     try:
         profile = await profiles.upload_avatar(profile_id, tmp_path, db)
+        get_served_file_map().discard("avatar", profile_id)
         return profile
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -391,21 +416,31 @@ async def upload_profile_avatar(
 @app.get("/profiles/{profile_id}/avatar")
 async def get_profile_avatar(
     profile_id: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """Get avatar image for a profile."""
-    profile = await profiles.get_profile(profile_id, db)
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-
-    if not profile.avatar_path:
-        raise HTTPException(status_code=404, detail="No avatar found for this profile")
-
-    avatar_path = Path(profile.avatar_path)
-    if not avatar_path.exists():
-        raise HTTPException(status_code=404, detail="Avatar file not found")
+    async def find_avatar() -> Path:
+        profile = await profiles.get_profile(profile_id, db)
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
 
-    return FileResponse(avatar_path)
+        if not profile.avatar_path:
+            raise HTTPException(status_code=404, detail="No avatar found for this profile")
+
+        avatar_path = Path(profile.avatar_path)
+        if not avatar_path.exists():
+            raise HTTPException(status_code=404, detail="Avatar file not found")
+        return avatar_path
+
+    served = await _get_served_file("avatar", profile_id, find_avatar)
+    # Avatars can be replaced in place, so clients revalidate with the ETag
+    return file_response(
+        request,
+        served.path,
+        mimetypes.guess_type(served.path)[0] or "application/octet-stream",
+        make_etag(served.fingerprint),
+    )
 
 
 @app.delete("/profiles/{profile_id}/avatar")
@@ -417,6 +452,7 @@ async def delete_profile_avatar(
     success = await profiles.delete_avatar(profile_id, db)
     if not success:
         raise HTTPException(status_code=404, detail="Profile not found or no avatar to delete")
+    get_served_file_map().discard("avatar", profile_id)
     return {"message": "Avatar deleted successfully"}
 
 
@@ -578,10 +614,149 @@ async def set_profile_channels(
 # GENERATION ENDPOINTS
 # ============================================
 
+def _ensure_tts_model_downloaded(model_size: str) -> None:
+    """
+    Make sure a TTS model is cached locally before generating with it.
+
+    If the model is not fully cached, kick off a background download and
+    raise a 202 telling the client to retry once it's ready.
+    """
+    task_manager = get_task_manager()
+    tts_model = tts.get_tts_model()
+    if tts_model._is_model_cached(model_size):
+        return
+
+    model_name = f"qwen-tts-{model_size}"
+
+    async def download_model_background():
+        try:
+            await tts_model.load_model_async(model_size)
+        except Exception as e:
+            task_manager.error_download(model_name, str(e))
+
+    task_manager.start_download(model_name)
+    asyncio.create_task(download_model_background())
+
+    raise HTTPException(
+        status_code=202,
+        detail={
+            "message": f"Model {model_size} is being downloaded. Please wait and try again.",
+            "model_name": model_name,
+            "downloading": True,
+        },
+    )
+
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    """Convert an admission rejection into a 429/503 with Retry-After."""
+    return HTTPException(
+        status_code=e.status_code,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def _admit(endpoint_class: str):
+    """Build a dependency that holds an admission slot for the request."""
+    async def admission_slot():
+        try:
+            release = await get_admission_controller(endpoint_class).acquire()
+        except AdmissionRejected as e:
+            raise _admission_error(e)
+        try:
+            yield
+        finally:
+            release()
+    return admission_slot
+
+
+# How often a running request checks whether its client went away
+_DISCONNECT_POLL_INTERVAL = 0.5
+
+
+async def _run_cancellable(request: Request, task_id: str, coro):
+    """
+    Run generation work so it can be cancelled.
+
+    The work stops if DELETE /tasks/generations/{task_id} is called or the
+    client disconnects; the model thread then halts at its next decoding step.
+
+    Raises:
+        HTTPException: 409 if the work was cancelled
+    """
+    task_manager = get_task_manager()
+    work = asyncio.ensure_future(coro)
+    cancelled = False
+
+    def cancel():
+        nonlocal cancelled
+        cancelled = True
+        work.cancel()
+
+    task_manager.set_generation_cancel(task_id, cancel)
+
+    async def watch_disconnect():
+        while not work.done():
+            if await request.is_disconnected():
+                print(f"Client disconnected, cancelling generation {task_id}")
+                cancel()
+                return
+            await asyncio.sleep(_DISCONNECT_POLL_INTERVAL)
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        return await work
+    except asyncio.CancelledError:
+        if cancelled:
+            raise HTTPException(status_code=409, detail="Generation was cancelled")
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+
+async def _cancellable_stream(task_id: str, stream, on_finish):
+    """
+    Relay an audio stream that DELETE /tasks/generations/{task_id} can stop.
+
+    Client disconnects are handled by StreamingResponse closing this generator.
+    """
+    next_chunk = None
+    cancelled = False
+
+    def cancel():
+        nonlocal cancelled
+        cancelled = True
+        if next_chunk is not None:
+            next_chunk.cancel()
+
+    get_task_manager().set_generation_cancel(task_id, cancel)
+    try:
+        while not cancelled:
+            next_chunk = asyncio.ensure_future(stream.__anext__())
+            try:
+                chunk = await next_chunk
+            except StopAsyncIteration:
+                break
+            except asyncio.CancelledError:
+                if cancelled:
+                    break
+                raise
+            yield chunk
+    finally:
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+            await asyncio.gather(next_chunk, return_exceptions=True)
+        await stream.aclose()
+        on_finish()
+
+
 @app.post("/generate", response_model=models.GenerationResponse)
 async def generate_speech(
     data: models.GenerationRequest,
+    request: Request,
     db: Session = Depends(get_db),
+    _admitted: None = Depends(_admit("generate")),
 ):
     """Generate speech from text using a voice profile."""
     task_manager = get_task_manager()
@@ -600,77 +775,13 @@ async def generate_speech(
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        # Generate audio
-
-        # Resolve model size and load the correct model FIRST.
-        # This must happen before create_voice_prompt_for_profile because that
-        # function calls load_model_async(None), which falls back to self.model_size.
-        # If the model is already loaded with the right size at that point, it
-        # returns immediately and the voice prompt is created by the correct model.
-        tts_model = tts.get_tts_model()
-        model_size = data.model_size or "1.7B"
-
         # Check if model needs to be downloaded first
-        model_path = tts_model._get_model_path(model_size)
-        if not tts_model._is_model_cached(model_size):
-            # Model is not fully cached — kick off a background download and tell
-            # the client to retry once it's ready.
-            model_name = f"qwen-tts-{model_size}"
-
-            async def download_model_background():
-                try:
-                    await tts_model.load_model_async(model_size)
-                except Exception as e:
-                    task_manager.error_download(model_name, str(e))
-
-            task_manager.start_download(model_name)
-            asyncio.create_task(download_model_background())
-
-            raise HTTPException(
-                status_code=202,
-                detail={
-                    "message": f"Model {model_size} is being downloaded. Please wait and try again.",
-                    "model_name": model_name,
-                    "downloading": True,
-                },
-            )
-
-        # Load (or switch to) the requested model before building the voice prompt
-        await tts_model.load_model_async(model_size)
-
-        # Create voice prompt from profile (model is already loaded with correct size)
-        voice_prompt = await profiles.create_voice_prompt_for_profile(
-            data.profile_id,
-            db,
-        )
+        _ensure_tts_model_downloaded(data.model_size or "1.7B")
 
-        audio, sample_rate = await tts_model.generate(
-            data.text,
-            voice_prompt,
-            data.language,
-            data.seed,
-            data.instruct,
-        )
-
-        # Calculate duration
-        duration = len(audio) / sample_rate
-
-        # Save audio
-        audio_path = config.get_generations_dir() / f"{generation_id}.wav"
-
-        from .utils.audio import save_audio
-        save_audio(audio, str(audio_path), sample_rate)
-
-        # Create history entry
-        generation = await history.create_generation(
-            profile_id=data.profile_id,
-            text=data.text,
-            language=data.language,
-            audio_path=str(audio_path),
-            duration=duration,
-            seed=data.seed,
-            db=db,
-            instruct=data.instruct,
+        generation = await _run_cancellable(
+            request,
+            generation_id,
+            generation_pipeline.generate_speech(data, db),
         )
         
         # Mark generation as complete
@@ -678,6 +789,9 @@ async def generate_speech(
         
         return generation
         
+    except HTTPException:
+        task_manager.complete_generation(generation_id)
+        raise
     except ValueError as e:
         task_manager.complete_generation(generation_id)
         raise HTTPException(status_code=400, detail=str(e))
@@ -686,18 +800,81 @@ async def generate_speech(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/generate/jobs", response_model=models.GenerationJobResponse)
+async def create_generation_job(
+    data: models.GenerationJobRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a generation job and return immediately.
+
+    Poll GET /generate/jobs/{job_id} for its status and result. Jobs are
+    stored in the database: jobs still queued when the server stops run
+    after it restarts, and jobs interrupted mid-render end in error.
+    """
+    profile = await profiles.get_profile(data.profile_id, db)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    model_size = data.model_size or "1.7B"
+    _ensure_tts_model_downloaded(model_size)
+
+    request = models.GenerationRequest(**data.model_dump(exclude={"priority"}))
+
+    try:
+        job = await jobs.submit_generation_job(
+            request,
+            priority=data.priority,
+            model_size=model_size,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return jobs.get_job_response(job.job_id, db)
+
+
+@app.get("/generate/jobs/{job_id}", response_model=models.GenerationJobResponse)
+async def get_generation_job(job_id: str, db: Session = Depends(get_db)):
+    """Get the status (and result, once complete) of a generation job."""
+    job = jobs.get_job_response(job_id, db)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/generate/stats")
+async def get_generation_stats():
+    """Get inference statistics (batching, streaming TTFB, single-flight, scheduling, workers)."""
+    tts_model = tts.get_tts_model()
+    get_batching_stats = getattr(tts_model, "get_batching_stats", None)
+    get_process_pool_stats = getattr(tts_model, "get_process_pool_stats", None)
+    return {
+        "batching": get_batching_stats() if get_batching_stats else None,
+        "streaming": generation_pipeline.get_streaming_stats(),
+        "single_flight": generation_pipeline.get_single_flight_stats(),
+        "scheduler": get_task_manager().get_scheduler_stats(),
+        "processes": get_process_pool_stats() if get_process_pool_stats else None,
+    }
+
+
 @app.post("/generate/stream")
 async def stream_speech(
     data: models.GenerationRequest,
+    request: Request,
+    audio_format: str = Query("wav", alias="format", pattern="^(wav|pcm)$"),
     db: Session = Depends(get_db),
 ):
     """
-    Generate speech and stream the WAV audio directly without saving to disk.
+    Generate speech and stream the audio as it is rendered, without saving to disk.
 
-    Returns raw WAV bytes via a StreamingResponse so the client can start
-    playing audio before the entire file has been received.  This endpoint
-    does NOT create a history entry — use /generate for that.
+    Text is split into sentence chunks; each chunk is sent as soon as it is
+    ready while the following chunks render. With format=wav (default) the
+    stream starts with a WAV header of unknown length; with format=pcm it is
+    raw 16-bit little-endian mono PCM at the rate given in X-Sample-Rate.
+    This endpoint does NOT create a history entry — use /generate for that.
     """
+    started_at = time.perf_counter()
+
     profile = await profiles.get_profile(data.profile_id, db)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -711,31 +888,61 @@ async def stream_speech(
             detail=f"Model {model_size} is not downloaded yet. Use /generate to trigger a download.",
         )
 
-    # Load the correct model before building the voice prompt (fixes issue #96)
-    await tts_model.load_model_async(model_size)
+    # Admit before loading so rejected streams never trigger a model load.
+    # The slot is held until the last byte is sent, not just until we return
+    try:
+        release_slot = await get_admission_controller("stream").acquire()
+    except AdmissionRejected as e:
+        raise _admission_error(e)
 
-    voice_prompt = await profiles.create_voice_prompt_for_profile(data.profile_id, db)
+    task_manager = get_task_manager()
+    stream_id = str(uuid.uuid4())
+    task_manager.start_generation(stream_id, data.profile_id, data.text)
 
-    audio, sample_rate = await tts_model.generate(
-        data.text,
-        voice_prompt,
-        data.language,
-        data.seed,
-        data.instruct,
-    )
+    def finish_stream():
+        release_slot()
+        task_manager.complete_generation(stream_id)
+
+    async def open_stream():
+        # Load the correct model before building the voice prompt (fixes issue #96)
+        await tts_model.load_model_async(model_size)
+
+        voice_prompt = await profiles.create_voice_prompt_for_profile(
+            data.profile_id,
+            db,
+            model_size=model_size,
+        )
+        return await generation_pipeline.open_speech_stream(
+            data,
+            tts_model,
+            voice_prompt,
+            audio_format=audio_format,
+            started_at=started_at,
+        )
 
-    wav_bytes = tts.audio_to_wav_bytes(audio, sample_rate)
+    try:
+        audio_stream, sample_rate = await _run_cancellable(request, stream_id, open_stream())
+    except BaseException:
+        finish_stream()
+        raise
 
-    async def _wav_stream():
-        # Yield in chunks so large responses don't block the event loop
-        chunk_size = 64 * 1024  # 64 KB
-        for i in range(0, len(wav_bytes), chunk_size):
-            yield wav_bytes[i : i + chunk_size]
+    if audio_format == "pcm":
+        media_type = "audio/L16"
+        filename = "speech.pcm"
+    else:
+        media_type = "audio/wav"
+        filename = "speech.wav"
 
     return StreamingResponse(
-        _wav_stream(),
-        media_type="audio/wav",
-        headers={"Content-Disposition": 'attachment; filename="speech.wav"'},
+        _cancellable_stream(stream_id, audio_stream, finish_stream),
+        media_type=media_type,
+        # Also release if the body is never iterated (client gone early)
+        background=BackgroundTask(finish_stream),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Sample-Rate": str(sample_rate),
+            "X-Generation-Id": stream_id,
+        },
     )
 
 
@@ -838,6 +1045,7 @@ async def delete_generation(
     success = await history.delete_generation(generation_id, db)
     if not success:
         raise HTTPException(status_code=404, detail="Generation not found")
+    get_served_file_map().discard("generation", generation_id)
     return {"message": "Generation deleted successfully"}
 
 
@@ -879,30 +1087,29 @@ async def export_generation(
 @app.get("/history/{generation_id}/export-audio")
 async def export_generation_audio(
     generation_id: str,
+    request: Request,
+    audio_format: str = Query("wav", alias="format", pattern="^(stored|wav|flac|opus)$"),
     db: Session = Depends(get_db),
 ):
-    """Export only the audio file from a generation."""
+    """Export only the audio file from a generation (WAV unless format is given)."""
     generation = db.query(DBGeneration).filter_by(id=generation_id).first()
     if not generation:
         raise HTTPException(status_code=404, detail="Generation not found")
     
-    audio_path = Path(generation.audio_path)
-    if not audio_path.exists():
-        raise HTTPException(status_code=404, detail="Audio file not found")
+    async def find_audio() -> Path:
+        audio_path = Path(generation.audio_path)
+        if not audio_path.exists():
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        return audio_path
+    
+    served = await _get_served_file("generation", generation_id, find_audio)
     
     # Create safe filename from text
     safe_text = "".join(c for c in generation.text[:30] if c.isalnum() or c in (' ', '-', '_')).strip()
     if not safe_text:
         safe_text = "generation"
-    filename = f"{safe_text}.wav"
     
-    return FileResponse(
-        audio_path,
-        media_type="audio/wav",
-        headers={
-            "Content-Disposition": _safe_content_disposition("attachment", filename)
-        }
-    )
+    return await _serve_audio_file(served, safe_text, request, audio_format)
 
 
 # ============================================
@@ -913,6 +1120,7 @@ async def export_generation_audio(
 async def transcribe_audio(
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    _admitted: None = Depends(_admit("transcribe")),
 ):
     """Transcribe audio file to text."""
     # Save uploaded file to temporary location
@@ -922,10 +1130,14 @@ async def transcribe_audio(
         tmp_path = tmp.name
     
     try:
-        # Get audio duration
-        from .utils.audio import load_audio
-        audio, sr = load_audio(tmp_path)
-        duration = len(audio) / sr
+        # Get audio duration (from the header when the format allows)
+        from .utils.audio import get_audio_info, load_audio
+        try:
+            sr, _, frames = get_audio_info(tmp_path)
+            duration = frames / sr
+        except RuntimeError:
+            audio, sr = load_audio(tmp_path)
+            duration = len(audio) / sr
         
         # Transcribe
         whisper_model = transcribe.get_whisper_model()
@@ -1181,9 +1393,30 @@ async def export_story_audio(
 # FILE SERVING
 # ============================================
 
-@app.get("/audio/{generation_id}")
-async def get_audio(generation_id: str, db: Session = Depends(get_db)):
-    """Serve generated audio file."""
+async def _get_served_file(kind: str, resource_id: str, find_path) -> ServedFile:
+    """
+    Resolve a stored file by id, skipping the database for ids seen before.
+
+    Args:
+        kind: Resource kind in the served file map
+        resource_id: Resource ID
+        find_path: Async callable returning the file's path from the database
+            (raises HTTPException when it does not exist)
+    """
+    served_files = get_served_file_map()
+    served = served_files.get(kind, resource_id)
+    if served is not None:
+        return served
+    
+    path = await find_path()
+    try:
+        return await asyncio.to_thread(served_files.resolve, kind, resource_id, path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+
+async def _find_generation_audio(generation_id: str, db: Session) -> Path:
+    """Look up a generation's audio file, raising 404 when it is gone."""
     generation = await history.get_generation(generation_id, db)
     if not generation:
         raise HTTPException(status_code=404, detail="Generation not found")
@@ -1191,17 +1424,11 @@ async def get_audio(generation_id: str, db: Session = Depends(get_db)):
     audio_path = Path(generation.audio_path)
     if not audio_path.exists():
         raise HTTPException(status_code=404, detail="Audio file not found")
-    
-    return FileResponse(
-        audio_path,
-        media_type="audio/wav",
-        filename=f"generation_{generation_id}.wav",
-    )
+    return audio_path
 
 
-@app.get("/samples/{sample_id}")
-async def get_sample_audio(sample_id: str, db: Session = Depends(get_db)):
-    """Serve profile sample audio file."""
+async def _find_sample_audio(sample_id: str, db: Session) -> Path:
+    """Look up a profile sample's audio file, raising 404 when it is gone."""
     from .database import ProfileSample as DBProfileSample
     
     sample = db.query(DBProfileSample).filter_by(id=sample_id).first()
@@ -1211,12 +1438,168 @@ async def get_sample_audio(sample_id: str, db: Session = Depends(get_db)):
     audio_path = Path(sample.audio_path)
     if not audio_path.exists():
         raise HTTPException(status_code=404, detail="Audio file not found")
+    return audio_path
+
+
+async def _serve_audio_file(
+    served: ServedFile,
+    filename_stem: str,
+    request: Request,
+    requested_format: Optional[str] = None,
+):
+    """
+    Send a stored audio file as stored or transcoded.
+
+    The format comes from the format query parameter or the Accept header
+    (see negotiate_audio_format); files are sent as stored unless WAV is
+    requested or the stored type is not accepted. Stored audio never changes under its id, so every variant is
+    cacheable for good and supports Range and If-None-Match.
+    """
+    from .utils.audio import AUDIO_FORMATS, get_format_for_path, negotiate_audio_format, transcode_audio_file
+    
+    audio_path = Path(served.path)
+    stored_format = get_format_for_path(served.path)
+    if stored_format is None:
+        # Not one of our storage formats (e.g. an imported file); send it as is
+        return file_response(
+            request,
+            audio_path,
+            mimetypes.guess_type(audio_path.name)[0] or "application/octet-stream",
+            make_etag(served.fingerprint),
+            immutable=True,
+            headers={"Content-Disposition": _safe_content_disposition("attachment", f"{filename_stem}{audio_path.suffix}")},
+        )
+    
+    try:
+        response_format = negotiate_audio_format(
+            stored_format,
+            accept=request.headers.get("accept"),
+            requested=requested_format,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fmt = AUDIO_FORMATS[response_format]
+    headers = {
+        "Content-Disposition": _safe_content_disposition("attachment", f"{filename_stem}{fmt['suffix']}"),
+        "Vary": "Accept",
+    }
+    
+    if response_format == stored_format:
+        return file_response(
+            request,
+            audio_path,
+            fmt["media_type"],
+            make_etag(served.fingerprint),
+            immutable=True,
+            headers=headers,
+        )
     
-    return FileResponse(
-        audio_path,
-        media_type="audio/wav",
-        filename=f"sample_{sample_id}.wav",
+    # Each transcoded variant has its own ETag; revalidation skips transcoding
+    etag = make_etag(served.fingerprint, response_format)
+    not_modified = not_modified_response(request, etag, immutable=True, headers=headers)
+    if not_modified is not None:
+        return not_modified
+    content = await asyncio.to_thread(transcode_audio_file, served.path, response_format)
+    return bytes_response(request, content, fmt["media_type"], etag, immutable=True, headers=headers)
+
+
+@app.get("/audio/{generation_id}")
+async def get_audio(
+    generation_id: str,
+    request: Request,
+    audio_format: Optional[str] = Query(None, alias="format", pattern="^(stored|wav|flac|opus)$"),
+    db: Session = Depends(get_db),
+):
+    """Serve generated audio file, as stored or as WAV (format=wav or Accept)."""
+    served = await _get_served_file(
+        "generation",
+        generation_id,
+        lambda: _find_generation_audio(generation_id, db),
     )
+    return await _serve_audio_file(served, f"generation_{generation_id}", request, audio_format)
+
+
+@app.get("/samples/{sample_id}")
+async def get_sample_audio(
+    sample_id: str,
+    request: Request,
+    audio_format: Optional[str] = Query(None, alias="format", pattern="^(stored|wav|flac|opus)$"),
+    db: Session = Depends(get_db),
+):
+    """Serve profile sample audio file, as stored or as WAV (format=wav or Accept)."""
+    served = await _get_served_file(
+        "sample",
+        sample_id,
+        lambda: _find_sample_audio(sample_id, db),
+    )
+    return await _serve_audio_file(served, f"sample_{sample_id}", request, audio_format)
+
+
+async def _serve_peaks(served: ServedFile, level: int, request: Request):
+    """Send one level of a stored file's waveform peaks."""
+    from .utils.peaks import get_peak_level_payload
+    
+    etag = make_etag(served.fingerprint, f"peaks{level}")
+    not_modified = not_modified_response(request, etag, immutable=True)
+    if not_modified is not None:
+        return not_modified
+    try:
+        payload = await asyncio.to_thread(get_peak_level_payload, served.path, level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return bytes_response(request, payload, "application/octet-stream", etag, immutable=True)
+
+
+@app.get("/audio/{generation_id}/peaks")
+async def get_audio_peaks(
+    generation_id: str,
+    request: Request,
+    level: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Get waveform peaks of a generation at one zoom level.
+
+    Level 0 has a min/max pair per 256 samples; each level above halves that.
+    The body is a 20-byte header (see utils/peaks.PAYLOAD_HEADER) followed by
+    interleaved int8 min/max pairs.
+    """
+    served = await _get_served_file(
+        "generation",
+        generation_id,
+        lambda: _find_generation_audio(generation_id, db),
+    )
+    return await _serve_peaks(served, level, request)
+
+
+@app.get("/samples/{sample_id}/peaks")
+async def get_sample_peaks(
+    sample_id: str,
+    request: Request,
+    level: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Get waveform peaks of a profile sample at one zoom level (see /audio/{id}/peaks)."""
+    served = await _get_served_file(
+        "sample",
+        sample_id,
+        lambda: _find_sample_audio(sample_id, db),
+    )
+    return await _serve_peaks(served, level, request)
+
+
+@app.post("/peaks/backfill")
+async def start_peaks_backfill():
+    """Compute waveform peaks for stored audio that has none, in the background."""
+    backfill = get_peaks_backfill()
+    backfill.start()
+    return backfill.get_status()
+
+
+@app.get("/peaks/backfill")
+async def get_peaks_backfill_status():
+    """Get the state of the waveform peaks backfill."""
+    return get_peaks_backfill().get_status()
 
 
 # ============================================
@@ -1235,10 +1618,10 @@ async def load_model(model_size: str = "1.7B"):
 
 
 @app.post("/models/unload")
-async def unload_model():
-    """Unload TTS model to free memory."""
+async def unload_model(model_size: Optional[str] = None):
+    """Unload TTS models to free memory (only model_size, if given)."""
     try:
-        tts.unload_tts_model()
+        tts.unload_tts_model(model_size)
         return {"message": "Model unloaded successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1272,6 +1655,8 @@ async def get_model_status():
     """Get status of all available models."""
     from huggingface_hub import constants as hf_constants
     from pathlib import Path
+    # Imported by name: "config" is a loop variable below
+    from .config import get_model_memory_budget_bytes
     
     backend_type = get_backend_type()
     task_manager = get_task_manager()
@@ -1290,7 +1675,7 @@ async def get_model_status():
         """Check if TTS model is loaded with specific size."""
         try:
             tts_model = tts.get_tts_model()
-            return tts_model.is_loaded() and getattr(tts_model, 'model_size', None) == model_size
+            return model_size in tts_model.get_resident_model_sizes()
         except Exception:
             return False
     
@@ -1509,7 +1894,17 @@ async def get_model_status():
                 loaded=loaded,
             ))
     
-    return models.ModelStatusListResponse(models=statuses)
+    tts_model = tts.get_tts_model()
+    resident_models = [
+        models.ResidentModel(**resident)
+        for resident in tts_model.get_resident_models()
+    ]
+    
+    return models.ModelStatusListResponse(
+        models=statuses,
+        resident_models=resident_models,
+        memory_budget_mb=get_model_memory_budget_bytes() / (1024 * 1024),
+    )
 
 
 @app.post("/models/download")
@@ -1637,8 +2032,8 @@ async def delete_model(model_name: str):
         # Check if model is loaded and unload it first
         if config["model_type"] == "tts":
             tts_model = tts.get_tts_model()
-            if tts_model.is_loaded() and tts_model.model_size == config["model_size"]:
-                tts.unload_tts_model()
+            if config["model_size"] in tts_model.get_resident_model_sizes():
+                tts.unload_tts_model(config["model_size"])
         elif config["model_type"] == "whisper":
             whisper_model = transcribe.get_whisper_model()
             if whisper_model.is_loaded() and whisper_model.model_size == config["model_size"]:
@@ -1682,13 +2077,42 @@ async def clear_cache():
         raise HTTPException(status_code=500, detail=f"Failed to clear cache: {str(e)}")
 
 
+@app.post("/cache/gc")
+async def run_cache_gc():
+    """
+    Collect voice prompt cache garbage now.
+
+    Deletes prompts and combined audio no current sample uses, then the least
+    recently used files until the cache fits its disk quota.
+    """
+    try:
+        return await get_cache_collector().collect()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to collect cache garbage: {str(e)}")
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get result, voice prompt, decoded audio and served file cache statistics (hit/miss counters, usage, GC)."""
+    return {
+        "results": get_result_cache().get_stats(),
+        "prompts": {
+            **get_prompt_memory_cache().get_stats(),
+            "disk": get_prompt_disk_usage(),
+        },
+        "gc": get_cache_collector().get_stats(),
+        "audio": get_decoded_audio_cache().get_stats(),
+        "files": get_served_file_map().get_stats(),
+    }
+
+
 # ============================================
 # TASK MANAGEMENT
 # ============================================
 
 @app.get("/tasks/active", response_model=models.ActiveTasksResponse)
 async def get_active_tasks():
-    """Return all currently active downloads and generations."""
+    """Return active downloads, generations and background jobs, plus admission queue depth."""
     task_manager = get_task_manager()
     progress_manager = get_progress_manager()
     
@@ -1742,12 +2166,43 @@ async def get_active_tasks():
             started_at=gen_task.started_at,
         ))
     
+    # Background jobs (voice prompt precomputation), queued or running
+    background_jobs = [
+        models.ActiveBackgroundJob(
+            task_id=job.job_id,
+            kind=job.kind,
+            profile_id=job.profile_id,
+            status=job.status,
+            model_size=job.model_size,
+            created_at=job.created_at,
+            started_at=job.started_at,
+        )
+        for job in task_manager.get_active_jobs(JOB_KIND_PRECOMPUTE)
+    ]
+    
     return models.ActiveTasksResponse(
         downloads=active_downloads,
         generations=active_generations,
+        background=background_jobs,
+        admission=get_admission_stats(),
     )
 
 
+@app.delete("/tasks/generations/{task_id}")
+async def cancel_generation(task_id: str):
+    """
+    Cancel a generation by ID.
+
+    Accepts /generate/jobs job IDs, the X-Generation-Id of a
+    /generate/stream response and any task_id listed by /tasks/active.
+    Queued jobs are skipped; running generations stop at the model's next
+    decoding step.
+    """
+    if not get_task_manager().cancel_generation(task_id):
+        raise HTTPException(status_code=404, detail="No cancellable generation with this ID")
+    return {"message": f"Generation {task_id} cancelled"}
+
+
 # ============================================
 # STARTUP & SHUTDOWN
 # ============================================
@@ -1792,11 +2247,63 @@ async def startup_event():
         print(f"Warning: Could not create HuggingFace cache directory: {e}")
         print("Model downloads may fail. Please ensure the directory exists and has write permissions.")
 
+    # Fork inference worker processes after loading the model they share,
+    # before job workers can run anything in this process
+    inference_processes = config.get_inference_processes()
+    if inference_processes > 0:
+        start_process_pool = getattr(tts.get_tts_model(), "start_process_pool", None)
+        if start_process_pool is None:
+            print("Inference worker processes need the PyTorch backend; running in-process")
+        else:
+            try:
+                await start_process_pool(
+                    inference_processes,
+                    model_size=config.get_inference_model_size(),
+                    threads_per_process=config.get_inference_threads_per_process(),
+                )
+            except Exception as e:
+                print(f"Warning: Could not start inference worker processes: {e}")
+
+    # Requeue jobs left over from the last run before any worker starts
+    try:
+        restored = await jobs.restore_jobs()
+        if restored["requeued"] or restored["interrupted"]:
+            print(
+                f"Generation jobs restored: {restored['requeued']} requeued, "
+                f"{restored['interrupted']} interrupted"
+            )
+    except Exception as e:
+        print(f"Warning: Could not restore generation jobs: {e}")
+
+    # Start the generation job workers
+    task_manager = get_task_manager()
+    task_manager.start_workers(config.get_generation_workers())
+    print(f"Generation workers started: {task_manager.get_worker_count()}")
+
+    # Collect orphaned and least recently used cache files periodically
+    get_cache_collector().start(config.get_cache_gc_interval_seconds())
+
+    # Compute waveform peaks of audio stored before peaks existed
+    if config.get_peaks_backfill_enabled():
+        get_peaks_backfill().start()
+
+    # Warm the prompt caches of the most-used profiles in the background
+    get_cache_warmer().start(
+        config.get_warmup_profiles(),
+        model_size=config.get_inference_model_size(),
+        budget_seconds=config.get_warmup_budget_seconds(),
+    )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown."""
     print("Eburon Echo API shutting down...")
+    await get_cache_warmer().stop()
+    await get_cache_collector().stop()
+    await get_peaks_backfill().stop()
+    await get_task_manager().stop_workers()
+    get_result_cache().flush()
     # Unload models to free memory
     tts.unload_tts_model()
     transcribe.unload_whisper_model()
@@ -3,7 +3,7 @@ Pydantic models for request/response validation.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Union
 from datetime import datetime
 
 
@@ -44,6 +44,11 @@ class ProfileSampleResponse(BaseModel):
     profile_id: str
     audio_path: str
     reference_text: str
+    duration: Optional[float] = None  # Seconds; measured at upload
+    rms: Optional[float] = None
+    peak: Optional[float] = None
+    num_samples: Optional[int] = None
+    sample_rate: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -57,6 +62,10 @@ class GenerationRequest(BaseModel):
     seed: Optional[int] = Field(None, ge=0)
     model_size: Optional[str] = Field(default="1.7B", pattern="^(1\\.7B|0\\.6B)$")
     instruct: Optional[str] = Field(None, max_length=500)
+    long_form: Optional[bool] = Field(
+        None,
+        description="Split text into sentence chunks rendered in parallel (default: automatic for long text)",
+    )
 
 
 class GenerationResponse(BaseModel):
@@ -75,6 +84,26 @@ class GenerationResponse(BaseModel):
         from_attributes = True
 
 
+class GenerationJobRequest(GenerationRequest):
+    """Request model for queuing a generation job."""
+    priority: int = Field(default=0, ge=-10, le=10, description="Scheduling priority (higher runs first)")
+
+
+class GenerationJobResponse(BaseModel):
+    """Response model for a queued generation job."""
+    id: str
+    status: str  # queued, running, complete, error, cancelled
+    priority: int
+    profile_id: str
+    model_size: Optional[str] = None
+    queue_position: Optional[int] = None  # Zero-based, only while queued
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    generation: Optional[GenerationResponse] = None
+
+
 class HistoryQuery(BaseModel):
     """Query model for generation history."""
     profile_id: Optional[str] = None
@@ -117,6 +146,18 @@ class TranscriptionResponse(BaseModel):
     duration: float
 
 
+class WarmupStatus(BaseModel):
+    """Response model for the startup cache warm-up."""
+    status: str  # disabled, warming, ready, skipped, error
+    model_size: Optional[str] = None
+    total: int = 0
+    warmed: int = 0
+    failed: int = 0
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     """Response model for health check."""
     status: str
@@ -127,6 +168,8 @@ class HealthResponse(BaseModel):
     gpu_type: Optional[str] = None  # GPU type (CUDA, MPS, or None)
     vram_used_mb: Optional[float] = None
     backend_type: Optional[str] = None  # Backend type (mlx or pytorch)
+    ready: bool = True  # False while the startup cache warm-up is running
+    warmup: Optional[WarmupStatus] = None
 
 
 class ModelStatus(BaseModel):
@@ -139,9 +182,18 @@ class ModelStatus(BaseModel):
     loaded: bool = False
 
 
+class ResidentModel(BaseModel):
+    """Response model for a TTS model held in memory."""
+    model_size: str
+    memory_mb: Optional[float] = None
+    last_used: Optional[float] = None  # Unix timestamp
+
+
 class ModelStatusListResponse(BaseModel):
     """Response model for model status list."""
     models: List[ModelStatus]
+    resident_models: List[ResidentModel] = []  # Least recently used first
+    memory_budget_mb: Optional[float] = None  # 0 keeps one model loaded
 
 
 class ModelDownloadRequest(BaseModel):
@@ -164,10 +216,36 @@ class ActiveGenerationTask(BaseModel):
     started_at: datetime
 
 
+class ActiveBackgroundJob(BaseModel):
+    """Response model for a queued or running background job."""
+    task_id: str
+    kind: str
+    profile_id: str
+    status: str
+    model_size: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+
+
+class AdmissionQueueStatus(BaseModel):
+    """Response model for the admission queue of one endpoint class."""
+    name: str
+    max_concurrent: int
+    max_queue: int
+    active: int
+    waiting: int
+    admitted: int
+    rejected: int
+    timed_out: int
+    wait_ms: Dict[str, Optional[Union[int, float]]]
+
+
 class ActiveTasksResponse(BaseModel):
     """Response model for active tasks."""
     downloads: List[ActiveDownloadTask]
     generations: List[ActiveGenerationTask]
+    background: List[ActiveBackgroundJob] = Field(default_factory=list)
+    admission: Dict[str, AdmissionQueueStatus] = Field(default_factory=dict)
 
 
 class AudioChannelCreate(BaseModel):
@@ -0,0 +1,131 @@
+"""
+Backfill of waveform peaks for audio stored before peaks existed.
+
+New generations and samples get their peaks when they are written (see
+utils/peaks.py). The backfill walks every generation and sample whose peaks
+file is missing and computes it from the audio, one file at a time in a
+worker thread, so clients never have to wait for it on first draw. It runs
+once in the background at startup and on demand.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+
+from . import database
+from .database import Generation as DBGeneration, ProfileSample as DBProfileSample
+from .utils.peaks import has_peaks, write_peaks_for_audio
+
+
+# Backfill states
+BACKFILL_IDLE = "idle"
+BACKFILL_RUNNING = "running"
+BACKFILL_DONE = "done"
+BACKFILL_ERROR = "error"
+
+
+def get_stored_audio_paths() -> List[str]:
+    """Get the audio paths of every generation and profile sample."""
+    db = database.SessionLocal()
+    try:
+        paths = [row[0] for row in db.query(DBGeneration.audio_path)]
+        paths.extend(row[0] for row in db.query(DBProfileSample.audio_path))
+    finally:
+        db.close()
+    return paths
+
+
+class PeaksBackfill:
+    """Computes missing waveform peaks in the background."""
+
+    def __init__(self):
+        self.status = BACKFILL_IDLE
+        self.total = 0
+        self.computed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> bool:
+        """
+        Start a backfill in the background unless one is running.
+
+        Must be called from within the running event loop.
+
+        Returns:
+            Whether a new run was started
+        """
+        if self._task is not None and not self._task.done():
+            return False
+        self.status = BACKFILL_RUNNING
+        self.total = self.computed = self.skipped = self.failed = 0
+        self.started_at = datetime.utcnow()
+        self.completed_at = None
+        self.error = None
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> None:
+        """Cancel a running backfill."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Compute peaks for every stored file that has none."""
+        try:
+            paths = await asyncio.to_thread(get_stored_audio_paths)
+            self.total = len(paths)
+            for path in paths:
+                try:
+                    if await asyncio.to_thread(has_peaks, path):
+                        self.skipped += 1
+                        continue
+                    await asyncio.to_thread(write_peaks_for_audio, path)
+                    self.computed += 1
+                except Exception as e:
+                    # Missing or unreadable audio; the endpoint reports it on use
+                    self.failed += 1
+                    print(f"Peaks backfill failed for {path}: {e}")
+            if self.computed or self.failed:
+                print(f"Peaks backfill done: {self.computed} computed, {self.failed} failed")
+            self.status = BACKFILL_DONE
+        except asyncio.CancelledError:
+            self.status = BACKFILL_ERROR
+            self.error = "Backfill cancelled"
+            raise
+        except Exception as e:
+            print(f"Peaks backfill failed: {e}")
+            self.status = BACKFILL_ERROR
+            self.error = str(e)
+        finally:
+            self.completed_at = datetime.utcnow()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the backfill state and counters."""
+        return {
+            "status": self.status,
+            "total": self.total,
+            "computed": self.computed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error": self.error,
+        }
+
+
+# Global peaks backfill instance
+_peaks_backfill: Optional[PeaksBackfill] = None
+
+
+def get_peaks_backfill() -> PeaksBackfill:
+    """Get or create the global peaks backfill."""
+    global _peaks_backfill
+    if _peaks_backfill is None:
+        _peaks_backfill = PeaksBackfill()
+    return _peaks_backfill
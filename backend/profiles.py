@@ -4,6 +4,9 @@ Voice profile management module.
 
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import hashlib
+import os
 import uuid
 import shutil
 from pathlib import Path
@@ -20,11 +23,17 @@ from .database import (
     VoiceProfile as DBVoiceProfile,
     ProfileSample as DBProfileSample,
 )
-from .utils.audio import validate_reference_audio, load_audio, save_audio
+from .utils.audio import analyze_audio, check_reference_audio, get_storage_suffix, load_audio, save_audio
 from .utils.images import validate_image, process_avatar
-from .utils.cache import _get_cache_dir, clear_profile_cache
+from .utils.peaks import delete_peaks, write_peaks_for_audio
+from .utils.cache import _get_cache_dir, clear_profile_cache, get_sample_cache_key, touch_cache_file
+from .utils.tasks import JOB_KIND_PRECOMPUTE, get_task_manager
 from .tts import get_tts_model
-from . import config
+from . import config, database
+
+
+# Background prompt rebuilds run below any user-chosen job priority (-10..10)
+PRECOMPUTE_PRIORITY = -100
 
 
 def _get_profiles_dir() -> Path:
@@ -90,8 +99,13 @@ async def add_profile_sample(
     if not profile:
         raise ValueError(f"Profile {profile_id} not found")
     
-    # Validate audio
-    is_valid, error_msg = validate_reference_audio(audio_path)
+    # Decode once; validation, metadata and the stored file all use this array
+    try:
+        audio, sr = await asyncio.to_thread(load_audio, audio_path)
+    except Exception as e:
+        raise ValueError(f"Invalid reference audio: Error validating audio: {str(e)}")
+    audio_stats = analyze_audio(audio, sr)
+    is_valid, error_msg = check_reference_audio(audio_stats)
     if not is_valid:
         raise ValueError(f"Invalid reference audio: {error_msg}")
     
@@ -100,10 +114,13 @@ async def add_profile_sample(
     profile_dir = _get_profiles_dir() / profile_id
     profile_dir.mkdir(parents=True, exist_ok=True)
     
-    # Copy audio file to profile directory
-    dest_path = profile_dir / f"{sample_id}.wav"
-    audio, sr = load_audio(audio_path)
-    save_audio(audio, str(dest_path), sr)
+    # Write the canonical 24 kHz mono file to the profile directory
+    dest_path = profile_dir / f"{sample_id}{get_storage_suffix()}"
+    await asyncio.to_thread(save_audio, audio, str(dest_path), sr)
+    await asyncio.to_thread(write_peaks_for_audio, dest_path, audio, sr)
+    
+    # Fingerprint once at ingest so generation never has to rehash the file
+    cache_key, signature = get_sample_cache_key(str(dest_path), reference_text)
     
     # Create database entry
     db_sample = DBProfileSample(
@@ -111,6 +128,15 @@ async def add_profile_sample(
         profile_id=profile_id,
         audio_path=str(dest_path),
         reference_text=reference_text,
+        cache_key=cache_key,
+        audio_size=signature[0],
+        audio_mtime_ns=signature[1],
+        audio_inode=signature[2],
+        duration=audio_stats["duration"],
+        rms=audio_stats["rms"],
+        peak=audio_stats["peak"],
+        num_samples=audio_stats["num_samples"],
+        sample_rate=sr,
     )
     
     db.add(db_sample)
@@ -124,6 +150,7 @@ async def add_profile_sample(
     # Invalidate combined audio cache for this profile
     # Since a new sample was added, any cached combined audio is now stale
     clear_profile_cache(profile_id)
+    await schedule_prompt_precompute(profile_id)
     
     return ProfileSampleResponse.model_validate(db_sample)
 
@@ -277,6 +304,7 @@ async def delete_profile_sample(
     audio_path = Path(sample.audio_path)
     if audio_path.exists():
         audio_path.unlink()
+    delete_peaks(audio_path)
     
     # Delete from database
     db.delete(sample)
@@ -285,6 +313,7 @@ async def delete_profile_sample(
     # Invalidate combined audio cache for this profile
     # Since the sample set changed, any cached combined audio is now stale
     clear_profile_cache(profile_id)
+    await schedule_prompt_precompute(profile_id)
     
     return True
 
@@ -313,20 +342,101 @@ async def update_profile_sample(
     profile_id = sample.profile_id
     
     sample.reference_text = reference_text
+    sample.cache_key = None  # The text is part of the key; recomputed on next use
     db.commit()
     db.refresh(sample)
     
     # Invalidate combined audio cache for this profile
     # Since the reference text changed, cache keys and combined text are now stale
     clear_profile_cache(profile_id)
+    await schedule_prompt_precompute(profile_id)
     
     return ProfileSampleResponse.model_validate(sample)
 
 
+async def get_profile_fingerprint(
+    profile_id: str,
+    db: Session,
+) -> str:
+    """
+    Fingerprint the voice samples of a profile.
+
+    The fingerprint changes whenever a sample's audio or reference text
+    changes, or samples are added or removed.
+
+    Args:
+        profile_id: Profile ID
+        db: Database session
+
+    Returns:
+        Hex digest identifying the profile's sample set
+    """
+    samples = db.query(DBProfileSample).filter_by(profile_id=profile_id).all()
+
+    if not samples:
+        raise ValueError(f"No samples found for profile {profile_id}")
+
+    # Keep query order: it is also the order samples are combined in
+    keys = await _get_sample_cache_keys(samples, db)
+    return hashlib.sha256("|".join(keys).encode()).hexdigest()
+
+
+def _stored_signature(sample: DBProfileSample) -> Optional[tuple]:
+    """Get the file signature stored with a sample, if any."""
+    if sample.audio_size is None or sample.audio_mtime_ns is None or sample.audio_inode is None:
+        return None
+    return (sample.audio_size, sample.audio_mtime_ns, sample.audio_inode)
+
+
+async def _get_sample_cache_keys(
+    samples: List[DBProfileSample],
+    db: Session,
+) -> List[str]:
+    """
+    Get the voice prompt cache keys of samples.
+
+    Keys stored on the rows are used as long as the audio file's stat
+    signature is unchanged. Rows without a key (added before fingerprints
+    were stored, or whose text changed) or whose file changed on disk are
+    rehashed and updated.
+    """
+    known = [
+        (s.audio_path, s.reference_text, s.cache_key, _stored_signature(s))
+        for s in samples
+    ]
+
+    def _keys() -> list:
+        return [get_sample_cache_key(*args) for args in known]
+
+    results = await asyncio.to_thread(_keys)
+
+    changed = False
+    for sample, (cache_key, signature) in zip(samples, results):
+        if sample.cache_key != cache_key or _stored_signature(sample) != signature:
+            sample.cache_key = cache_key
+            sample.audio_size, sample.audio_mtime_ns, sample.audio_inode = signature
+            changed = True
+    if changed:
+        db.commit()
+
+    return [cache_key for cache_key, _ in results]
+
+
+def combined_prompt_key(sample_keys: List[str]) -> str:
+    """Get the voice prompt cache key of a set of samples, from their keys in order."""
+    return hashlib.sha256(("combined|" + "|".join(sample_keys)).encode()).hexdigest()
+
+
+def combined_audio_name(profile_id: str, combined_key: str) -> str:
+    """Get the file name of a profile's combined sample audio in the cache."""
+    return f"combined_{profile_id}_{combined_key[:12]}.wav"
+
+
 async def create_voice_prompt_for_profile(
     profile_id: str,
     db: Session,
     use_cache: bool = True,
+    model_size: Optional[str] = None,
 ) -> dict:
     """
     Create a combined voice prompt from all samples in a profile.
@@ -335,6 +445,8 @@ async def create_voice_prompt_for_profile(
         profile_id: Profile ID
         db: Database session
         use_cache: Whether to use cached prompts
+        model_size: Model size to build the prompt with (defaults to the
+            backend's current one)
 
     Returns:
         Voice prompt dictionary
@@ -350,46 +462,125 @@ async def create_voice_prompt_for_profile(
     if len(samples) == 1:
         # Single sample - use directly
         sample = samples[0]
+        cache_keys = await _get_sample_cache_keys(samples, db)
         voice_prompt, _ = await tts_model.create_voice_prompt(
             sample.audio_path,
             sample.reference_text,
             use_cache=use_cache,
+            model_size=model_size,
+            cache_key=cache_keys[0],
         )
         return voice_prompt
     else:
         # Multiple samples - combine them
         audio_paths = [s.audio_path for s in samples]
         reference_texts = [s.reference_text for s in samples]
+        combined_text = " ".join(reference_texts)
 
-        # Combine audio
-        combined_audio, combined_text = await tts_model.combine_voice_prompts(
-            audio_paths,
-            reference_texts,
-        )
+        # Identify the combination by sample content (the per-sample cache
+        # keys), so the combined prompt is cached per sample set and model
+        # and the audio is only decoded and combined when that set changes
+        sample_keys = await _get_sample_cache_keys(samples, db)
+        combined_key = combined_prompt_key(sample_keys)
 
-        # Save combined audio to cache directory (persistent)
-        # Create a hash of sample IDs to identify this specific combination
-        import hashlib
-        sample_ids_str = "-".join(sorted([s.id for s in samples]))
-        combination_hash = hashlib.md5(sample_ids_str.encode()).hexdigest()[:12]
-        
         # Store in cache directory
         cache_dir = _get_cache_dir()
         cache_dir.mkdir(parents=True, exist_ok=True)
-        combined_path = cache_dir / f"combined_{profile_id}_{combination_hash}.wav"
-        
-        # Save combined audio
-        save_audio(combined_audio, str(combined_path), 24000)
-
-        # Create prompt from combined audio
+        combined_path = cache_dir / combined_audio_name(profile_id, combined_key)
+
+        if combined_path.exists():
+            touch_cache_file(combined_path)  # Recently used, for cache GC
+        else:
+            # Cache GC may have removed the audio but kept its prompt
+            if use_cache:
+                voice_prompt = tts_model.get_cached_prompt(combined_key, model_size)
+                if voice_prompt is not None:
+                    return voice_prompt
+
+            # Combine audio
+            combined_audio, _ = await tts_model.combine_voice_prompts(
+                audio_paths,
+                reference_texts,
+            )
+
+            # Save combined audio (atomically: other requests may read it)
+            tmp_path = combined_path.with_name(f"{combined_path.stem}.tmp.wav")
+            save_audio(combined_audio, str(tmp_path), 24000)
+            os.replace(tmp_path, combined_path)
+
+        # Create prompt from combined audio; a cached prompt skips the model
         voice_prompt, _ = await tts_model.create_voice_prompt(
             str(combined_path),
             combined_text,
             use_cache=use_cache,
+            model_size=model_size,
+            cache_key=combined_key,
         )
         return voice_prompt
 
 
+def _get_precompute_model_sizes() -> List[str]:
+    """Get the resident model sizes a background prompt rebuild should cover."""
+    resident = get_tts_model().get_resident_model_sizes()  # Most recent last
+    if config.get_prompt_precompute_all_resident():
+        return resident
+    return resident[-1:]
+
+
+async def schedule_prompt_precompute(profile_id: str) -> Optional[str]:
+    """
+    Queue a low-priority job that rebuilds a profile's voice prompt.
+
+    The job runs on the generation job queue after any user jobs, so the next
+    generation for the profile finds its prompt already cached. It is skipped
+    when no model is loaded, and coalesced with a rebuild for the same profile
+    that has not started yet. These jobs never take room from user jobs in
+    the queue; when too many are waiting the oldest is dropped, and its
+    profile's prompt is built on first use instead.
+
+    Args:
+        profile_id: Profile whose samples changed
+
+    Returns:
+        ID of the queued (or already queued) job, or None if nothing was queued
+    """
+    if not config.get_prompt_precompute_enabled():
+        return None
+    model_sizes = _get_precompute_model_sizes()
+    if not model_sizes:
+        return None
+
+    task_manager = get_task_manager()
+    for job in task_manager.get_active_jobs(JOB_KIND_PRECOMPUTE):
+        if job.profile_id == profile_id and job.started_at is None:
+            return job.job_id
+
+    async def run_precompute():
+        db = database.SessionLocal()
+        try:
+            if not db.query(DBProfileSample).filter_by(profile_id=profile_id).count():
+                return []  # Last sample was deleted; nothing to warm
+            # Resolved when the job runs: models may have changed meanwhile
+            warmed = []
+            for model_size in _get_precompute_model_sizes():
+                await create_voice_prompt_for_profile(profile_id, db, model_size=model_size)
+                warmed.append(model_size)
+            return warmed
+        finally:
+            db.close()
+
+    job = await task_manager.submit_job(
+        job_id=str(uuid.uuid4()),
+        profile_id=profile_id,
+        text="Precompute voice prompt",
+        run=run_precompute,
+        priority=PRECOMPUTE_PRIORITY,
+        model_size=model_sizes[-1],
+        kind=JOB_KIND_PRECOMPUTE,
+    )
+    return job.job_id
+
+
 async def upload_avatar(
     profile_id: str,
     image_path: str,
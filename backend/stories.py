@@ -22,7 +22,8 @@ from .models import (
     StoryItemSplit,
 )
 from .database import Story as DBStory, StoryItem as DBStoryItem, Generation as DBGeneration, VoiceProfile as DBVoiceProfile
-from .utils.audio import load_audio, save_audio
+from .utils.audio import save_audio
+from .utils.audio_cache import load_audio_cached
 import numpy as np
 
 
@@ -882,7 +883,7 @@ async def export_story_audio(
             continue
 
         try:
-            audio, sr = load_audio(str(audio_path), sample_rate=sample_rate)
+            audio, sr = load_audio_cached(str(audio_path), sample_rate=sample_rate)
             sample_rate = sr  # Use actual sample rate from first file
             
             # Get trim values
@@ -0,0 +1,113 @@
+"""
+Unit tests for inference endpoint admission control.
+
+Usage:
+    cd backend
+    python tests/test_admission.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.admission import AdmissionController, AdmissionRejected
+
+
+def test_queue_full_rejects():
+    """Requests beyond the concurrency limit and wait queue get a 429."""
+    async def scenario():
+        controller = AdmissionController("generate", max_concurrent=1, max_queue=1, queue_timeout=5)
+        release = await controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert controller.get_stats()["waiting"] == 1
+
+        try:
+            await controller.acquire()
+            raise AssertionError("Expected AdmissionRejected")
+        except AdmissionRejected as e:
+            assert e.status_code == 429
+            assert e.retry_after >= 1
+
+        release()
+        release()  # Releasing twice is harmless
+        second_release = await waiter
+        stats = controller.get_stats()
+        assert stats["active"] == 1 and stats["rejected"] == 1, stats
+        second_release()
+        assert controller.get_stats()["active"] == 0
+
+    asyncio.run(scenario())
+    print("✓ Queue full rejection PASSED")
+    return True
+
+
+def test_queue_timeout():
+    """Waiting longer than the queue timeout gets a 503."""
+    async def scenario():
+        controller = AdmissionController("stream", max_concurrent=1, max_queue=4, queue_timeout=0.05)
+        release = await controller.acquire()
+        try:
+            await controller.acquire()
+            raise AssertionError("Expected AdmissionRejected")
+        except AdmissionRejected as e:
+            assert e.status_code == 503
+        release()
+        assert controller.get_stats()["timed_out"] == 1
+
+    asyncio.run(scenario())
+    print("✓ Queue timeout PASSED")
+    return True
+
+
+def test_timeouts_racing_releases_keep_permits():
+    """Waiters timing out as slots free up never lose a permit, on either acquire path."""
+    async def scenario():
+        controller = AdmissionController("generate", max_concurrent=2, max_queue=50, queue_timeout=0.02)
+        loop = asyncio.get_running_loop()
+
+        async def request():
+            try:
+                release = await controller.acquire()
+            except AdmissionRejected:
+                return
+            await asyncio.sleep(0)
+            release()
+
+        for _ in range(5):
+            releases = [await controller.acquire() for _ in range(2)]
+            waiters = [asyncio.ensure_future(request()) for _ in range(20)]
+            # Free the slots right at the waiters' deadline
+            for release in releases:
+                loop.call_later(0.02, release)
+            await asyncio.gather(*waiters)
+
+        semaphore = controller._get_semaphore()
+        assert controller.get_stats()["active"] == 0
+        for _ in range(2):
+            await asyncio.wait_for(semaphore.acquire(), timeout=1)
+        assert semaphore.locked()
+
+    asyncio.run(scenario())
+
+    # The task-based path used before asyncio.timeout existed
+    timeout = asyncio.timeout
+    del asyncio.timeout
+    try:
+        asyncio.run(scenario())
+    finally:
+        asyncio.timeout = timeout
+    print("✓ Timeout race PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_queue_full_rejects(),
+        test_queue_timeout(),
+        test_timeouts_racing_releases_keep_permits(),
+    ]
+    exit(0 if all(results) else 1)
@@ -0,0 +1,129 @@
+"""
+Unit tests for reference audio measurement and validation.
+
+Usage:
+    cd backend
+    python tests/test_audio.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.audio import (
+    analyze_audio,
+    check_reference_audio,
+    load_audio,
+    negotiate_audio_format,
+    resample_audio,
+    save_audio,
+    transcode_audio_file,
+)
+
+
+def test_analyze_and_check():
+    """Measurements drive validation without decoding the file again."""
+    sr = 24000
+    t = np.arange(3 * sr) / sr
+    audio = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    stats = analyze_audio(audio, sr)
+    assert stats["num_samples"] == 3 * sr
+    assert stats["duration"] == 3.0
+    assert abs(stats["rms"] - 0.5 / np.sqrt(2)) < 1e-3, stats
+    assert abs(stats["peak"] - 0.5) < 1e-3, stats
+    assert check_reference_audio(stats) == (True, None)
+
+    assert "too short" in check_reference_audio(analyze_audio(audio[:sr], sr))[1]
+    assert "too quiet" in check_reference_audio(analyze_audio(audio * 0.001, sr))[1]
+    assert "clipping" in check_reference_audio(analyze_audio(audio * 2.0, sr))[1]
+    assert analyze_audio(np.zeros(0, dtype=np.float32), sr)["duration"] == 0.0
+    print("✓ Audio analysis PASSED")
+    return True
+
+
+def test_load_audio_fast_path_and_ranges():
+    """Native-rate files are read as-is; ranges and resampling match the full read."""
+    sr = 24000
+    audio = np.linspace(-0.5, 0.5, 4 * sr, dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.wav")
+        sf.write(path, audio, sr, subtype="FLOAT")
+
+        loaded, loaded_sr = load_audio(path)
+        assert loaded_sr == sr and loaded.dtype == np.float32
+        assert np.array_equal(loaded, audio)
+
+        part, _ = load_audio(path, offset=1.0, duration=0.5)
+        assert np.array_equal(part, audio[sr:sr + sr // 2])
+
+        stereo_path = os.path.join(tmp, "stereo.wav")
+        sf.write(stereo_path, np.stack([audio, -audio], axis=1), 48000, subtype="FLOAT")
+        both, native_sr = load_audio(stereo_path, sample_rate=None, mono=False)
+        assert native_sr == 48000 and both.shape == (2, len(audio))
+        mono, mono_sr = load_audio(stereo_path)
+        assert mono_sr == sr and len(mono) == len(audio) // 2
+        assert np.abs(mono).max() < 1e-6  # The channels cancel out
+
+    for resampler in ("soxr_hq", "polyphase"):
+        resampled = resample_audio(audio, sr, 16000, resampler=resampler)
+        assert resampled.dtype == np.float32 and len(resampled) == len(audio) * 2 // 3
+    print("✓ Audio loading PASSED")
+    return True
+
+
+def test_storage_formats():
+    """FLAC stores 16-bit samples like WAV; Opus is smaller; transcoding is lossless."""
+    sr = 24000
+    t = np.arange(sr * 2) / sr
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for suffix in (".wav", ".flac", ".ogg"):
+            paths[suffix] = os.path.join(tmp, f"a{suffix}")
+            save_audio(audio, paths[suffix], sr)
+        assert sf.info(paths[".ogg"]).subtype == "OPUS"
+
+        wav, _ = load_audio(paths[".wav"])
+        flac, _ = load_audio(paths[".flac"])
+        assert np.abs(wav - flac).max() <= 1 / 32768  # Both quantized to 16 bits
+        assert os.path.getsize(paths[".flac"]) < os.path.getsize(paths[".wav"])
+        assert os.path.getsize(paths[".ogg"]) < os.path.getsize(paths[".flac"])
+        opus, opus_sr = load_audio(paths[".ogg"])
+        assert opus_sr == sr and abs(len(opus) - len(audio)) < sr // 10
+
+        wav_path = os.path.join(tmp, "transcoded.wav")
+        with open(wav_path, "wb") as f:
+            f.write(transcode_audio_file(paths[".flac"], "wav"))
+        transcoded, _ = load_audio(wav_path)
+        assert sf.info(wav_path).format == "WAV"
+        assert np.array_equal(transcoded, flac)
+
+    # Sent as stored unless WAV is asked for or the stored type is excluded
+    assert negotiate_audio_format("flac") == "flac"
+    assert negotiate_audio_format("flac", accept="*/*") == "flac"
+    assert negotiate_audio_format("flac", accept="audio/flac, audio/wav") == "flac"
+    assert negotiate_audio_format("flac", accept="audio/wav, audio/*;q=0.9") == "flac"
+    assert negotiate_audio_format("flac", accept="audio/wav, audio/flac;q=0") == "wav"
+    assert negotiate_audio_format("opus", accept="audio/x-wav") == "wav"
+    assert negotiate_audio_format("flac", accept="audio/wav", requested="stored") == "flac"
+    assert negotiate_audio_format("flac", accept="audio/flac", requested="wav") == "wav"
+    print("✓ Storage formats PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_analyze_and_check(),
+        test_load_audio_fast_path_and_ranges(),
+        test_storage_formats(),
+    ]
+    exit(0 if all(results) else 1)
@@ -0,0 +1,84 @@
+"""
+Unit tests for the decoded audio cache.
+
+Usage:
+    cd backend
+    python tests/test_audio_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.audio_cache import DecodedAudioCache
+
+
+def write_clip(path: str, value: float, seconds: float = 1.0, sr: int = 24000) -> None:
+    sf.write(path, np.full(int(seconds * sr), value, dtype=np.float32), sr, subtype="FLOAT")
+
+
+def test_hits_are_shared_and_read_only():
+    """Repeat loads share one read-only array; rates are cached separately."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.wav")
+        write_clip(path, 0.25)
+        cache = DecodedAudioCache(max_bytes=10 * 1024 * 1024)
+
+        first, sr = cache.load(path)
+        second, _ = cache.load(path)
+        assert second is first and sr == 24000
+        assert not first.flags.writeable
+        try:
+            first[0] = 1.0
+            assert False, "expected a read-only array"
+        except ValueError:
+            pass
+
+        low, low_sr = cache.load(path, sample_rate=16000)
+        assert low_sr == 16000 and low is not first
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2, stats
+        assert stats["size_bytes"] == first.nbytes + low.nbytes, stats
+    print("✓ Shared decoded audio PASSED")
+    return True
+
+
+def test_rewritten_files_and_budget():
+    """A rewritten file is decoded again and the byte budget evicts LRU entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = os.path.join(tmp, "a.wav"), os.path.join(tmp, "b.wav")
+        write_clip(a, 0.25)
+        write_clip(b, 0.5)
+        clip_bytes = 24000 * 4
+        cache = DecodedAudioCache(max_bytes=int(clip_bytes * 1.5))
+
+        cache.load(a)
+        time.sleep(0.01)
+        write_clip(a, 0.75)
+        audio, _ = cache.load(a)
+        assert audio[0] == 0.75
+        assert cache.get_stats()["entries"] == 1  # The stale version was replaced
+
+        cache.load(b)  # Only one clip fits
+        stats = cache.get_stats()
+        assert stats["entries"] == 1 and stats["evictions"] == 1, stats
+        assert stats["size_bytes"] <= cache.max_bytes
+    print("✓ Decoded audio invalidation PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_hits_are_shared_and_read_only(),
+        test_rewritten_files_and_budget(),
+    ]
+    exit(0 if all(results) else 1)
@@ -0,0 +1,88 @@
+"""
+Unit tests for MicroBatcher.
+
+Usage:
+    cd backend
+    python tests/test_batching.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.batching import MicroBatcher
+
+
+def test_batches_within_window():
+    """Concurrent submissions are grouped up to max_batch_size."""
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch_size=4, window_ms=20)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(6)])
+        return results, batcher.get_stats()
+
+    results, stats = asyncio.run(scenario())
+
+    assert results == [0, 2, 4, 6, 8, 10], results
+    assert [len(c) for c in calls] == [4, 2], calls
+    assert stats["batch_size_histogram"] == {2: 1, 4: 1}
+    assert stats["total_requests"] == 6
+    print("✓ Window batching PASSED")
+
+
+def test_groups_are_not_mixed():
+    """Items with different group keys never share a batch."""
+    calls = []
+
+    def process(items):
+        calls.append(sorted(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch_size=8, window_ms=10)
+        await asyncio.gather(
+            batcher.submit("a1", group_key="a"),
+            batcher.submit("b1", group_key="b"),
+            batcher.submit("a2", group_key="a"),
+        )
+
+    asyncio.run(scenario())
+
+    assert sorted(calls) == [["a1", "a2"], ["b1"]], calls
+    print("✓ Group isolation PASSED")
+
+
+def test_failed_batch_falls_back_to_single_items():
+    """A failing item only fails its own caller."""
+    def process(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch_size=4, window_ms=10)
+        return await asyncio.gather(
+            batcher.submit("ok"),
+            batcher.submit("bad"),
+            return_exceptions=True,
+        )
+
+    ok, bad = asyncio.run(scenario())
+
+    assert ok == "OK"
+    assert isinstance(bad, ValueError)
+    print("✓ Batch failure isolation PASSED")
+
+
+if __name__ == "__main__":
+    test_batches_within_window()
+    test_groups_are_not_mixed()
+    test_failed_batch_falls_back_to_single_items()
@@ -0,0 +1,93 @@
+"""
+Unit tests for voice prompt cache garbage collection.
+
+Usage:
+    cd backend
+    python tests/test_cache_gc.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils import cache as cache_module
+from backend.utils.cache import collect_cache_garbage
+
+
+def write_file(path: Path, size: int, age_seconds: float) -> Path:
+    """Write a file of size bytes whose mtime lies age_seconds in the past."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_orphans_and_leftovers():
+    """Unused prompts and combined audio are removed once past the grace period."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        original = cache_module._get_cache_dir
+        cache_module._get_cache_dir = lambda: cache_dir
+        try:
+            prompts = cache_dir / "prompts" / "pytorch" / "model"
+            live = write_file(prompts / "live.prompt.safetensors", 10, 3600)
+            orphan = write_file(prompts / "gone.prompt.safetensors", 10, 3600)
+            fresh = write_file(prompts / "new.prompt.safetensors", 10, 0)
+            write_file(prompts / "x.prompt.safetensors.tmp", 10, 3600)
+            write_file(cache_dir / "legacy.prompt", 10, 3600)
+            kept_wav = write_file(cache_dir / "combined_p1_aaaa.wav", 10, 3600)
+            write_file(cache_dir / "combined_p2_bbbb.wav", 10, 3600)
+            results = write_file(cache_dir / "results" / "r.wav", 10, 3600)
+
+            stats = collect_cache_garbage(
+                0,
+                live_keys={"live"},
+                live_combined={"combined_p1_aaaa.wav"},
+            )
+            assert stats["orphans_deleted"] == 4, stats
+            assert stats["evicted"] == 0, stats
+            assert live.exists() and kept_wav.exists()
+            assert fresh.exists()  # Still within the grace period
+            assert not orphan.exists()
+            assert results.exists()  # The result cache is not managed here
+            assert stats["files"] == 3, stats
+        finally:
+            cache_module._get_cache_dir = original
+
+    print("✓ Cache orphans PASSED")
+
+
+def test_quota_evicts_least_recently_used():
+    """Files are evicted oldest-use first until the rest fits the quota."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        original = cache_module._get_cache_dir
+        cache_module._get_cache_dir = lambda: cache_dir
+        try:
+            prompts = cache_dir / "prompts" / "pytorch" / "model"
+            old = write_file(prompts / "a.prompt.safetensors", 100, 300)
+            used = write_file(prompts / "b.prompt.safetensors", 100, 200)
+            recent = write_file(prompts / "c.prompt.safetensors", 100, 100)
+            os.utime(used)  # Used just now
+
+            # No live set given: nothing counts as an orphan
+            stats = collect_cache_garbage(150)
+            assert stats["evicted"] == 2, stats
+            assert not old.exists() and not recent.exists()
+            assert used.exists()
+            assert stats["size_bytes"] == 100, stats
+        finally:
+            cache_module._get_cache_dir = original
+
+    print("✓ Cache quota PASSED")
+
+
+if __name__ == "__main__":
+    test_orphans_and_leftovers()
+    test_quota_evicts_least_recently_used()
@@ -0,0 +1,116 @@
+"""
+Unit tests for ETag, conditional GET and byte-range file serving.
+
+Usage:
+    cd backend
+    python tests/test_file_serving.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.file_serving import (
+    RangeNotSatisfiable,
+    ServedFileMap,
+    file_response,
+    make_etag,
+    parse_range,
+)
+
+
+def test_parse_range():
+    """Single ranges are clamped to the file; others fall back to the full file."""
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=90-500", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=-500", 100) == (0, 99)
+    assert parse_range("bytes=0-9,20-29", 100) is None
+    assert parse_range("bytes=9-0", 100) is None
+    assert parse_range("items=0-9", 100) is None
+    for header in ("bytes=100-", "bytes=-0"):
+        try:
+            parse_range(header, 100)
+            assert False, header
+        except RangeNotSatisfiable:
+            pass
+    print("✓ Range parsing PASSED")
+    return True
+
+
+def test_served_file_map():
+    """Known ids are served from memory until their file changes or goes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "a.flac"
+        path.write_bytes(b"first")
+        served_files = ServedFileMap()
+
+        assert served_files.get("generation", "g1") is None
+        served = served_files.resolve("generation", "g1", path)
+        assert served_files.get("generation", "g1") == served
+
+        path.write_bytes(b"second version")
+        assert served_files.get("generation", "g1") is None
+        changed = served_files.resolve("generation", "g1", path)
+        assert changed.fingerprint != served.fingerprint
+
+        os.unlink(path)
+        assert served_files.get("generation", "g1") is None
+        assert served_files.get_stats()["hits"] == 1
+    print("✓ Served file map PASSED")
+    return True
+
+
+def test_conditional_and_range_responses():
+    """304 on a matching ETag, 206 for a range, 416 past the end."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "a.flac"
+        content = bytes(range(256)) * 4
+        path.write_bytes(content)
+        etag = make_etag("abc")
+
+        async def endpoint(request):
+            return file_response(request, path, "audio/flac", etag, immutable=True)
+
+        client = TestClient(Starlette(routes=[Route("/a", endpoint)]))
+
+        response = client.get("/a")
+        assert response.status_code == 200 and response.content == content
+        assert response.headers["etag"] == etag
+        assert "immutable" in response.headers["cache-control"]
+
+        assert client.get("/a", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/a", headers={"If-None-Match": '"other"'}).status_code == 200
+
+        response = client.get("/a", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+        assert response.content == content[100:200]
+
+        # A stale If-Range gets the whole (changed) file instead
+        response = client.get("/a", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+        assert response.status_code == 200 and len(response.content) == len(content)
+
+        response = client.get("/a", headers={"Range": f"bytes={len(content)}-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(content)}"
+    print("✓ Conditional and range responses PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_parse_range(),
+        test_served_file_map(),
+        test_conditional_and_range_responses(),
+    ]
+    exit(0 if all(results) else 1)
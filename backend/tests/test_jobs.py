@@ -0,0 +1,127 @@
+"""
+Unit tests for persistent generation jobs.
+
+Usage:
+    cd backend
+    python tests/test_jobs.py
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend import database, jobs
+from backend.database import Base, GenerationJob, VoiceProfile
+from backend.models import GenerationRequest
+from backend.utils import tasks
+from backend.utils.tasks import TaskManager
+
+
+_original_session = database.SessionLocal
+_original_task_manager = tasks._task_manager
+
+
+def _restore_globals():
+    """Undo _use_memory_db for the tests that run after these."""
+    database.SessionLocal = _original_session
+    tasks._task_manager = _original_task_manager
+
+
+def _use_memory_db():
+    """Point the job store at a fresh in-memory database and scheduler."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    database.SessionLocal = sessionmaker(bind=engine)
+    tasks._task_manager = TaskManager(max_queue_size=10)
+    db = database.SessionLocal()
+    db.add(VoiceProfile(id="p", name="p"))
+    db.commit()
+    db.close()
+
+
+def test_jobs_are_recorded():
+    """Queued jobs get a row that follows their status."""
+    _use_memory_db()
+
+    async def scenario():
+        request = GenerationRequest(profile_id="p", text="Hello.")
+        job = await jobs.submit_generation_job(request, priority=3, model_size="0.6B")
+
+        db = database.SessionLocal()
+        try:
+            response = jobs.get_job_response(job.job_id, db)
+            assert response.status == "queued"
+            assert response.priority == 3 and response.model_size == "0.6B"
+            assert response.queue_position == 0
+            row = db.query(GenerationJob).filter_by(id=job.job_id).one()
+            assert GenerationRequest.model_validate_json(row.request) == request
+        finally:
+            db.close()
+
+        assert tasks.get_task_manager().cancel_generation(job.job_id)
+        db = database.SessionLocal()
+        try:
+            response = jobs.get_job_response(job.job_id, db)
+            assert response.status == "cancelled" and response.queue_position is None
+            assert jobs.get_job_response("missing", db) is None
+        finally:
+            db.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        _restore_globals()
+    print("✓ Job records PASSED")
+
+
+def test_restore_after_restart():
+    """Queued jobs are requeued in order; jobs left running end in error."""
+    _use_memory_db()
+    request = json.dumps({"profile_id": "p", "text": "Hello."})
+    db = database.SessionLocal()
+    for job_id, status in [("first", "queued"), ("running", "running"), ("second", "queued")]:
+        db.add(GenerationJob(id=job_id, profile_id="p", status=status, request=request))
+        db.commit()
+    db.add(GenerationJob(id="broken", profile_id="p", status="queued", request="{}"))
+    db.commit()
+    db.close()
+
+    async def scenario():
+        restored = await jobs.restore_jobs()
+        assert restored == {"requeued": 2, "interrupted": 1}, restored
+
+        task_manager = tasks.get_task_manager()
+        assert task_manager.get_queue_position("first") == 0
+        assert task_manager.get_queue_position("second") == 1
+
+        db = database.SessionLocal()
+        try:
+            running = jobs.get_job_response("running", db)
+            assert running.status == "error" and running.error == jobs.INTERRUPTED_JOB_ERROR
+            assert jobs.get_job_response("broken", db).status == "error"
+            assert jobs.get_job_response("second", db).queue_position == 1
+        finally:
+            db.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        _restore_globals()
+    print("✓ Job restore PASSED")
+
+
+if __name__ == "__main__":
+    test_jobs_are_recorded()
+    test_restore_after_restart()
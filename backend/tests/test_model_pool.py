@@ -0,0 +1,118 @@
+"""
+Unit tests for multi-model residency in the PyTorch TTS backend.
+
+Model loading is replaced with a stand-in object so no weights are needed.
+
+Usage:
+    cd backend
+    python tests/test_model_pool.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.backends.pytorch_backend import PyTorchTTSBackend
+
+MB = 1024 * 1024
+SIZES_MB = {"1.7B": 300, "0.6B": 100}
+
+
+def make_backend(budget_mb: int):
+    """Create a backend whose loads are recorded instead of hitting the disk."""
+    backend = PyTorchTTSBackend()
+    backend._memory_budget = budget_mb * MB
+    loads = []
+
+    def fake_load(model_size):
+        loads.append(model_size)
+        return object()
+
+    backend._load_model_sync = fake_load
+    backend._estimate_model_bytes = lambda size: SIZES_MB[size] * MB
+    backend._measure_model_bytes = lambda model: 0
+    return backend, loads
+
+
+def test_budget_keeps_sizes_resident():
+    """Alternating sizes load each once when both fit the budget."""
+    async def scenario():
+        backend, loads = make_backend(budget_mb=500)
+        for size in ["0.6B", "1.7B"] * 3:
+            used_size, model = await backend._acquire_model(size)
+            assert used_size == size
+            assert model is backend.model
+        assert loads == ["0.6B", "1.7B"], loads
+        assert backend.get_resident_model_sizes() == ["0.6B", "1.7B"]
+
+        backend.unload_model("1.7B")
+        assert backend.get_resident_model_sizes() == ["0.6B"]
+        assert backend._current_model_size == "0.6B"
+
+    asyncio.run(scenario())
+    print("✓ Resident models PASSED")
+    return True
+
+
+def test_lru_eviction():
+    """The least recently used size is evicted to make room."""
+    async def scenario():
+        backend, loads = make_backend(budget_mb=0)
+        await backend.load_model_async("0.6B")
+        await backend.load_model_async("1.7B")
+        assert backend.get_resident_model_sizes() == ["1.7B"]
+        assert loads == ["0.6B", "1.7B"]
+
+        backend, loads = make_backend(budget_mb=420)
+        backend._estimate_model_bytes = lambda size: {"1.7B": 300, "0.6B": 100, "big": 300}[size] * MB
+        await backend.load_model_async("0.6B")
+        await backend.load_model_async("1.7B")
+        await backend.load_model_async("0.6B")  # 1.7B is now least recently used
+        await backend.load_model_async("big")
+        assert backend.get_resident_model_sizes() == ["0.6B", "big"], backend.get_resident_model_sizes()
+
+    asyncio.run(scenario())
+    print("✓ LRU eviction PASSED")
+    return True
+
+
+def test_load_registers_its_own_model():
+    """A size switch during a load never registers the wrong model."""
+    async def scenario():
+        backend, _ = make_backend(budget_mb=500)
+        small = (await backend._acquire_model("0.6B"))[1]
+        loading = asyncio.Event()
+        release = asyncio.Event()
+        loaded = object()
+        loop = asyncio.get_running_loop()
+
+        def slow_load(model_size):
+            loop.call_soon_threadsafe(loading.set)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return loaded
+
+        backend._load_model_sync = slow_load
+        load = asyncio.create_task(backend._acquire_model("1.7B"))
+        await loading.wait()
+        # A request on the resident size switches the current model meanwhile
+        assert (await backend._acquire_model("0.6B"))[1] is small
+        release.set()
+        assert (await load)[1] is loaded
+        assert backend._resident_models["1.7B"] is loaded
+        assert backend._resident_models["0.6B"] is small
+
+    asyncio.run(scenario())
+    print("✓ Load registration PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_budget_keeps_sizes_resident(),
+        test_lru_eviction(),
+        test_load_registers_its_own_model(),
+    ]
+    exit(0 if all(results) else 1)
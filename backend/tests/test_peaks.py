@@ -0,0 +1,92 @@
+"""
+Unit tests for multi-resolution waveform peaks.
+
+Usage:
+    cd backend
+    python tests/test_peaks.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.audio import save_audio
+from backend.utils.peaks import (
+    PAYLOAD_HEADER,
+    PEAKS_BASE_SAMPLES_PER_PEAK,
+    PEAKS_LEVELS,
+    compute_peak_levels,
+    get_peak_level_payload,
+    get_peaks_path,
+    load_peaks,
+    write_peaks_for_audio,
+)
+
+
+def test_pyramid_contains_signal():
+    """Every level's envelope contains the audio, and levels merge pairwise."""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(24000 + 100) * 0.3).clip(-1, 1).astype(np.float32)
+    levels = compute_peak_levels(audio)
+    assert len(levels) == PEAKS_LEVELS
+
+    base = PEAKS_BASE_SAMPLES_PER_PEAK
+    level0 = levels[0]
+    assert level0.dtype == np.int8 and len(level0) == -(-len(audio) // base)
+    for i, (low, high) in enumerate(level0):
+        block = audio[i * base:(i + 1) * base] * 127
+        assert low <= block.min() and high >= block.max()
+
+    for finer, coarser in zip(levels, levels[1:]):
+        assert len(coarser) == -(-len(finer) // 2)
+        assert coarser[0, 0] == finer[:2, 0].min() and coarser[0, 1] == finer[:2, 1].max()
+    assert len(levels[-1]) < len(level0)
+
+    assert all(len(level) == 0 for level in compute_peak_levels(np.zeros(0, dtype=np.float32)))
+    print("✓ Peak pyramid PASSED")
+    return True
+
+
+def test_stored_peaks_and_payload():
+    """Peaks round-trip through their file and are computed on demand when missing."""
+    sr = 24000
+    audio = (0.5 * np.sin(2 * np.pi * 220 * np.arange(sr) / sr)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = Path(tmp) / "g.flac"
+        save_audio(audio, str(audio_path), sr)
+
+        peaks_path = write_peaks_for_audio(audio_path, audio, sr)
+        assert peaks_path == get_peaks_path(audio_path) == Path(tmp) / "g.peaks"
+        peaks = load_peaks(peaks_path)
+        assert peaks["sample_rate"] == sr and peaks["num_samples"] == len(audio)
+        for stored, computed in zip(peaks["levels"], compute_peak_levels(audio)):
+            assert np.array_equal(stored, computed)
+
+        peaks_path.unlink()
+        payload = get_peak_level_payload(audio_path, 2)
+        assert peaks_path.exists()
+        magic, _, level, num_levels, rate, samples_per_peak, count = PAYLOAD_HEADER.unpack_from(payload)
+        assert (magic, level, num_levels, rate) == (b"EEPK", 2, PEAKS_LEVELS, sr)
+        assert samples_per_peak == PEAKS_BASE_SAMPLES_PER_PEAK * 4
+        assert len(payload) == PAYLOAD_HEADER.size + 2 * count
+
+        try:
+            get_peak_level_payload(audio_path, PEAKS_LEVELS)
+            assert False, "Missing level accepted"
+        except ValueError:
+            pass
+    print("✓ Stored peaks PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_pyramid_contains_signal(),
+        test_stored_peaks_and_payload(),
+    ]
+    exit(0 if all(results) else 1)
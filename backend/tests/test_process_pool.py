@@ -0,0 +1,111 @@
+"""
+Unit tests for the fork-after-load inference worker pool.
+
+Usage:
+    cd backend
+    python tests/test_process_pool.py
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.cancellation import CancellationToken, GenerationCancelled, check_cancelled
+from backend.utils.process_pool import InferenceProcessPool, split_cores
+
+
+def test_split_cores():
+    """Cores are split into contiguous near-equal slices."""
+    assert split_cores(range(8), 2) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert split_cores([5, 1, 3, 2, 4], 2) == [[1, 2, 3], [4, 5]]
+    # Fewer cores than processes: no pinning
+    assert split_cores([0], 2) == [[], []]
+    print("✓ Core slicing PASSED")
+
+
+def test_workers_share_parent_state():
+    """Workers see state loaded before the fork and report errors and cancellation."""
+    if not InferenceProcessPool.is_supported():
+        print("- fork() not available, skipped")
+        return
+
+    loaded = {"weights": [1.0, 2.0]}  # Stands in for a model loaded before forking
+
+    def handler(request):
+        if request == "fail":
+            raise ValueError("bad request")
+        if request == "slow":
+            for _ in range(100):
+                time.sleep(0.02)
+                check_cancelled()
+        return os.getpid(), sum(loaded["weights"])
+
+    pool = InferenceProcessPool(handler, num_processes=2)
+    pool.start()
+    try:
+        pid, total = pool.call("go")
+        assert pid != os.getpid()
+        assert total == 3.0
+
+        try:
+            pool.call("fail")
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            assert "bad request" in str(e)
+
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel).start()
+        started = time.perf_counter()
+        try:
+            pool.call("slow", [token])
+            assert False, "expected GenerationCancelled"
+        except GenerationCancelled:
+            pass
+        assert time.perf_counter() - started < 1.5
+
+        stats = pool.get_stats()
+        assert stats["alive"] == 2, stats
+        assert stats["calls"] == 3 and stats["errors"] == 1 and stats["cancelled"] == 1, stats
+    finally:
+        pool.stop()
+    assert not pool.available
+    print("✓ Worker processes PASSED")
+
+
+def test_workers_reseed_after_fork():
+    """Unseeded calls on different workers draw different random numbers."""
+    if not InferenceProcessPool.is_supported():
+        print("- fork() not available, skipped")
+        return
+
+    import numpy as np
+    import torch
+
+    # Same parent state for every worker, as after loading a model
+    np.random.seed(0)
+    torch.manual_seed(0)
+
+    def handler(request):
+        return os.getpid(), float(np.random.random()), float(torch.rand(1))
+
+    pool = InferenceProcessPool(handler, num_processes=2)
+    pool.start()
+    try:
+        # Idle workers are taken in turn, so two calls land on both
+        first, second = pool.call("go"), pool.call("go")
+    finally:
+        pool.stop()
+    assert first[0] != second[0]
+    assert first[1] != second[1] and first[2] != second[2], (first, second)
+    print("✓ Worker reseeding PASSED")
+
+
+if __name__ == "__main__":
+    test_split_cores()
+    test_workers_share_parent_state()
+    test_workers_reseed_after_fork()
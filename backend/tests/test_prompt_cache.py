@@ -0,0 +1,165 @@
+"""
+Unit tests for the in-memory voice prompt cache.
+
+Usage:
+    cd backend
+    python tests/test_prompt_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import torch
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils import cache as cache_module
+from backend.utils.cache import (
+    NamespacedPromptCache,
+    PromptMemoryCache,
+    estimate_prompt_bytes,
+    get_sample_cache_key,
+    prompt_namespace,
+)
+
+
+@dataclass
+class PromptItem:
+    """Stand-in for a model's voice clone prompt item."""
+    ref_code: torch.Tensor
+    ref_text: str
+
+
+def make_prompt(num_floats: int) -> list:
+    return [PromptItem(ref_code=torch.zeros(num_floats), ref_text="hi")]
+
+
+def test_estimate_counts_tensor_bytes():
+    """Tensors nested in dataclasses, lists and dicts are counted."""
+    size = estimate_prompt_bytes(make_prompt(1000))
+    assert 4000 <= size < 4200, size
+    shared = torch.zeros(500)
+    assert estimate_prompt_bytes({"a": shared, "b": shared}) < 2200  # Counted once
+    print("✓ Prompt size estimate PASSED")
+    return True
+
+
+def test_lru_budget_and_counters():
+    """Least recently used prompts are evicted to stay within the byte budget."""
+    cache = PromptMemoryCache(max_bytes=10_000)
+    cache.put("a", make_prompt(1000))
+    cache.put("b", make_prompt(1000))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", make_prompt(1000))
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b") is None
+
+    # Prompts larger than the whole budget are not kept
+    cache.put("huge", make_prompt(10_000))
+    assert "huge" not in cache
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 2, stats
+    assert stats["size_bytes"] <= stats["max_bytes"], stats
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["evictions"] == 1, stats
+    print("✓ LRU budget PASSED")
+    return True
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are dropped on lookup."""
+    cache = PromptMemoryCache(max_bytes=10_000, ttl_seconds=0.05)
+    cache.put("a", make_prompt(10))
+    assert cache.get("a") is not None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get_stats()["expirations"] == 1
+    print("✓ TTL expiry PASSED")
+    return True
+
+
+def test_namespaces_are_independent():
+    """Each backend/model namespace has its own budget and can be dropped alone."""
+    big = prompt_namespace("pytorch", "Qwen/Qwen3-TTS-12Hz-1.7B-Base")
+    small = prompt_namespace("pytorch", "Qwen/Qwen3-TTS-12Hz-0.6B-Base")
+    assert big == "pytorch/Qwen--Qwen3-TTS-12Hz-1.7B-Base"
+    assert big != small
+
+    cache = NamespacedPromptCache(max_bytes_per_namespace=10_000)
+    cache.put(big, "k", make_prompt(2000))
+    cache.put(small, "k", make_prompt(2000))
+    # Same key, different model: no cross-model hits and no shared budget
+    assert cache.get(big, "k") is not cache.get(small, "k")
+    assert cache.get(prompt_namespace("mlx", "x"), "k") is None
+
+    # Prefix drops reach every namespace
+    cache.put(small, "abc-1", make_prompt(100))
+    cache.put(big, "abc-2", make_prompt(100))
+    assert cache.discard_prefix("abc") == 2
+    assert cache.get(big, "abc-2") is None
+
+    assert cache.drop_namespace(small) == 1
+    assert cache.get(small, "k") is None
+    assert cache.get(big, "k") is not None
+
+    stats = cache.get_stats()
+    assert list(stats["namespaces"]) == [big, prompt_namespace("mlx", "x"), small], stats
+    assert stats["entries"] == 1, stats
+    print("✓ Prompt namespaces PASSED")
+    return True
+
+
+def test_sample_cache_key_uses_stat_signature():
+    """Stored keys are trusted while the file is unchanged; changed files are rehashed."""
+    hashed = []
+    original = cache_module.get_cache_key
+
+    def counting_get_cache_key(audio_path, reference_text):
+        hashed.append(audio_path)
+        return original(audio_path, reference_text)
+
+    cache_module.get_cache_key = counting_get_cache_key
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sample.wav")
+            with open(path, "wb") as f:
+                f.write(b"audio-one")
+
+            key, signature = get_sample_cache_key(path, "hello")
+            assert key == original(path, "hello")
+            assert len(hashed) == 1
+
+            # Known key with a matching signature, and the registry: no rehash
+            assert get_sample_cache_key(path, "hello", "stored", signature)[0] == "stored"
+            assert get_sample_cache_key(path, "hello")[0] == key
+            assert len(hashed) == 1
+
+            # Rewriting the file changes its signature and forces a rehash
+            time.sleep(0.01)
+            with open(path, "wb") as f:
+                f.write(b"audio-two!")
+            new_key, new_signature = get_sample_cache_key(path, "hello", "stored", signature)
+            assert new_signature != signature
+            assert new_key == original(path, "hello") != key
+            assert len(hashed) == 2
+    finally:
+        cache_module.get_cache_key = original
+
+    print("✓ Sample cache key PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_estimate_counts_tensor_bytes(),
+        test_lru_budget_and_counters(),
+        test_ttl_expiry(),
+        test_namespaces_are_independent(),
+        test_sample_cache_key_uses_stat_signature(),
+    ]
+    exit(0 if all(results) else 1)
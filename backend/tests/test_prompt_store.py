@@ -0,0 +1,101 @@
+"""
+Unit tests for the safetensors voice prompt format.
+
+Usage:
+    cd backend
+    python tests/test_prompt_store.py
+"""
+
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils import prompt_store
+from backend.utils.prompt_store import PromptFormatError, load_prompt, read_header, save_prompt
+
+
+@dataclass
+class PromptItem:
+    """Stand-in for a model's voice clone prompt item."""
+    ref_code: Optional[torch.Tensor]
+    ref_spk_embedding: torch.Tensor
+    icl_mode: bool
+    ref_text: Optional[str]
+
+
+def test_round_trip():
+    """Nested dataclasses, tensors, arrays and scalars survive a round trip."""
+    prompt_store.ALLOWED_DATACLASS_PACKAGES.add(PromptItem.__module__.split(".")[0])
+    embedding = torch.randn(8)
+    prompt = [
+        PromptItem(torch.arange(6).reshape(2, 3), embedding, True, "hello"),
+        PromptItem(None, embedding, False, None),
+        {"ref_audio": "/a.wav", "mel": np.ones((2, 2), dtype=np.float32), "pair": (1, 2.5)},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "p.prompt.safetensors"
+        save_prompt(path, prompt, model_id="Qwen/Qwen3-TTS-12Hz-1.7B-Base")
+
+        header = read_header(path)
+        assert header["schema"] == prompt_store.SCHEMA_VERSION
+        assert header["model"] == "Qwen/Qwen3-TTS-12Hz-1.7B-Base"
+
+        loaded, valid = load_prompt(path, "Qwen/Qwen3-TTS-12Hz-1.7B-Base")
+        assert valid
+        assert isinstance(loaded[0], PromptItem)
+        assert torch.equal(loaded[0].ref_code, prompt[0].ref_code)
+        assert torch.equal(loaded[1].ref_spk_embedding, embedding)
+        assert loaded[1].ref_code is None and loaded[0].icl_mode is True
+        assert loaded[2]["ref_audio"] == "/a.wav"
+        assert np.array_equal(loaded[2]["mel"], prompt[2]["mel"])
+        assert loaded[2]["pair"] == (1, 2.5)
+
+        # Another model's prompt is rejected from the header alone
+        assert load_prompt(path, "Qwen/Qwen3-TTS-12Hz-0.6B-Base") == (None, False)
+
+    print("✓ Prompt round trip PASSED")
+
+
+def test_rejects_unsafe_or_unknown_content():
+    """Unsupported values cannot be saved and unlisted classes are not rebuilt."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "p.prompt.safetensors"
+        try:
+            save_prompt(path, {"fn": print})
+            assert False, "expected PromptFormatError"
+        except PromptFormatError:
+            pass
+
+        save_prompt(path, [PromptItem(None, torch.zeros(1), False, None)])
+        allowed = set(prompt_store.ALLOWED_DATACLASS_PACKAGES)
+        prompt_store.ALLOWED_DATACLASS_PACKAGES.clear()
+        try:
+            load_prompt(path)
+            assert False, "expected PromptFormatError"
+        except PromptFormatError:
+            pass
+        finally:
+            prompt_store.ALLOWED_DATACLASS_PACKAGES.update(allowed)
+
+        path.write_bytes(b"not a safetensors file")
+        try:
+            load_prompt(path)
+            assert False, "expected PromptFormatError"
+        except PromptFormatError:
+            pass
+
+    print("✓ Unsafe content rejected PASSED")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_rejects_unsafe_or_unknown_content()
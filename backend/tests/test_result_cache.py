@@ -0,0 +1,88 @@
+"""
+Unit tests for the content-addressed generation result cache.
+
+Usage:
+    cd backend
+    python tests/test_result_cache.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.result_cache import ResultCache, make_result_key
+
+
+def _write(path: Path, size: int) -> str:
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+
+def test_keys():
+    """Only seeded requests get a key, and whitespace differences are ignored."""
+    assert make_result_key("fp", "Hello", "en", None, None, "1.7B") is None
+    a = make_result_key("fp", "Hello  world ", "en", 1, None, "1.7B")
+    b = make_result_key("fp", "Hello world", "en", 1, None, "1.7B")
+    c = make_result_key("fp", "Hello world", "en", 2, None, "1.7B")
+    assert a == b
+    assert a != c
+    print("✓ Result keys PASSED")
+    return True
+
+
+def test_lru_eviction_and_persistence():
+    """Least recently used entries are evicted and the index survives restarts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cache = ResultCache(tmp / "results", max_bytes=250)
+
+        cache.put("a", _write(tmp / "a.wav", 100), 1.0, "gen-a")
+        cache.put("b", _write(tmp / "b.wav", 100), 1.0, "gen-b")
+        assert cache.get("a") is not None  # a is now most recently used
+        cache.put("c", _write(tmp / "c.wav", 100), 1.0, "gen-c")
+
+        assert cache.get("b") is None
+        assert cache.get("a")["generation_id"] == "gen-a"
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2 and stats["misses"] == 1
+
+        # Cached audio outlives the original file
+        (tmp / "c.wav").unlink()
+        reopened = ResultCache(tmp / "results", max_bytes=250)
+        assert Path(reopened.get("c")["path"]).exists()
+    print("✓ LRU eviction PASSED")
+    return True
+
+
+def test_hits_persist_on_flush():
+    """Hits update recency in memory; flush writes it out in one go."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        cache = ResultCache(tmp / "results", max_bytes=1000)
+        cache.put("a", _write(tmp / "a.wav", 100), 1.0)
+        cache.put("b", _write(tmp / "b.wav", 100), 1.0)
+        index = tmp / "results" / "index.json"
+        saved = index.read_bytes()
+
+        cache.get("a")
+        assert index.read_bytes() == saved  # No rewrite per hit
+
+        cache.flush()
+        reopened = ResultCache(tmp / "results", max_bytes=1000)
+        assert list(reopened._entries) == ["b", "a"]
+    print("✓ Batched index writes PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_keys(),
+        test_lru_eviction_and_persistence(),
+        test_hits_persist_on_flush(),
+    ]
+    exit(0 if all(results) else 1)
@@ -0,0 +1,168 @@
+"""
+Unit tests for single-flight coalescing.
+
+Usage:
+    cd backend
+    python tests/test_single_flight.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.single_flight import SingleFlight
+
+
+def test_duplicates_share_one_call():
+    """Concurrent calls with the same key run the work once."""
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0.05)
+            return key.upper()
+
+        results = await asyncio.gather(
+            *[flights.do("a", lambda: work("a")) for _ in range(5)],
+            flights.do("b", lambda: work("b")),
+        )
+        assert results == ["A"] * 5 + ["B"], results
+        assert sorted(calls) == ["a", "b"], calls
+
+        stats = flights.get_stats()
+        assert stats == {"in_flight": 0, "leaders": 2, "coalesced": 4}, stats
+
+        # Finished flights are forgotten
+        await flights.do("a", lambda: work("a"))
+        assert calls.count("a") == 2
+
+    asyncio.run(scenario())
+    print("✓ Duplicate coalescing PASSED")
+    return True
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    """The shared call survives until its last waiter is cancelled."""
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "done"
+
+        lone = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        await asyncio.sleep(0.01)
+        assert flights.get_stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+    print("✓ Waiter cancellation PASSED")
+    return True
+
+
+def test_leader_cancelled_while_follower_waits():
+    """A shared render uses its own session, so a cancelled leader's is never reused."""
+    import numpy as np
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from backend import database, generation
+    from backend.database import Base, VoiceProfile
+    from backend.models import GenerationRequest
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    make_session = sessionmaker(bind=engine)
+    setup_db = make_session()
+    setup_db.add(VoiceProfile(id="p", name="p"))
+    setup_db.commit()
+    setup_db.close()
+
+    render_sessions = []
+
+    async def fake_synthesize(data, db):
+        render_sessions.append(db)
+        await asyncio.sleep(0.05)
+        assert db.query(VoiceProfile).count() == 1
+        return np.zeros(2400, dtype=np.float32), 24000
+
+    async def fake_cache_key(data, db):
+        return "key"
+
+    class NoResultCache:
+        def get(self, key):
+            return None
+
+        def put(self, *args):
+            pass
+
+    patches = {
+        "synthesize": fake_synthesize,
+        "_result_cache_key": fake_cache_key,
+        "get_result_cache": lambda: NoResultCache(),
+        "save_audio": lambda *args: None,
+        "write_peaks_for_audio": lambda *args: None,
+    }
+    originals = {name: getattr(generation, name) for name in patches}
+    original_session = database.SessionLocal
+
+    async def scenario():
+        request = GenerationRequest(profile_id="p", text="Hello.")
+        leader_db, follower_db = make_session(), make_session()
+
+        async def leader():
+            try:
+                return await generation.generate_speech(request, leader_db)
+            finally:
+                leader_db.close()  # As get_db does when the request ends
+
+        leader_task = asyncio.ensure_future(leader())
+        await asyncio.sleep(0.01)
+        follower_task = asyncio.ensure_future(generation.generate_speech(request, follower_db))
+        await asyncio.sleep(0.01)
+        leader_task.cancel()
+
+        result = await follower_task
+        assert result.profile_id == "p"
+        assert leader_task.cancelled()
+        assert len(render_sessions) == 1
+        assert render_sessions[0] is not leader_db and render_sessions[0] is not follower_db
+        follower_db.close()
+
+    try:
+        for name, value in patches.items():
+            setattr(generation, name, value)
+        database.SessionLocal = make_session
+        asyncio.run(scenario())
+    finally:
+        for name, value in originals.items():
+            setattr(generation, name, value)
+        database.SessionLocal = original_session
+    print("✓ Cancelled leader PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_duplicates_share_one_call(),
+        test_cancelled_waiter_does_not_cancel_others(),
+        test_leader_cancelled_while_follower_waits(),
+    ]
+    exit(0 if all(results) else 1)
@@ -0,0 +1,271 @@
+"""
+Unit tests for the generation job scheduler in TaskManager.
+
+Usage:
+    cd backend
+    python tests/test_tasks.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.tasks import TaskManager, QueueFullError, JOB_KIND_PRECOMPUTE, MAX_QUEUED_BACKGROUND_JOBS
+
+
+def test_priority_order():
+    """Higher-priority jobs run first; equal priorities run FIFO."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=10)
+        order = []
+
+        def make_run(name):
+            async def run():
+                order.append(name)
+                return name
+            return run
+
+        # Queue everything before starting workers so ordering is deterministic
+        await tm.submit_job("low", "p", "low", make_run("low"), priority=-1)
+        await tm.submit_job("a", "p", "a", make_run("a"))
+        await tm.submit_job("b", "p", "b", make_run("b"))
+        await tm.submit_job("high", "p", "high", make_run("high"), priority=5)
+
+        assert tm.get_queue_position("high") == 0
+        assert tm.get_queue_position("low") == 3
+
+        tm.start_workers(1)
+        while tm.get_queue_depth() or tm.get_running_job_count():
+            await asyncio.sleep(0.01)
+        await tm.stop_workers()
+
+        assert order == ["high", "a", "b", "low"], order
+        assert tm.get_job("a").status == "complete"
+        assert tm.get_job("a").result == "a"
+
+    asyncio.run(scenario())
+    print("✓ Priority ordering PASSED")
+    return True
+
+
+def test_bounded_queue_and_errors():
+    """Full queues reject new jobs and failing jobs record their error."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=1)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        await tm.submit_job("first", "p", "first", fail)
+        try:
+            await tm.submit_job("second", "p", "second", fail)
+            raise AssertionError("Expected QueueFullError")
+        except QueueFullError:
+            pass
+
+        tm.start_workers(1)
+        while tm.get_job("first").status not in ("complete", "error"):
+            await asyncio.sleep(0.01)
+        await tm.stop_workers()
+
+        job = tm.get_job("first")
+        assert job.status == "error"
+        assert job.error == "boom"
+        assert not tm.get_active_generations()
+
+    asyncio.run(scenario())
+    print("✓ Bounded queue PASSED")
+    return True
+
+
+def test_worker_pool_concurrency():
+    """N workers run up to N jobs at once."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=10)
+        running = 0
+        peak = 0
+
+        async def run():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        for i in range(6):
+            await tm.submit_job(f"job-{i}", "p", "text", run)
+
+        tm.start_workers(3)
+        while tm.get_queue_depth() or tm.get_running_job_count():
+            await asyncio.sleep(0.01)
+        await tm.stop_workers()
+
+        assert peak == 3, peak
+
+    asyncio.run(scenario())
+    print("✓ Worker pool concurrency PASSED")
+    return True
+
+
+def test_cancel_jobs():
+    """Queued jobs are skipped and running jobs stop without killing the worker."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=10)
+        ran = []
+
+        async def slow():
+            ran.append("slow")
+            await asyncio.sleep(10)
+
+        async def quick():
+            ran.append("quick")
+            return "ok"
+
+        await tm.submit_job("running", "p", "running", slow)
+        await tm.submit_job("queued", "p", "queued", quick)
+        await tm.submit_job("after", "p", "after", quick)
+
+        assert tm.cancel_generation("queued")
+        assert tm.get_queue_depth() == 2
+
+        tm.start_workers(1)
+        while tm.get_job("running").status != "running":
+            await asyncio.sleep(0.01)
+        assert tm.cancel_generation("running")
+
+        while tm.get_job("after").status != "complete":
+            await asyncio.sleep(0.01)
+        await tm.stop_workers()
+
+        assert tm.get_job("running").status == "cancelled"
+        assert tm.get_job("queued").status == "cancelled"
+        assert ran == ["slow", "quick"], ran
+        assert not tm.cancel_generation("missing")
+
+    asyncio.run(scenario())
+    print("✓ Job cancellation PASSED")
+    return True
+
+
+def test_model_affinity():
+    """Queued jobs for the last model run before switching, within the skip bound."""
+    async def scenario():
+        def make_run(name, order):
+            async def run():
+                order.append(name)
+            return run
+
+        async def drain(tm):
+            tm.start_workers(1)
+            while tm.get_queue_depth() or tm.get_running_job_count():
+                await asyncio.sleep(0.01)
+            await tm.stop_workers()
+
+        order = []
+        tm = TaskManager(max_queue_size=10)
+        sizes = ["1.7B", "0.6B", "1.7B", "0.6B", "1.7B", "0.6B"]
+        for i, size in enumerate(sizes):
+            await tm.submit_job(f"{size}-{i}", "p", "t", make_run(f"{size}-{i}", order), model_size=size)
+        await drain(tm)
+        assert order == ["1.7B-0", "1.7B-2", "1.7B-4", "0.6B-1", "0.6B-3", "0.6B-5"], order
+        stats = tm.get_scheduler_stats()
+        assert stats["model_switches"] == 1, stats
+        assert stats["switches_avoided"] == 2, stats
+
+        # A job is passed over at most affinity_max_skips times
+        order = []
+        tm = TaskManager(max_queue_size=10, affinity_max_skips=1)
+        for i, size in enumerate(["1.7B", "0.6B", "1.7B", "1.7B"]):
+            await tm.submit_job(str(i), "p", "t", make_run(str(i), order), model_size=size)
+        await drain(tm)
+        assert order == ["0", "2", "1", "3"], order
+
+        # Affinity never overrides priority
+        order = []
+        tm = TaskManager(max_queue_size=10)
+        await tm.submit_job("a", "p", "t", make_run("a", order), model_size="1.7B")
+        await tm.submit_job("b", "p", "t", make_run("b", order), priority=1, model_size="0.6B")
+        await tm.submit_job("c", "p", "t", make_run("c", order), model_size="1.7B")
+        await drain(tm)
+        assert order == ["b", "a", "c"], order
+
+    asyncio.run(scenario())
+    print("✓ Model affinity PASSED")
+    return True
+
+
+def test_background_jobs():
+    """Background jobs are listed by kind and not reported as generations."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=10)
+        release = asyncio.Event()
+        seen_generations = []
+
+        async def run():
+            seen_generations.append([task.task_id for task in tm.get_active_generations()])
+            await release.wait()
+
+        await tm.submit_job("warm", "p", "t", run, priority=-100, kind=JOB_KIND_PRECOMPUTE)
+        await tm.submit_job("gen", "p", "t", run)
+        assert [job.job_id for job in tm.get_active_jobs(JOB_KIND_PRECOMPUTE)] == ["warm"]
+        assert len(tm.get_active_jobs()) == 2
+
+        tm.start_workers(1)
+        await asyncio.sleep(0.05)
+        release.set()
+        while tm.get_queue_depth() or tm.get_running_job_count():
+            await asyncio.sleep(0.01)
+        await tm.stop_workers()
+
+        # The user job ran first; the background job never showed as a generation
+        assert seen_generations == [["gen"], []], seen_generations
+        assert tm.get_active_jobs() == []
+        assert tm.get_job("warm").status == "complete"
+
+    asyncio.run(scenario())
+    print("✓ Background jobs PASSED")
+    return True
+
+
+def test_background_jobs_do_not_fill_queue():
+    """Background jobs never reject user jobs and replace the oldest beyond their cap."""
+    async def scenario():
+        tm = TaskManager(max_queue_size=1)
+
+        async def run():
+            return None
+
+        for i in range(MAX_QUEUED_BACKGROUND_JOBS + 2):
+            await tm.submit_job(f"warm{i}", f"p{i}", "t", run, priority=-100, kind=JOB_KIND_PRECOMPUTE)
+        background = tm.get_active_jobs(JOB_KIND_PRECOMPUTE)
+        assert len(background) == MAX_QUEUED_BACKGROUND_JOBS
+        assert background[0].job_id == "warm2"
+        assert tm.get_job("warm0").status == "cancelled"
+
+        # The user bound only counts user jobs
+        await tm.submit_job("gen", "p", "t", run)
+        try:
+            await tm.submit_job("gen2", "p", "t", run)
+            raise AssertionError("Expected QueueFullError")
+        except QueueFullError:
+            pass
+
+    asyncio.run(scenario())
+    print("✓ Background queue cap PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_priority_order(),
+        test_bounded_queue_and_errors(),
+        test_worker_pool_concurrency(),
+        test_cancel_jobs(),
+        test_model_affinity(),
+        test_background_jobs(),
+        test_background_jobs_do_not_fill_queue(),
+    ]
+    exit(0 if all(results) else 1)
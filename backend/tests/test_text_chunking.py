@@ -0,0 +1,61 @@
+"""
+Unit tests for long-form text chunking and chunk joining.
+
+Usage:
+    cd backend
+    python tests/test_text_chunking.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.utils.text_chunking import split_sentences, split_text_into_chunks
+from backend.utils.audio import join_audio_chunks
+
+
+def test_sentence_rules():
+    """Abbreviations, decimals and non-Latin sentence enders are respected."""
+    assert split_sentences("Mr. Smith paid 3.50 today. Then he left!", "en") == [
+        "Mr. Smith paid 3.50 today.",
+        "Then he left!",
+    ]
+    assert split_sentences("你好。今天天气很好！走吧", "zh") == ["你好。", "今天天气很好！", "走吧"]
+    assert split_sentences("यह पहला है। यह दूसरा है।", "hi") == ["यह पहला है।", "यह दूसरा है।"]
+    print("✓ Sentence rules PASSED")
+
+
+def test_chunk_limits():
+    """Chunks stay under the limit and keep all of the text."""
+    text = " ".join(f"Sentence {i} has a clause, then another clause." for i in range(20))
+    chunks = split_text_into_chunks(text, "en", max_chars=80)
+    assert all(len(chunk) <= 80 for chunk in chunks), chunks
+    assert " ".join(chunks).split() == text.split()
+
+    chunks = split_text_into_chunks("一二三四五六七八九十" * 3, "zh", max_chars=8)
+    assert all(len(chunk) <= 8 for chunk in chunks), chunks
+    assert "".join(chunks) == "一二三四五六七八九十" * 3
+    print("✓ Chunk limits PASSED")
+
+
+def test_join_audio_chunks():
+    """Silence is inserted between chunks, or chunks overlap when it is zero."""
+    chunk = np.ones(1000, dtype=np.float32)
+    joined = join_audio_chunks([chunk, chunk], 1000, silence_ms=100, crossfade_ms=10)
+    assert len(joined) == 2100
+    assert np.all(joined[1000:1100] == 0)
+
+    joined = join_audio_chunks([chunk, chunk], 1000, silence_ms=0, crossfade_ms=10)
+    assert len(joined) == 1990
+    assert np.allclose(joined, 1.0)
+    print("✓ Join audio chunks PASSED")
+
+
+if __name__ == "__main__":
+    test_sentence_rules()
+    test_chunk_limits()
+    test_join_audio_chunks()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the startup cache warm-up.
+
+Usage:
+    cd backend
+    python tests/test_warmup.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Allow running as a script from the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.database import Base, Generation, ProfileSample, VoiceProfile
+from backend.warmup import CacheWarmer, WARMUP_DISABLED, get_hot_profile_ids
+
+
+def test_hot_profiles_ranked_by_generations():
+    """Profiles are ranked by generation count; profiles without samples are skipped."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        for name, generations, has_sample in [("a", 1, True), ("b", 3, True), ("c", 2, True), ("d", 5, False)]:
+            db.add(VoiceProfile(id=name, name=name))
+            if has_sample:
+                db.add(ProfileSample(profile_id=name, audio_path=f"{name}.wav", reference_text=name))
+            for i in range(generations):
+                db.add(Generation(profile_id=name, text=str(i), audio_path=f"{name}{i}.wav", duration=1.0))
+        db.add(VoiceProfile(id="unused", name="unused"))
+        db.commit()
+
+        assert get_hot_profile_ids(db, 2) == ["b", "c"]
+        assert get_hot_profile_ids(db, 10) == ["b", "c", "a"]
+    finally:
+        db.close()
+    print("✓ Hot profile ranking PASSED")
+    return True
+
+
+def test_disabled_warmup_is_ready():
+    """With no profiles to warm, nothing runs and health reports ready."""
+    async def scenario():
+        warmer = CacheWarmer()
+        warmer.start(0, model_size="1.7B", budget_seconds=60)
+        assert warmer.ready
+        assert warmer.get_status()["status"] == WARMUP_DISABLED
+        await warmer.stop()
+
+    asyncio.run(scenario())
+    print("✓ Disabled warm-up PASSED")
+    return True
+
+
+if __name__ == "__main__":
+    results = [
+        test_hot_profiles_ranked_by_generations(),
+        test_disabled_warmup_is_ready(),
+    ]
+    exit(0 if all(results) else 1)
@@ -5,6 +5,7 @@ TTS inference module - delegates to backend abstraction layer.
 from typing import Optional
 import numpy as np
 import io
+import struct
 import soundfile as sf
 
 from .backends import get_tts_backend, TTSBackend
@@ -20,10 +21,10 @@ def get_tts_model() -> TTSBackend:
     return get_tts_backend()
 
 
-def unload_tts_model():
-    """Unload TTS model to free memory."""
+def unload_tts_model(model_size: Optional[str] = None):
+    """Unload one TTS model size, or all of them, to free memory."""
     backend = get_tts_backend()
-    backend.unload_model()
+    backend.unload_model(model_size)
 
 
 def audio_to_wav_bytes(audio: np.ndarray, sample_rate: int) -> bytes:
@@ -32,3 +33,27 @@ def audio_to_wav_bytes(audio: np.ndarray, sample_rate: int) -> bytes:
     sf.write(buffer, audio, sample_rate, format="WAV")
     buffer.seek(0)
     return buffer.read()
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1) -> bytes:
+    """
+    Build a 16-bit PCM WAV header for a stream of unknown length.
+
+    The RIFF and data sizes are set to 0xFFFFFFFF, which players treat as
+    "read until end of stream".
+    """
+    bits_per_sample = 16
+    block_align = channels * bits_per_sample // 8
+    byte_rate = sample_rate * block_align
+    unknown_size = 0xFFFFFFFF
+    return (
+        b"RIFF" + struct.pack("<I", unknown_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", unknown_size)
+    )
+
+
+def audio_to_pcm16_bytes(audio: np.ndarray) -> bytes:
+    """Convert a float audio array to little-endian 16-bit PCM bytes."""
+    audio = np.clip(np.asarray(audio, dtype=np.float32).reshape(-1), -1.0, 1.0)
+    return (audio * 32767.0).astype("<i2").tobytes()
@@ -0,0 +1,211 @@
+"""
+Admission control for inference endpoints.
+
+Each endpoint class (generate, stream, transcribe) gets a concurrency limit
+and a bounded FIFO wait queue. Requests beyond the queue are rejected at once
+so clients can back off instead of piling onto the inference threads.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import math
+import time
+
+from .. import config
+from .metrics import LatencyTracker
+
+
+# Endpoint classes with their own limits
+ENDPOINT_CLASSES = ("generate", "stream", "transcribe")
+
+# Retry-After bounds (seconds)
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 120
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+async def _acquire_within(semaphore: asyncio.Semaphore, timeout: float) -> bool:
+    """
+    Acquire a semaphore unless timeout seconds pass first.
+
+    Before Python 3.12, asyncio.wait_for could time out just after the
+    acquire succeeded, losing that permit for good. asyncio.timeout (3.11+)
+    cancels the acquire itself, which hands a permit it was granted back.
+    Older versions run the acquire in a task and release a permit it won
+    after the deadline.
+
+    Returns:
+        True if acquired, False on timeout
+    """
+    if hasattr(asyncio, "timeout"):
+        try:
+            async with asyncio.timeout(timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            return False
+        return True
+
+    task = asyncio.ensure_future(semaphore.acquire())
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except asyncio.CancelledError:
+        task.cancel()
+        task.add_done_callback(
+            lambda t: semaphore.release() if not t.cancelled() else None
+        )
+        raise
+    if task in done:
+        return True
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        return False
+    # Granted after the deadline but before the cancel landed
+    semaphore.release()
+    return False
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded wait queue for one endpoint class."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        """
+        Args:
+            name: Endpoint class name (for messages and stats)
+            max_concurrent: Requests allowed to run at once
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Seconds a request may wait before it is rejected
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_ms = LatencyTracker()
+        self._service_ewma_s: Optional[float] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore, creating it inside the running loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def _retry_after(self) -> int:
+        """Estimate when a slot is likely to be free, from recent service times."""
+        service_s = self._service_ewma_s or 1.0
+        estimate = service_s * (self._waiting + 1) / self.max_concurrent
+        return int(min(_MAX_RETRY_AFTER, max(_MIN_RETRY_AFTER, math.ceil(estimate))))
+
+    async def acquire(self) -> Callable[[], None]:
+        """
+        Wait for a slot.
+
+        Returns:
+            Idempotent release function; call it when the request is done
+
+        Raises:
+            AdmissionRejected: 429 if the wait queue is full, 503 if no slot
+                freed up within the queue timeout
+        """
+        semaphore = self._get_semaphore()
+
+        if semaphore.locked():
+            if self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise AdmissionRejected(
+                    f"Too many {self.name} requests in progress, try again later",
+                    status_code=429,
+                    retry_after=self._retry_after(),
+                )
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            acquired = await _acquire_within(semaphore, self.queue_timeout)
+        finally:
+            self._waiting -= 1
+        if not acquired:
+            self._timed_out += 1
+            raise AdmissionRejected(
+                f"Timed out waiting for a {self.name} slot, try again later",
+                status_code=503,
+                retry_after=self._retry_after(),
+            )
+
+        started_at = time.perf_counter()
+        self._wait_ms.record((started_at - queued_at) * 1000)
+        self._active += 1
+        self._admitted += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self._active -= 1
+            service_s = time.perf_counter() - started_at
+            if self._service_ewma_s is None:
+                self._service_ewma_s = service_s
+            else:
+                self._service_ewma_s = 0.8 * self._service_ewma_s + 0.2 * service_s
+            semaphore.release()
+
+        return release
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get live queue depth, limits, counters and wait times."""
+        return {
+            "name": self.name,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "wait_ms": self._wait_ms.summary(),
+        }
+
+
+# Global controllers, one per endpoint class
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(endpoint_class: str) -> AdmissionController:
+    """Get or create the admission controller for an endpoint class."""
+    controller = _controllers.get(endpoint_class)
+    if controller is None:
+        controller = AdmissionController(
+            endpoint_class,
+            max_concurrent=config.get_admission_concurrency(endpoint_class),
+            max_queue=config.get_admission_queue_size(),
+            queue_timeout=config.get_admission_queue_timeout(),
+        )
+        _controllers[endpoint_class] = controller
+    return controller
+
+
+def get_admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every endpoint class."""
+    return {name: get_admission_controller(name).get_stats() for name in ENDPOINT_CLASSES}
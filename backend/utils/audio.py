@@ -1,11 +1,45 @@
 """
 Audio processing utilities.
+
+Reads go through soundfile: the header is read first, and a file that is
+already at the requested rate is decoded straight into float32 with no
+resampling. Only the requested frame range is decoded. librosa is imported
+only for formats soundfile cannot read.
 """
 
+import io
+from pathlib import Path
+
 import numpy as np
 import soundfile as sf
-import librosa
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+
+from .. import config
+
+
+# soxr quality presets, by EBURON_ECHO_RESAMPLER name
+_SOXR_QUALITIES = {
+    "soxr_vhq": "VHQ",
+    "soxr_hq": "HQ",
+    "soxr_mq": "MQ",
+    "soxr_lq": "LQ",
+    "soxr_qq": "QQ",
+}
+
+# Storage and transfer formats. PCM_16 is what plain WAV writes, so FLAC holds
+# the same samples losslessly; Opus is lossy and meant for archive tiers.
+AUDIO_FORMATS = {
+    "wav": {"container": "WAV", "subtype": "PCM_16", "suffix": ".wav", "media_type": "audio/wav"},
+    "flac": {"container": "FLAC", "subtype": "PCM_16", "suffix": ".flac", "media_type": "audio/flac"},
+    "opus": {"container": "OGG", "subtype": "OPUS", "suffix": ".ogg", "media_type": "audio/ogg"},
+}
+_MEDIA_TYPE_ALIASES = {
+    "wav": ("audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"),
+    "flac": ("audio/flac", "audio/x-flac"),
+    "opus": ("audio/ogg", "audio/opus", "application/ogg"),
+}
+_OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+_FORMATS_BY_SUFFIX = {fmt["suffix"]: name for name, fmt in AUDIO_FORMATS.items()}
 
 
 def normalize_audio(
@@ -44,24 +78,217 @@ def normalize_audio(
     return audio
 
 
+def get_audio_info(path: str) -> Tuple[int, int, int]:
+    """
+    Read an audio file's header without decoding it.
+    
+    Args:
+        path: Path to audio file
+        
+    Returns:
+        Tuple of (sample_rate, channels, frames)
+        
+    Raises:
+        RuntimeError: If soundfile cannot read the format
+    """
+    info = sf.info(path)
+    return info.samplerate, info.channels, info.frames
+
+
+def resample_audio(
+    audio: np.ndarray,
+    orig_sr: int,
+    target_sr: int,
+    resampler: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Resample audio along its last axis.
+    
+    Args:
+        audio: Audio array (samples, or channels x samples)
+        orig_sr: Current sample rate
+        target_sr: Desired sample rate
+        resampler: soxr_vhq/hq/mq/lq/qq, polyphase, or any librosa res_type;
+            defaults to EBURON_ECHO_RESAMPLER
+        
+    Returns:
+        Resampled float32 audio
+    """
+    if orig_sr == target_sr:
+        return audio
+    resampler = resampler or config.get_resampler()
+    quality = _SOXR_QUALITIES.get(resampler)
+    resampled = None
+    if quality is not None:
+        try:
+            import soxr
+            # soxr works on (samples, channels)
+            resampled = soxr.resample(audio.T, orig_sr, target_sr, quality=quality).T
+        except ImportError:
+            pass
+    if resampled is None and resampler == "polyphase":
+        from math import gcd
+        from scipy.signal import resample_poly
+        factor = gcd(orig_sr, target_sr)
+        resampled = resample_poly(audio, target_sr // factor, orig_sr // factor, axis=-1)
+    if resampled is None:
+        import librosa
+        resampled = librosa.resample(audio, orig_sr=orig_sr, target_sr=target_sr, res_type=resampler)
+    
+    # Same output length as librosa, so both read paths agree
+    length = int(np.ceil(audio.shape[-1] * (float(target_sr) / orig_sr)))
+    if resampled.shape[-1] > length:
+        resampled = resampled[..., :length]
+    elif resampled.shape[-1] < length:
+        pad = [(0, 0)] * (resampled.ndim - 1) + [(0, length - resampled.shape[-1])]
+        resampled = np.pad(resampled, pad)
+    return np.ascontiguousarray(resampled, dtype=np.float32)
+
+
 def load_audio(
     path: str,
-    sample_rate: int = 24000,
+    sample_rate: Optional[int] = 24000,
     mono: bool = True,
+    offset: float = 0.0,
+    duration: Optional[float] = None,
 ) -> Tuple[np.ndarray, int]:
     """
-    Load audio file with normalization.
+    Load audio file as float32.
     
     Args:
         path: Path to audio file
-        sample_rate: Target sample rate
+        sample_rate: Target sample rate (None keeps the file's rate)
         mono: Convert to mono
+        offset: Start reading this many seconds into the file
+        duration: Read at most this many seconds (None reads to the end)
+        
+    Returns:
+        Tuple of (audio_array, sample_rate); multichannel audio loaded with
+        mono=False is shaped (channels, samples)
+    """
+    try:
+        native_sr, _, total_frames = get_audio_info(path)
+    except RuntimeError:
+        # Not a format soundfile can read (e.g. some compressed uploads)
+        import librosa
+        return librosa.load(path, sr=sample_rate, mono=mono, offset=offset, duration=duration)
+    
+    start = min(total_frames, int(round(offset * native_sr)))
+    frames = total_frames - start
+    if duration is not None:
+        frames = min(frames, int(round(duration * native_sr)))
+    audio, _ = sf.read(path, start=start, frames=frames, dtype="float32", always_2d=True)
+    
+    # soundfile reads (samples, channels)
+    if mono or audio.shape[1] == 1:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    else:
+        audio = audio.T
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    
+    if sample_rate is None or sample_rate == native_sr:
+        return audio, native_sr
+    return resample_audio(audio, native_sr, sample_rate), sample_rate
+
+
+def get_audio_format(name: str) -> Dict[str, str]:
+    """
+    Get the container, subtype, suffix and media type of an audio format.
+    
+    Args:
+        name: Format name (wav, flac or opus)
+        
+    Returns:
+        Format description
+        
+    Raises:
+        ValueError: If the format is unknown
+    """
+    fmt = AUDIO_FORMATS.get(name.lower())
+    if fmt is None:
+        raise ValueError(f"Unknown audio format: {name} (use {', '.join(AUDIO_FORMATS)})")
+    return fmt
+
+
+def get_storage_suffix() -> str:
+    """Get the file suffix new generations and samples are stored with."""
+    return get_audio_format(config.get_audio_storage_format())["suffix"]
+
+
+def get_format_for_path(path: str) -> Optional[str]:
+    """Get the format name matching a file's suffix, if it is one of ours."""
+    return _FORMATS_BY_SUFFIX.get(Path(path).suffix.lower())
+
+
+def negotiate_audio_format(
+    stored_format: str,
+    accept: Optional[str] = None,
+    requested: Optional[str] = None,
+) -> str:
+    """
+    Choose the format to send a stored file in: as stored, or as WAV.
+    
+    An explicit request wins. Otherwise the file is sent as stored, because
+    transcoding costs a full decode and encode per request. The one exception
+    is an Accept header that excludes the stored type (q=0, or no matching
+    range) while still accepting WAV.
+    
+    Args:
+        stored_format: Format name of the stored file
+        accept: Accept header value
+        requested: Format name from the query string ("stored" keeps it)
         
     Returns:
-        Tuple of (audio_array, sample_rate)
+        Format name to respond with
+        
+    Raises:
+        ValueError: If the requested format is unknown
     """
-    audio, sr = librosa.load(path, sr=sample_rate, mono=mono)
-    return audio, sr
+    if requested:
+        if requested.lower() == "stored":
+            return stored_format
+        get_audio_format(requested)
+        return requested.lower()
+    if not accept:
+        return stored_format
+    
+    ranges = []
+    for part in accept.split(","):
+        media_range, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((media_range.lower(), q))
+    
+    def quality(name: str) -> float:
+        types = _MEDIA_TYPE_ALIASES[name]
+        # The most specific matching range decides
+        for matches in (
+            lambda r: r in types,
+            lambda r: r == "audio/*",
+            lambda r: r == "*/*",
+        ):
+            qs = [q for r, q in ranges if matches(r)]
+            if qs:
+                return max(qs)
+        return 0.0
+    
+    if quality(stored_format) == 0 and quality("wav") > 0:
+        return "wav"
+    return stored_format
+
+
+def _write_audio(target: Any, audio: np.ndarray, sample_rate: int, name: str) -> None:
+    """Write audio in one of AUDIO_FORMATS to a path or file object."""
+    fmt = AUDIO_FORMATS[name]
+    if name == "opus" and sample_rate not in _OPUS_SAMPLE_RATES:
+        audio = resample_audio(audio, sample_rate, 48000)
+        sample_rate = 48000
+    sf.write(target, audio, sample_rate, format=fmt["container"], subtype=fmt["subtype"])
 
 
 def save_audio(
@@ -72,12 +299,201 @@ def save_audio(
     """
     Save audio file.
     
+    The codec follows the path's suffix (.wav, .flac, or .ogg for Opus);
+    other suffixes are left to soundfile.
+    
     Args:
         audio: Audio array
         path: Output path
         sample_rate: Sample rate
     """
-    sf.write(path, audio, sample_rate)
+    name = get_format_for_path(path)
+    if name is None:
+        sf.write(path, audio, sample_rate)
+        return
+    _write_audio(path, audio, sample_rate, name)
+
+
+def encode_audio(
+    audio: np.ndarray,
+    sample_rate: int,
+    format: str = "wav",
+) -> bytes:
+    """
+    Encode audio to an in-memory file.
+    
+    Args:
+        audio: Audio array
+        sample_rate: Sample rate
+        format: Format name (wav, flac or opus)
+        
+    Returns:
+        Encoded file contents
+    """
+    get_audio_format(format)
+    buffer = io.BytesIO()
+    _write_audio(buffer, audio, sample_rate, format.lower())
+    return buffer.getvalue()
+
+
+def transcode_audio_file(path: str, format: str = "wav") -> bytes:
+    """
+    Re-encode a stored audio file at its own sample rate.
+    
+    Args:
+        path: Path to audio file
+        format: Target format name (wav, flac or opus)
+        
+    Returns:
+        Encoded file contents
+    """
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    return encode_audio(audio, sr, format)
+
+
+def fade_edges(
+    audio: np.ndarray,
+    sample_rate: int = 24000,
+    fade_ms: float = 15.0,
+    fade_in: bool = True,
+    fade_out: bool = True,
+) -> np.ndarray:
+    """
+    Apply short linear fades to the start and/or end of a clip.
+    
+    Args:
+        audio: Input audio array
+        sample_rate: Sample rate
+        fade_ms: Fade length in milliseconds
+        fade_in: Fade in at the start
+        fade_out: Fade out at the end
+        
+    Returns:
+        Faded copy of the audio (float32)
+    """
+    audio = np.array(audio, dtype=np.float32).reshape(-1)
+    n = min(int(sample_rate * max(0.0, fade_ms) / 1000), len(audio) // 2)
+    if n > 0:
+        ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+        if fade_in:
+            audio[:n] *= ramp
+        if fade_out:
+            audio[-n:] *= ramp[::-1]
+    return audio
+
+
+def join_audio_chunks(
+    chunks: List[np.ndarray],
+    sample_rate: int = 24000,
+    silence_ms: float = 120.0,
+    crossfade_ms: float = 15.0,
+) -> np.ndarray:
+    """
+    Join separately rendered audio chunks into a single waveform.
+    
+    Chunk edges are faded to avoid clicks. With silence_ms > 0 the faded
+    chunks are separated by that much silence; with silence_ms == 0 adjacent
+    chunks are overlap-added across the crossfade instead.
+    
+    Args:
+        chunks: Audio arrays in playback order
+        sample_rate: Sample rate shared by all chunks
+        silence_ms: Silence inserted between chunks
+        crossfade_ms: Fade length applied at chunk boundaries
+        
+    Returns:
+        Joined audio array (float32)
+    """
+    chunks = [np.asarray(chunk, dtype=np.float32).reshape(-1) for chunk in chunks if len(chunk)]
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    if len(chunks) == 1:
+        return chunks[0]
+    
+    fade = int(sample_rate * max(0.0, crossfade_ms) / 1000)
+    gap = int(sample_rate * max(0.0, silence_ms) / 1000)
+    
+    if gap > 0:
+        silence = np.zeros(gap, dtype=np.float32)
+        parts = []
+        for i, chunk in enumerate(chunks):
+            chunk = fade_edges(
+                chunk,
+                sample_rate,
+                crossfade_ms,
+                fade_in=i > 0,
+                fade_out=i < len(chunks) - 1,
+            )
+            if i > 0:
+                parts.append(silence)
+            parts.append(chunk)
+        return np.concatenate(parts)
+    
+    # No silence: overlap-add neighbouring chunks across the crossfade
+    result = chunks[0]
+    for chunk in chunks[1:]:
+        n = min(fade, len(result), len(chunk))
+        if n == 0:
+            result = np.concatenate([result, chunk])
+            continue
+        ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+        overlap = result[-n:] * ramp[::-1] + chunk[:n] * ramp
+        result = np.concatenate([result[:-n], overlap, chunk[n:]])
+    return result
+
+
+def analyze_audio(audio: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+    """
+    Measure a mono clip.
+    
+    Args:
+        audio: Audio array
+        sample_rate: Sample rate
+        
+    Returns:
+        Dict with duration (seconds), rms, peak (absolute) and num_samples
+    """
+    num_samples = len(audio)
+    if num_samples == 0:
+        return {"duration": 0.0, "rms": 0.0, "peak": 0.0, "num_samples": 0}
+    return {
+        "duration": num_samples / sample_rate,
+        "rms": float(np.sqrt(np.mean(np.square(audio, dtype=np.float64)))),
+        "peak": float(np.abs(audio).max()),
+        "num_samples": num_samples,
+    }
+
+
+def check_reference_audio(
+    stats: Dict[str, Any],
+    min_duration: float = 2.0,
+    max_duration: float = 30.0,
+    min_rms: float = 0.01,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Check measured reference audio (see analyze_audio) for voice cloning.
+    
+    Args:
+        stats: Measurements of the decoded audio
+        min_duration: Minimum duration in seconds
+        max_duration: Maximum duration in seconds
+        min_rms: Minimum RMS level
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if stats["duration"] < min_duration:
+        return False, f"Audio too short (minimum {min_duration} seconds)"
+    if stats["duration"] > max_duration:
+        return False, f"Audio too long (maximum {max_duration} seconds)"
+    
+    if stats["rms"] < min_rms:
+        return False, "Audio is too quiet or silent"
+    
+    if stats["peak"] > 0.99:
+        return False, "Audio is clipping (reduce input gain)"
+    
+    return True, None
 
 
 def validate_reference_audio(
@@ -89,6 +505,9 @@ def validate_reference_audio(
     """
     Validate reference audio for voice cloning.
     
+    Decodes the file; callers that already hold the decoded audio should use
+    analyze_audio and check_reference_audio instead.
+    
     Args:
         audio_path: Path to audio file
         min_duration: Minimum duration in seconds
@@ -100,20 +519,11 @@ def validate_reference_audio(
     """
     try:
         audio, sr = load_audio(audio_path)
-        duration = len(audio) / sr
-        
-        if duration < min_duration:
-            return False, f"Audio too short (minimum {min_duration} seconds)"
-        if duration > max_duration:
-            return False, f"Audio too long (maximum {max_duration} seconds)"
-        
-        rms = np.sqrt(np.mean(audio**2))
-        if rms < min_rms:
-            return False, "Audio is too quiet or silent"
-        
-        if np.abs(audio).max() > 0.99:
-            return False, "Audio is clipping (reduce input gain)"
-        
-        return True, None
+        return check_reference_audio(
+            analyze_audio(audio, sr),
+            min_duration=min_duration,
+            max_duration=max_duration,
+            min_rms=min_rms,
+        )
     except Exception as e:
         return False, f"Error validating audio: {str(e)}"
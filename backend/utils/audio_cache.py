@@ -0,0 +1,149 @@
+"""
+Process-wide cache of decoded audio.
+
+Story exports, combined voice prompts and other readers decode the same
+stored WAVs over and over. Decoded arrays are kept in an LRU bounded by their
+bytes, keyed by the file's path and stat signature plus the requested rate,
+so a rewritten file is never served stale. Cached arrays are read-only, which
+lets every caller share them without copying; callers that need to modify
+audio must copy it first.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple, Union
+import os
+import threading
+
+import numpy as np
+
+from .. import config
+from .audio import load_audio
+
+
+# (path, size, mtime_ns, sample_rate, mono)
+AudioKey = Tuple[str, int, int, Optional[int], bool]
+
+
+class DecodedAudioCache:
+    """Thread-safe LRU of decoded audio arrays bounded by their bytes."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Memory budget; 0 disables caching
+        """
+        self.max_bytes = max_bytes
+        # key -> (audio, sample_rate), least recently used first
+        self._entries: "OrderedDict[AudioKey, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._keys_by_path: Dict[str, Set[AudioKey]] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def load(
+        self,
+        path: Union[str, Path],
+        sample_rate: Optional[int] = 24000,
+        mono: bool = True,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Load audio through the cache.
+
+        Args:
+            path: Path to audio file
+            sample_rate: Target sample rate (None keeps the file's rate)
+            mono: Convert to mono
+
+        Returns:
+            Tuple of (read-only audio array, sample_rate)
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns, sample_rate, mono)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            self._misses += 1
+
+        audio, sr = load_audio(path, sample_rate=sample_rate, mono=mono)
+        audio.setflags(write=False)
+        self._put(key, audio, sr)
+        return audio, sr
+
+    def _put(self, key: AudioKey, audio: np.ndarray, sample_rate: int) -> None:
+        """Store a decoded array, replacing older versions of the same file."""
+        with self._lock:
+            path = key[0]
+            for stale in [k for k in self._keys_by_path.get(path, ()) if k[1:3] != key[1:3]]:
+                self._remove(stale)
+            if audio.nbytes > self.max_bytes or key in self._entries:
+                return
+            self._entries[key] = (audio, sample_rate)
+            self._keys_by_path.setdefault(path, set()).add(key)
+            self._total_bytes += audio.nbytes
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: AudioKey) -> None:
+        """Drop an entry. Caller holds the lock."""
+        audio, _ = self._entries.pop(key)
+        self._total_bytes -= audio.nbytes
+        keys = self._keys_by_path.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_path[key[0]]
+
+    def clear(self) -> None:
+        """Drop every cached array."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and memory use."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+
+# Global decoded audio cache instance
+_decoded_audio_cache: Optional[DecodedAudioCache] = None
+
+
+def get_decoded_audio_cache() -> DecodedAudioCache:
+    """Get or create the global decoded audio cache."""
+    global _decoded_audio_cache
+    if _decoded_audio_cache is None:
+        _decoded_audio_cache = DecodedAudioCache(config.get_audio_cache_max_bytes())
+    return _decoded_audio_cache
+
+
+def load_audio_cached(
+    path: Union[str, Path],
+    sample_rate: Optional[int] = 24000,
+    mono: bool = True,
+) -> Tuple[np.ndarray, int]:
+    """
+    Load a stored audio file through the shared decoded-audio cache.
+
+    Returns a read-only array; copy it before modifying. Use load_audio for
+    one-off files such as uploads.
+    """
+    return get_decoded_audio_cache().load(path, sample_rate=sample_rate, mono=mono)
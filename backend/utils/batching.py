@@ -0,0 +1,155 @@
+"""
+Dynamic micro-batching for blocking inference calls.
+
+Requests that arrive within a short window are grouped and handed to a
+synchronous batch function in a single thread-pool call. Each caller gets
+back its own result.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+import asyncio
+import threading
+
+
+class MicroBatcher:
+    """Collects concurrent requests into batches for a blocking batch function."""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 4,
+        window_ms: float = 30.0,
+    ):
+        """
+        Args:
+            process_batch: Blocking function mapping a list of items to a
+                list of results in the same order. Runs in a worker thread.
+            max_batch_size: Maximum number of items per batch
+            window_ms: How long to wait for more items after the first one
+        """
+        self._process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_ms = max(0.0, window_ms)
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._lock = threading.Lock()
+        self._batch_size_histogram: Dict[int, int] = {}
+        self._total_batches = 0
+        self._total_items = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether batching is active (a batch size of 1 disables it)."""
+        return self.max_batch_size > 1
+
+    async def submit(self, item: Any, group_key: Hashable = None) -> Any:
+        """
+        Submit an item and wait for its result.
+
+        Only items sharing the same group_key are batched together.
+
+        Args:
+            item: Item passed to the batch function
+            group_key: Key of the batch the item may join
+
+        Returns:
+            Result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(group_key, [])
+        pending.append((item, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(group_key)
+        elif len(pending) == 1:
+            self._timers[group_key] = loop.call_later(
+                self.window_ms / 1000.0, self._flush, group_key
+            )
+
+        return await future
+
+    def _flush(self, group_key: Hashable) -> None:
+        """Dispatch the pending items of a group as one batch."""
+        timer = self._timers.pop(group_key, None)
+        if timer is not None:
+            timer.cancel()
+
+        pending = self._pending.pop(group_key, [])
+        if not pending:
+            return
+
+        # Anything beyond the max size starts the next batch
+        batch, overflow = pending[:self.max_batch_size], pending[self.max_batch_size:]
+        if overflow:
+            self._pending[group_key] = overflow
+            self._flush(group_key)
+
+        asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run a batch in the thread pool and resolve each caller's future."""
+        # Callers that gave up while the batch was forming are dropped
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        self._record_batch(len(items))
+
+        try:
+            results = await asyncio.to_thread(self._process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as batch_error:
+            if len(items) == 1:
+                self._set_exception(batch[0][1], batch_error)
+                return
+            # One bad item should not fail its neighbours: retry individually
+            for item, future in batch:
+                if future.done():
+                    continue
+                try:
+                    result = (await asyncio.to_thread(self._process_batch, [item]))[0]
+                    self._set_result(future, result)
+                except Exception as e:
+                    self._set_exception(future, e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            self._set_result(future, result)
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: Any) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+    def _record_batch(self, size: int) -> None:
+        """Update the batch-size histogram."""
+        with self._lock:
+            self._batch_size_histogram[size] = self._batch_size_histogram.get(size, 0) + 1
+            self._total_batches += 1
+            self._total_items += size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching configuration and batch-size histogram."""
+        with self._lock:
+            histogram = dict(sorted(self._batch_size_histogram.items()))
+            total_batches = self._total_batches
+            total_items = self._total_items
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window_ms,
+            "total_batches": total_batches,
+            "total_requests": total_items,
+            "mean_batch_size": (total_items / total_batches) if total_batches else 0.0,
+            "batch_size_histogram": histogram,
+        }
@@ -2,12 +2,20 @@
 Voice prompt caching utilities.
 """
 
+import dataclasses
 import hashlib
+import os
+import sys
+import threading
+import time
+import numpy as np
 import torch
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Tuple, Union, Dict, Any, List, Set
 
 from .. import config
+from .prompt_store import PROMPT_SUFFIX, PromptFormatError, load_prompt, save_prompt
 
 
 def _get_cache_dir() -> Path:
@@ -15,8 +23,257 @@ def _get_cache_dir() -> Path:
     return config.get_cache_dir()
 
 
+def estimate_prompt_bytes(value: Any) -> int:
+    """
+    Estimate the memory held by a voice prompt.
+
+    Counts tensor and array storage and walks dicts, sequences, dataclasses
+    and plain objects (such as Qwen prompt items) to find them.
+    """
+    seen = set()
+
+    def _size(obj: Any) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        if isinstance(obj, torch.Tensor):
+            return obj.numel() * obj.element_size()
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes
+        if isinstance(obj, dict):
+            return sum(_size(k) + _size(v) for k, v in obj.items())
+        if isinstance(obj, (list, tuple, set)):
+            return sum(_size(item) for item in obj)
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return sum(_size(getattr(obj, f.name)) for f in dataclasses.fields(obj))
+        if hasattr(obj, "__dict__") and not isinstance(obj, type):
+            return _size(vars(obj))
+        return sys.getsizeof(obj)
+
+    return _size(value)
+
+
+class PromptMemoryCache:
+    """Thread-safe LRU of voice prompts bounded by their tensor bytes."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 0.0):
+        """
+        Args:
+            max_bytes: Memory budget; 0 disables in-memory caching
+            ttl_seconds: Drop entries older than this (0 keeps them until evicted)
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (prompt, size_bytes, stored_at), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a prompt and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry[2] > self.ttl_seconds:
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, prompt: Any) -> None:
+        """Store a prompt, evicting least recently used ones to fit the budget."""
+        size = estimate_prompt_bytes(prompt)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (prompt, size, time.monotonic())
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Drop a prompt if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def discard_prefix(self, prefix: str) -> int:
+        """Drop every prompt whose key starts with prefix; returns the count."""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry. Caller holds the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def clear(self) -> None:
+        """Drop every prompt."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and memory use."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+# Namespace of prompts cached without a backend or model
+DEFAULT_NAMESPACE = "default"
+
+
+def prompt_namespace(backend_type: Optional[str], model_id: Optional[str]) -> str:
+    """
+    Get the cache namespace of prompts built by a backend and model.
+
+    Prompts are model-specific, so each backend/model pair gets its own
+    in-memory LRU and on-disk directory.
+
+    Returns:
+        Filesystem-safe namespace such as "pytorch/Qwen--Qwen3-TTS-12Hz-1.7B-Base"
+    """
+    if not backend_type and not model_id:
+        return DEFAULT_NAMESPACE
+    model_part = (model_id or "default").replace("\\", "--").replace("/", "--").replace(":", "-")
+    return f"{backend_type or 'default'}/{model_part}"
+
+
+class NamespacedPromptCache:
+    """In-memory prompt caches, one byte-budgeted LRU per namespace."""
+
+    def __init__(self, max_bytes_per_namespace: int, ttl_seconds: float = 0.0):
+        """
+        Args:
+            max_bytes_per_namespace: Memory budget of each namespace
+            ttl_seconds: Entry TTL (0 keeps entries until evicted)
+        """
+        self.max_bytes_per_namespace = max_bytes_per_namespace
+        self.ttl_seconds = ttl_seconds
+        self._namespaces: Dict[str, PromptMemoryCache] = {}
+        self._lock = threading.Lock()
+
+    def namespace(self, name: str) -> PromptMemoryCache:
+        """Get or create the cache of a namespace."""
+        with self._lock:
+            cache = self._namespaces.get(name)
+            if cache is None:
+                cache = PromptMemoryCache(self.max_bytes_per_namespace, self.ttl_seconds)
+                self._namespaces[name] = cache
+            return cache
+
+    def get(self, name: str, key: str) -> Optional[Any]:
+        """Get a prompt from a namespace."""
+        return self.namespace(name).get(key)
+
+    def put(self, name: str, key: str, prompt: Any) -> None:
+        """Store a prompt in a namespace."""
+        self.namespace(name).put(key, prompt)
+
+    def drop_namespace(self, name: str) -> int:
+        """
+        Free every prompt of a namespace, e.g. when its model is unloaded.
+
+        Returns:
+            Number of prompts dropped
+        """
+        with self._lock:
+            cache = self._namespaces.pop(name, None)
+        if cache is None:
+            return 0
+        count = len(cache)
+        cache.clear()
+        return count
+
+    def discard_prefix(self, prefix: str) -> int:
+        """Drop prompts whose key starts with prefix from every namespace."""
+        with self._lock:
+            caches = list(self._namespaces.values())
+        return sum(cache.discard_prefix(prefix) for cache in caches)
+
+    def clear(self) -> None:
+        """Free every prompt in every namespace."""
+        with self._lock:
+            caches, self._namespaces = list(self._namespaces.values()), {}
+        for cache in caches:
+            cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get totals and per-namespace stats."""
+        with self._lock:
+            namespaces = dict(self._namespaces)
+        per_namespace = {name: cache.get_stats() for name, cache in namespaces.items()}
+        hits = sum(stats["hits"] for stats in per_namespace.values())
+        misses = sum(stats["misses"] for stats in per_namespace.values())
+        return {
+            "entries": sum(stats["entries"] for stats in per_namespace.values()),
+            "size_bytes": sum(stats["size_bytes"] for stats in per_namespace.values()),
+            "max_bytes_per_namespace": self.max_bytes_per_namespace,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / (hits + misses)) if hits + misses else 0.0,
+            "namespaces": per_namespace,
+        }
+
+
 # In-memory cache - can store dict (voice prompt) or tensor (legacy)
-_memory_cache: dict[str, Union[torch.Tensor, Dict[str, Any]]] = {}
+_memory_cache: Optional[NamespacedPromptCache] = None
+
+
+def get_prompt_memory_cache() -> NamespacedPromptCache:
+    """Get or create the in-memory voice prompt cache."""
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = NamespacedPromptCache(
+            config.get_prompt_cache_max_bytes(),
+            config.get_prompt_cache_ttl_seconds(),
+        )
+    return _memory_cache
+
+
+def release_prompt_namespace(backend_type: Optional[str], model_id: Optional[str]) -> int:
+    """
+    Free the in-memory prompts of a backend/model pair.
+
+    Prompts stay on disk and are reloaded if the model is loaded again.
+
+    Returns:
+        Number of prompts freed
+    """
+    return get_prompt_memory_cache().drop_namespace(prompt_namespace(backend_type, model_id))
 
 
 def get_cache_key(audio_path: str, reference_text: str) -> str:
@@ -41,53 +298,194 @@ def get_cache_key(audio_path: str, reference_text: str) -> str:
     return hashlib.md5(combined).hexdigest()
 
 
+# (size, mtime_ns, inode) of a file; changes whenever the file is rewritten
+FileSignature = Tuple[int, int, int]
+
+# Cache keys of ad-hoc files, validated by their signature
+_MAX_KEY_REGISTRY_ENTRIES = 4096
+_key_registry: "OrderedDict[Tuple[str, str], Tuple[FileSignature, str]]" = OrderedDict()
+_key_registry_lock = threading.Lock()
+
+
+def file_signature(path: Union[str, Path]) -> FileSignature:
+    """
+    Get a cheap signature of a file from a single stat call.
+
+    Returns:
+        (size, mtime_ns, inode)
+    """
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def get_sample_cache_key(
+    audio_path: str,
+    reference_text: str,
+    known_key: Optional[str] = None,
+    known_signature: Optional[FileSignature] = None,
+) -> Tuple[str, FileSignature]:
+    """
+    Get the cache key of a sample without rehashing unchanged files.
+
+    A key recorded together with the file's signature (for example on the
+    sample row) is trusted while the signature still matches. Otherwise
+    recently seen paths are looked up in a registry, and only files that are
+    new or changed on disk are hashed with get_cache_key.
+
+    Args:
+        audio_path: Path to audio file
+        reference_text: Reference text
+        known_key: Previously computed key, if any
+        known_signature: Signature of the file when known_key was computed
+
+    Returns:
+        Tuple of (cache_key, current file signature)
+    """
+    signature = file_signature(audio_path)
+    if known_key and known_signature is not None and tuple(known_signature) == signature:
+        return known_key, signature
+
+    registry_key = (str(audio_path), reference_text)
+    with _key_registry_lock:
+        entry = _key_registry.get(registry_key)
+        if entry is not None and entry[0] == signature:
+            _key_registry.move_to_end(registry_key)
+            return entry[1], signature
+
+    cache_key = get_cache_key(audio_path, reference_text)
+    with _key_registry_lock:
+        _key_registry[registry_key] = (signature, cache_key)
+        _key_registry.move_to_end(registry_key)
+        while len(_key_registry) > _MAX_KEY_REGISTRY_ENTRIES:
+            _key_registry.popitem(last=False)
+    return cache_key, signature
+
+
+# A cache file's mtime records its last use, so LRU collection survives
+# restarts; it is refreshed at most this often per file
+_TOUCH_INTERVAL_SECONDS = 60.0
+_MAX_TOUCH_ENTRIES = 4096
+_last_touch: "OrderedDict[str, float]" = OrderedDict()
+_touch_lock = threading.Lock()
+
+# Unreferenced files younger than this are never collected; they may belong
+# to a sample or prompt that is still being created
+_ORPHAN_GRACE_SECONDS = 600.0
+
+
+def touch_cache_file(path: Union[str, Path]) -> None:
+    """Record that a cache file was used (bumps its mtime, throttled)."""
+    key = str(path)
+    now = time.time()
+    with _touch_lock:
+        if now - _last_touch.get(key, 0.0) < _TOUCH_INTERVAL_SECONDS:
+            return
+        _last_touch[key] = now
+        _last_touch.move_to_end(key)
+        while len(_last_touch) > _MAX_TOUCH_ENTRIES:
+            _last_touch.popitem(last=False)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _get_prompt_dir(namespace: str) -> Path:
+    """Get the on-disk directory of a prompt namespace."""
+    return _get_cache_dir() / "prompts" / namespace
+
+
+def get_prompt_disk_usage() -> Dict[str, Dict[str, int]]:
+    """Get the number and total size of stored prompt files per namespace."""
+    root = _get_cache_dir() / "prompts"
+    usage: Dict[str, Dict[str, int]] = {}
+    if not root.exists():
+        return usage
+    for prompt_file in root.rglob(f"*{PROMPT_SUFFIX}"):
+        namespace = prompt_file.parent.relative_to(root).as_posix()
+        entry = usage.setdefault(namespace, {"files": 0, "size_bytes": 0})
+        entry["files"] += 1
+        try:
+            entry["size_bytes"] += prompt_file.stat().st_size
+        except FileNotFoundError:
+            pass
+    return usage
+
+
 def get_cached_voice_prompt(
     cache_key: str,
-) -> Optional[Union[torch.Tensor, Dict[str, Any]]]:
+    model_id: Optional[str] = None,
+    backend_type: Optional[str] = None,
+) -> Optional[Union[torch.Tensor, Dict[str, Any], List[Any]]]:
     """
     Get cached voice prompt if available.
 
     Args:
         cache_key: Cache key
+        model_id: Model the prompt must have been built with (None accepts any)
+        backend_type: Backend the prompt was built by ("pytorch" or "mlx")
 
     Returns:
-        Cached voice prompt (dict or tensor) or None
+        Cached voice prompt or None
     """
     # Check in-memory cache
-    if cache_key in _memory_cache:
-        return _memory_cache[cache_key]
+    namespace = prompt_namespace(backend_type, model_id)
+    memory_cache = get_prompt_memory_cache()
+    cache_file = _get_prompt_dir(namespace) / f"{cache_key}{PROMPT_SUFFIX}"
+    prompt = memory_cache.get(namespace, cache_key)
+    if prompt is not None:
+        touch_cache_file(cache_file)
+        return prompt
+
+    # Prompts from before the safetensors format are pickles; never load them
+    legacy_file = _get_cache_dir() / f"{cache_key}.prompt"
+    if legacy_file.exists():
+        legacy_file.unlink(missing_ok=True)
 
     # Check disk cache
-    cache_file = _get_cache_dir() / f"{cache_key}.prompt"
     if cache_file.exists():
         try:
-            prompt = torch.load(cache_file)
-            _memory_cache[cache_key] = prompt
-            return prompt
-        except Exception:
+            prompt, valid = load_prompt(cache_file, model_id)
+        except PromptFormatError as e:
             # Cache file corrupted, delete it
-            cache_file.unlink()
+            print(f"Discarding cached prompt: {e}")
+            cache_file.unlink(missing_ok=True)
+            return None
+        if valid:
+            memory_cache.put(namespace, cache_key, prompt)
+            touch_cache_file(cache_file)
+            return prompt
 
     return None
 
 
 def cache_voice_prompt(
     cache_key: str,
-    voice_prompt: Union[torch.Tensor, Dict[str, Any]],
+    voice_prompt: Union[torch.Tensor, Dict[str, Any], List[Any]],
+    model_id: Optional[str] = None,
+    backend_type: Optional[str] = None,
 ) -> None:
     """
     Cache voice prompt to memory and disk.
 
     Args:
         cache_key: Cache key
-        voice_prompt: Voice prompt (dict or tensor)
+        voice_prompt: Voice prompt (tensors in dicts, lists or dataclasses)
+        model_id: Model the prompt was built with
+        backend_type: Backend the prompt was built by ("pytorch" or "mlx")
     """
     # Store in memory
-    _memory_cache[cache_key] = voice_prompt
+    namespace = prompt_namespace(backend_type, model_id)
+    get_prompt_memory_cache().put(namespace, cache_key, voice_prompt)
 
-    # Store on disk (torch.save can handle both dicts and tensors)
-    cache_file = _get_cache_dir() / f"{cache_key}.prompt"
-    torch.save(voice_prompt, cache_file)
+    # Store on disk
+    prompt_dir = _get_prompt_dir(namespace)
+    prompt_dir.mkdir(parents=True, exist_ok=True)
+    cache_file = prompt_dir / f"{cache_key}{PROMPT_SUFFIX}"
+    try:
+        save_prompt(cache_file, voice_prompt, model_id)
+    except PromptFormatError as e:
+        print(f"Voice prompt kept in memory only: {e}")
 
 
 def clear_voice_prompt_cache() -> int:
@@ -98,15 +496,20 @@ def clear_voice_prompt_cache() -> int:
         Number of cache files deleted
     """
     # Clear memory cache
-    _memory_cache.clear()
+    get_prompt_memory_cache().clear()
     
     # Clear disk cache
     cache_dir = _get_cache_dir()
     deleted_count = 0
     
     if cache_dir.exists():
-        # Delete prompt cache files
-        for cache_file in cache_dir.glob("*.prompt"):
+        # Delete prompt cache files (all namespaces and the legacy flat layout)
+        prompt_files = [
+            *(cache_dir / "prompts").rglob(f"*{PROMPT_SUFFIX}"),
+            *cache_dir.glob(f"*{PROMPT_SUFFIX}"),
+            *cache_dir.glob("*.prompt"),
+        ]
+        for cache_file in prompt_files:
             try:
                 cache_file.unlink()
                 deleted_count += 1
@@ -141,6 +544,13 @@ def clear_profile_cache(profile_id: str) -> int:
         # Delete combined audio files for this profile
         pattern = f"combined_{profile_id}_*.wav"
         for audio_file in cache_dir.glob(pattern):
+            # The name ends with the start of the combined prompt's cache key;
+            # drop that prompt for every model as well
+            combination_hash = audio_file.stem.rsplit("_", 1)[-1]
+            get_prompt_memory_cache().discard_prefix(combination_hash)
+            for prompt_file in (cache_dir / "prompts").rglob(f"{combination_hash}*{PROMPT_SUFFIX}"):
+                prompt_file.unlink(missing_ok=True)
+                deleted_count += 1
             try:
                 audio_file.unlink()
                 deleted_count += 1
@@ -148,3 +558,107 @@ def clear_profile_cache(profile_id: str) -> int:
                 print(f"Failed to delete combined audio file {audio_file}: {e}")
     
     return deleted_count
+
+
+def collect_cache_garbage(
+    max_bytes: int,
+    live_keys: Optional[Set[str]] = None,
+    live_combined: Optional[Set[str]] = None,
+    grace_seconds: float = _ORPHAN_GRACE_SECONDS,
+) -> Dict[str, int]:
+    """
+    Delete orphaned and least recently used voice prompt cache files.
+
+    Covers stored prompts and combined sample audio; the generation result
+    cache has its own budget. Files are removed in this order:
+    leftovers that are never read (legacy flat prompt files, interrupted
+    writes), orphans (prompts whose key no current sample or sample set has,
+    combined audio of deleted profiles or replaced sample sets), and then the
+    least recently used files until the rest fits in max_bytes.
+
+    Args:
+        max_bytes: Disk quota (0 for no quota)
+        live_keys: Cache keys of current samples and sample combinations;
+            None skips orphan detection for prompts
+        live_combined: File names of combined audio still in use; None skips
+            orphan detection for combined audio
+        grace_seconds: Minimum age of a file before it counts as an orphan
+
+    Returns:
+        Counts of deleted files and the remaining usage
+    """
+    cache_dir = _get_cache_dir()
+    stats = {
+        "orphans_deleted": 0,
+        "evicted": 0,
+        "bytes_freed": 0,
+        "files": 0,
+        "size_bytes": 0,
+    }
+    if not cache_dir.exists():
+        return stats
+
+    now = time.time()
+    entries: List[Tuple[float, int, Path]] = []  # (mtime, size, path) of kept files
+
+    def _delete(path: Path, size: int) -> bool:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            print(f"Failed to delete cache file {path}: {e}")
+            return False
+        stats["bytes_freed"] += size
+        return True
+
+    def _visit(path: Path, orphan: bool) -> bool:
+        """Delete path if it is an old enough orphan, else keep it as an LRU candidate."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        if orphan and now - st.st_mtime >= grace_seconds:
+            if _delete(path, st.st_size):
+                stats["orphans_deleted"] += 1
+                return True
+            return False
+        entries.append((st.st_mtime, st.st_size, path))
+        return False
+
+    prompt_root = cache_dir / "prompts"
+    if prompt_root.exists():
+        for path in prompt_root.rglob(f"*{PROMPT_SUFFIX}.tmp"):
+            _visit(path, orphan=True)
+        for path in prompt_root.rglob(f"*{PROMPT_SUFFIX}"):
+            cache_key = path.name[:-len(PROMPT_SUFFIX)]
+            orphan = live_keys is not None and cache_key not in live_keys
+            if _visit(path, orphan):
+                get_prompt_memory_cache().discard_prefix(cache_key)
+
+    # Flat files from before prompts were namespaced are never read again
+    for path in [*cache_dir.glob("*.prompt"), *cache_dir.glob(f"*{PROMPT_SUFFIX}")]:
+        _visit(path, orphan=True)
+
+    for path in cache_dir.glob("combined_*.wav"):
+        if path.name.endswith(".tmp.wav"):
+            _visit(path, orphan=True)
+            continue
+        _visit(path, orphan=live_combined is not None and path.name not in live_combined)
+
+    # Least recently used first
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    kept = len(entries)
+    if max_bytes > 0:
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            if _delete(path, size):
+                stats["evicted"] += 1
+                kept -= 1
+                total -= size
+
+    stats["files"] = kept
+    stats["size_bytes"] = total
+    return stats
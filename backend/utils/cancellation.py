@@ -0,0 +1,70 @@
+"""
+Cooperative cancellation of blocking inference calls.
+
+Inference runs in worker threads that asyncio cannot interrupt. Each call gets
+a CancellationToken; the thread registers the tokens it is working for and the
+model's decoding loop calls check_cancelled() at every step, which raises once
+all of them are cancelled.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List
+import threading
+
+
+class GenerationCancelled(Exception):
+    """Raised inside an inference thread when its generation was cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag for one generate call."""
+
+    def __init__(self, event=None):
+        """
+        Args:
+            event: Event backing the flag; pass a multiprocessing.Event to
+                share the flag with another process
+        """
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+
+_local = threading.local()
+
+
+@contextmanager
+def cancellation_scope(tokens: List[CancellationToken]) -> Iterator[None]:
+    """
+    Register the tokens the current thread is generating for.
+
+    A batched call passes one token per item; it stops only when every item
+    has been cancelled.
+    """
+    previous = getattr(_local, "tokens", None)
+    _local.tokens = tokens
+    try:
+        yield
+    finally:
+        _local.tokens = previous
+
+
+def check_cancelled() -> None:
+    """
+    Stop the current thread's generation if all of its callers cancelled.
+
+    Safe to call from model hooks; does nothing outside a cancellation scope.
+
+    Raises:
+        GenerationCancelled: If every registered token is cancelled
+    """
+    tokens = getattr(_local, "tokens", None)
+    if tokens and all(token.cancelled for token in tokens):
+        raise GenerationCancelled("Generation cancelled")
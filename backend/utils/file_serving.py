@@ -0,0 +1,346 @@
+"""
+HTTP serving of stored files with validators and byte ranges.
+
+Audio and avatar endpoints answer If-None-Match with 304 and Range with 206,
+using strong ETags derived from each file's content hash. Stored generation
+and sample audio is never rewritten under the same id, so it is sent with a
+long, immutable Cache-Control; avatars must be revalidated.
+
+Resolving an id to its file normally costs a database query plus hashing the
+file. ServedFileMap remembers the path and hash per id, validated by the
+file's stat signature, so repeated requests skip both.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+import hashlib
+import os
+import threading
+
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from .cache import FileSignature, file_signature
+
+
+# Served files remembered per id before the least recently used is dropped
+_MAX_SERVED_FILES = 4096
+
+_CHUNK_SIZE = 64 * 1024
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class ServedFile(NamedTuple):
+    """A resolved file and the content hash its ETags derive from."""
+    path: str
+    fingerprint: str
+    signature: FileSignature
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def fingerprint_file(path: Union[str, Path]) -> str:
+    """
+    Hash a file's contents.
+
+    Returns:
+        MD5 hex digest
+    """
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_etag(fingerprint: str, variant: Optional[str] = None) -> str:
+    """
+    Build a strong ETag.
+
+    Args:
+        fingerprint: Content hash of the stored file
+        variant: Name of a derived representation (e.g. a transcoded format)
+    """
+    return f'"{fingerprint}-{variant}"' if variant else f'"{fingerprint}"'
+
+
+class ServedFileMap:
+    """Thread-safe LRU of (kind, id) -> served file, validated by file signature."""
+
+    def __init__(self, max_entries: int = _MAX_SERVED_FILES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], ServedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, kind: str, resource_id: str) -> Optional[ServedFile]:
+        """
+        Look up a file without touching the database.
+
+        Entries whose file has gone or changed on disk are dropped.
+
+        Args:
+            kind: Resource kind (generation, sample, avatar)
+            resource_id: Resource ID
+
+        Returns:
+            Served file, or None when the caller must resolve it
+        """
+        key = (kind, resource_id)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            try:
+                current = file_signature(entry.path)
+            except OSError:
+                current = None
+            with self._lock:
+                if current == entry.signature:
+                    self._hits += 1
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    return entry
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def resolve(self, kind: str, resource_id: str, path: Union[str, Path]) -> ServedFile:
+        """
+        Fingerprint a file found through the database and remember it.
+
+        Blocking; run it in a worker thread.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        signature = file_signature(path)
+        entry = ServedFile(str(path), fingerprint_file(path), signature)
+        if file_signature(path) != signature:
+            # Rewritten while hashing; serve it but do not remember the hash
+            return entry
+        with self._lock:
+            self._entries[(kind, resource_id)] = entry
+            self._entries.move_to_end((kind, resource_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, kind: str, resource_id: str) -> None:
+        """Forget a resource, e.g. after it was deleted or replaced."""
+        with self._lock:
+            self._entries.pop((kind, resource_id), None)
+
+    def clear(self) -> None:
+        """Forget every resource."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of remembered files."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in header.split(",")
+    )
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Malformed and multi-range headers are ignored (the full file is sent),
+    which RFC 9110 allows.
+
+    Args:
+        header: Range header value
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end), or None to send the full file
+
+    Raises:
+        RangeNotSatisfiable: If the range lies outside the file
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _base_headers(etag: str, cache_control: str, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Validator and caching headers shared by every response."""
+    return {
+        **(headers or {}),
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+
+def _cache_control(immutable: bool) -> str:
+    """Cache-Control for immutable or revalidated content."""
+    return IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+
+
+def not_modified_response(
+    request: Request,
+    etag: str,
+    immutable: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Response]:
+    """
+    Answer a matching If-None-Match with 304.
+
+    Check this before producing a body that is expensive to build.
+
+    Returns:
+        A 304 response, or None when the body must be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None or not _etag_matches(if_none_match, etag):
+        return None
+    response_headers = _base_headers(etag, _cache_control(immutable), headers)
+    response_headers.pop("Content-Disposition", None)
+    return Response(status_code=304, headers=response_headers)
+
+
+def _ranged_response(
+    request: Request,
+    size: int,
+    read: Callable[[int, int], Iterator[bytes]],
+    media_type: str,
+    etag: str,
+    immutable: bool,
+    headers: Optional[Dict[str, str]],
+) -> Response:
+    """Build a 304, 416, 206 or 200 response over a body of size bytes."""
+    not_modified = not_modified_response(request, etag, immutable, headers)
+    if not_modified is not None:
+        return not_modified
+    response_headers = _base_headers(etag, _cache_control(immutable), headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # A stale If-Range (or one given as a date) asks for the full file
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response_headers.pop("Content-Disposition", None)
+            response_headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=response_headers)
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        read(start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
+
+
+def file_response(
+    request: Request,
+    path: Union[str, Path],
+    media_type: str,
+    etag: str,
+    immutable: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Send a file with ETag, conditional GET and byte-range support.
+
+    Args:
+        request: Incoming request (for If-None-Match, Range and If-Range)
+        path: File to send
+        media_type: Content type
+        etag: Strong ETag of the file (see make_etag)
+        immutable: Whether the content never changes under this URL
+        headers: Extra headers (e.g. Content-Disposition, Vary)
+    """
+    def read(start: int, end: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return _ranged_response(request, os.path.getsize(path), read, media_type, etag, immutable, headers)
+
+
+def bytes_response(
+    request: Request,
+    content: bytes,
+    media_type: str,
+    etag: str,
+    immutable: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Send in-memory content (e.g. a transcoded file) like file_response."""
+    def read(start: int, end: int) -> Iterator[bytes]:
+        yield content[start:end + 1]
+
+    return _ranged_response(request, len(content), read, media_type, etag, immutable, headers)
+
+
+# Global served file map instance
+_served_file_map: Optional[ServedFileMap] = None
+
+
+def get_served_file_map() -> ServedFileMap:
+    """Get or create the global served file map."""
+    global _served_file_map
+    if _served_file_map is None:
+        _served_file_map = ServedFileMap()
+    return _served_file_map
@@ -0,0 +1,46 @@
+"""
+Lightweight in-process latency metrics.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict
+import threading
+
+
+class LatencyTracker:
+    """Keeps a rolling window of latency samples and summarises them."""
+
+    def __init__(self, window: int = 500):
+        """
+        Args:
+            window: Number of most recent samples used for percentiles
+        """
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ms: float) -> None:
+        """Record one latency sample in milliseconds."""
+        with self._lock:
+            self._samples.append(value_ms)
+            self._count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Get count, mean and percentiles over the rolling window."""
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+
+        if not samples:
+            return {"count": count, "mean_ms": None, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def percentile(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+        return {
+            "count": count,
+            "mean_ms": sum(samples) / len(samples),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": samples[-1],
+        }
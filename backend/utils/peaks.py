@@ -0,0 +1,216 @@
+"""
+Multi-resolution waveform peaks.
+
+Drawing a waveform only needs the minimum and maximum of each pixel's worth
+of samples. Peaks are computed once when audio is stored, as a pyramid: level
+0 holds one min/max pair per PEAKS_BASE_SAMPLES_PER_PEAK samples and each
+further level merges PEAKS_LEVEL_FACTOR pairs of the one below. Values are
+quantized to int8 (min rounded down, max rounded up, so the envelope always
+contains the signal) and written next to the audio with the .peaks suffix.
+
+A minute of 24 kHz audio takes about 11 KB at level 0 and 22 KB for the
+whole pyramid, instead of megabytes of audio.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import os
+import struct
+
+import numpy as np
+
+from .audio import load_audio
+
+
+PEAKS_SUFFIX = ".peaks"
+
+# Samples per min/max pair at level 0, and merge factor between levels
+PEAKS_BASE_SAMPLES_PER_PEAK = 256
+PEAKS_LEVEL_FACTOR = 2
+PEAKS_LEVELS = 8
+
+_MAGIC = b"EEPK"
+_VERSION = 1
+
+# Stored file: magic, version, levels, factor, sample rate, base samples per
+# peak, total samples; then one pair count per level, then the int8 pairs
+_FILE_HEADER = struct.Struct("<4sBBBxIIQ")
+
+# Level payload: magic, version, level, levels, sample rate, samples per
+# peak, pair count; then count (min, max) int8 pairs
+PAYLOAD_HEADER = struct.Struct("<4sBBBxIII")
+
+
+def get_peaks_path(audio_path: Union[str, Path]) -> Path:
+    """Get the peaks file stored next to an audio file."""
+    return Path(audio_path).with_suffix(PEAKS_SUFFIX)
+
+
+def compute_peak_levels(audio: np.ndarray, levels: int = PEAKS_LEVELS) -> List[np.ndarray]:
+    """
+    Compute the min/max pyramid of mono audio.
+
+    Args:
+        audio: Mono audio in [-1, 1]
+        levels: Number of levels
+
+    Returns:
+        One int8 array of shape (pairs, 2) per level, finest first
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    base = PEAKS_BASE_SAMPLES_PER_PEAK
+    pairs = -(-len(audio) // base)
+    if pairs == 0:
+        return [np.zeros((0, 2), dtype=np.int8) for _ in range(levels)]
+
+    # Pad the last bucket with its final sample so padding adds no new extremes
+    blocks = np.pad(audio, (0, pairs * base - len(audio)), mode="edge").reshape(pairs, base)
+    scaled = np.clip(np.stack([blocks.min(axis=1), blocks.max(axis=1)], axis=1) * 127, -127, 127)
+    level = np.stack([np.floor(scaled[:, 0]), np.ceil(scaled[:, 1])], axis=1).astype(np.int8)
+
+    result = [level]
+    factor = PEAKS_LEVEL_FACTOR
+    for _ in range(levels - 1):
+        count = -(-len(level) // factor)
+        groups = np.pad(level, ((0, count * factor - len(level)), (0, 0)), mode="edge")
+        groups = groups.reshape(count, factor, 2)
+        level = np.stack([groups[:, :, 0].min(axis=1), groups[:, :, 1].max(axis=1)], axis=1)
+        result.append(level)
+    return result
+
+
+def save_peaks(
+    path: Union[str, Path],
+    levels: List[np.ndarray],
+    sample_rate: int,
+    num_samples: int,
+) -> None:
+    """Write a peak pyramid atomically."""
+    path = Path(path)
+    header = _FILE_HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(levels),
+        PEAKS_LEVEL_FACTOR,
+        sample_rate,
+        PEAKS_BASE_SAMPLES_PER_PEAK,
+        num_samples,
+    )
+    counts = struct.pack(f"<{len(levels)}I", *(len(level) for level in levels))
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(counts)
+        for level in levels:
+            f.write(np.ascontiguousarray(level, dtype=np.int8).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_peaks(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read a peak pyramid.
+
+    Returns:
+        Dict with sample_rate, samples_per_peak (level 0), factor,
+        num_samples and levels (int8 arrays of shape (pairs, 2))
+
+    Raises:
+        ValueError: If the file is not a peaks file
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _FILE_HEADER.size:
+        raise ValueError(f"Truncated peaks file: {path}")
+    magic, version, num_levels, factor, sample_rate, samples_per_peak, num_samples = (
+        _FILE_HEADER.unpack_from(data)
+    )
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Not a peaks file: {path}")
+
+    offset = _FILE_HEADER.size
+    if len(data) < offset + 4 * num_levels:
+        raise ValueError(f"Truncated peaks file: {path}")
+    counts = struct.unpack_from(f"<{num_levels}I", data, offset)
+    offset += 4 * num_levels
+    if len(data) != offset + 2 * sum(counts):
+        raise ValueError(f"Truncated peaks file: {path}")
+    levels = []
+    for count in counts:
+        levels.append(np.frombuffer(data, dtype=np.int8, count=2 * count, offset=offset).reshape(count, 2))
+        offset += 2 * count
+    return {
+        "sample_rate": sample_rate,
+        "samples_per_peak": samples_per_peak,
+        "factor": factor,
+        "num_samples": num_samples,
+        "levels": levels,
+    }
+
+
+def write_peaks_for_audio(
+    audio_path: Union[str, Path],
+    audio: Optional[np.ndarray] = None,
+    sample_rate: Optional[int] = None,
+) -> Path:
+    """
+    Compute and store the peaks of an audio file.
+
+    Args:
+        audio_path: Stored audio file
+        audio: Its decoded mono samples, when already in memory
+        sample_rate: Sample rate of audio
+
+    Returns:
+        Path of the peaks file
+    """
+    if audio is None:
+        audio, sample_rate = load_audio(str(audio_path), sample_rate=None)
+    peaks_path = get_peaks_path(audio_path)
+    save_peaks(peaks_path, compute_peak_levels(audio), sample_rate, len(audio))
+    return peaks_path
+
+
+def delete_peaks(audio_path: Union[str, Path]) -> None:
+    """Remove the peaks stored next to an audio file, if any."""
+    get_peaks_path(audio_path).unlink(missing_ok=True)
+
+
+def get_peak_level_payload(audio_path: Union[str, Path], level: int) -> bytes:
+    """
+    Get one pyramid level as a compact binary payload.
+
+    Peaks missing or unreadable on disk are computed from the audio first.
+    The payload is PAYLOAD_HEADER followed by interleaved int8 min/max pairs.
+
+    Args:
+        audio_path: Stored audio file
+        level: Pyramid level (0 is finest)
+
+    Raises:
+        ValueError: If the level does not exist
+    """
+    peaks_path = get_peaks_path(audio_path)
+    try:
+        peaks = load_peaks(peaks_path)
+    except (OSError, ValueError):
+        write_peaks_for_audio(audio_path)
+        peaks = load_peaks(peaks_path)
+
+    levels = peaks["levels"]
+    if level >= len(levels):
+        raise ValueError(f"Peak level {level} does not exist (levels 0-{len(levels) - 1})")
+    header = PAYLOAD_HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        level,
+        len(levels),
+        peaks["sample_rate"],
+        peaks["samples_per_peak"] * peaks["factor"] ** level,
+        len(levels[level]),
+    )
+    return header + levels[level].tobytes()
+
+
+def has_peaks(audio_path: Union[str, Path]) -> bool:
+    """Whether peaks have been stored for an audio file."""
+    return get_peaks_path(audio_path).exists()
+
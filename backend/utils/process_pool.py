@@ -0,0 +1,291 @@
+"""
+Fork-after-load inference worker processes.
+
+The parent process loads the model once and then forks the workers, so every
+worker shares the weights copy-on-write instead of loading its own copy. Each
+worker is pinned to its own slice of CPU cores with a matching torch thread
+count, which lets CPU inference scale with cores rather than being limited to
+one model pass at a time by threads in a single process.
+
+Requests and results travel over a Pipe per worker. Calls are blocking and
+meant to run in a thread pool, like every other inference call.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import multiprocessing
+import os
+import queue
+import random
+import signal
+import threading
+
+import numpy as np
+
+from .cancellation import CancellationToken, GenerationCancelled, cancellation_scope
+
+
+# How often a waiting caller checks its cancellation tokens (seconds)
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+class WorkerUnavailable(Exception):
+    """Raised when no inference worker process is alive to take a call."""
+
+
+def split_cores(cores: Sequence[int], num_processes: int) -> List[List[int]]:
+    """
+    Split CPU cores into contiguous, near-equal slices, one per process.
+
+    Args:
+        cores: Available core IDs
+        num_processes: Number of slices
+
+    Returns:
+        List of core ID lists (empty lists when there are fewer cores than
+        processes, meaning "no pinning")
+    """
+    cores = sorted(cores)
+    if len(cores) < num_processes:
+        return [[] for _ in range(num_processes)]
+    base, extra = divmod(len(cores), num_processes)
+    slices = []
+    start = 0
+    for i in range(num_processes):
+        end = start + base + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+    return slices
+
+
+def _available_cores() -> List[int]:
+    """Get the cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _worker_main(
+    conn,
+    cancel_event,
+    cores: List[int],
+    num_threads: int,
+    handler: Callable[[Any], Any],
+) -> None:
+    """Serve requests in a forked worker until the pipe closes."""
+    # The server's signal handlers were inherited; the parent owns shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    if num_threads > 0:
+        import torch
+        torch.set_num_threads(num_threads)
+
+    # Every worker inherited the parent's RNG state; without a fresh seed,
+    # unseeded generations on different workers draw the same samples
+    random.seed()
+    np.random.seed()
+    try:
+        import torch
+        torch.seed()
+    except ImportError:
+        pass
+
+    token = CancellationToken(cancel_event)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        try:
+            with cancellation_scope([token]):
+                result = handler(request)
+            conn.send(("ok", result))
+        except GenerationCancelled:
+            conn.send(("cancelled", None))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, index: int, process, conn, cancel_event, cores: List[int], num_threads: int):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.cancel_event = cancel_event
+        self.cores = cores
+        self.num_threads = num_threads
+        self.calls = 0
+
+
+class InferenceProcessPool:
+    """Pool of forked processes running a blocking handler on a shared model."""
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        num_processes: int,
+        threads_per_process: int = 0,
+    ):
+        """
+        Args:
+            handler: Function run in a worker for each request; it closes
+                over the already-loaded model. Requests and results must be
+                picklable.
+            num_processes: Number of worker processes
+            threads_per_process: torch threads per worker; 0 uses the size
+                of the worker's core slice
+        """
+        self._handler = handler
+        self.num_processes = max(1, num_processes)
+        self.threads_per_process = max(0, threads_per_process)
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._calls = 0
+        self._cancelled = 0
+        self._errors = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Whether this platform can fork workers that share the parent's memory."""
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    @property
+    def available(self) -> bool:
+        """Whether at least one worker is alive."""
+        return any(worker.process.is_alive() for worker in self._workers)
+
+    def start(self) -> None:
+        """
+        Fork the workers.
+
+        Call after the model is loaded and before running inference in this
+        process, so the workers inherit the weights but no busy thread pools.
+        OpenMP thread pools do not survive fork: a worker forked after the
+        parent has run a parallel region can hang in its own first one.
+        """
+        if self._workers:
+            return
+        context = multiprocessing.get_context("fork")
+        core_slices = split_cores(_available_cores(), self.num_processes)
+        for index, cores in enumerate(core_slices):
+            num_threads = self.threads_per_process or len(cores)
+            parent_conn, child_conn = context.Pipe()
+            cancel_event = context.Event()
+            process = context.Process(
+                target=_worker_main,
+                args=(child_conn, cancel_event, cores, num_threads, self._handler),
+                name=f"inference-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            worker = _Worker(index, process, parent_conn, cancel_event, cores, num_threads)
+            self._workers.append(worker)
+            self._idle.put(worker)
+        print(f"Started {self.num_processes} inference worker processes")
+
+    def stop(self) -> None:
+        """Ask the workers to exit and reap them."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=5)
+            worker.conn.close()
+        self._idle = queue.Queue()
+
+    def call(self, request: Any, tokens: Sequence[CancellationToken] = ()) -> Any:
+        """
+        Run a request on the next idle worker, blocking until it finishes.
+
+        Args:
+            request: Picklable request passed to the handler
+            tokens: Callers' cancellation tokens; the worker stops at its next
+                cancellation point once all of them are cancelled
+
+        Returns:
+            The handler's result
+
+        Raises:
+            GenerationCancelled: If the worker stopped because of cancellation
+            WorkerUnavailable: If no worker is alive
+            RuntimeError: If the handler raised in the worker
+        """
+        worker = self._take_worker()
+        with self._lock:
+            self._busy += 1
+            self._calls += 1
+        worker.calls += 1
+        try:
+            worker.cancel_event.clear()
+            worker.conn.send(request)
+            while not worker.conn.poll(_CANCEL_POLL_INTERVAL):
+                if tokens and all(token.cancelled for token in tokens):
+                    worker.cancel_event.set()
+                if not worker.process.is_alive():
+                    raise WorkerUnavailable(f"Inference worker {worker.index} exited")
+            status, value = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerUnavailable(f"Inference worker {worker.index} failed: {e}")
+        finally:
+            with self._lock:
+                self._busy -= 1
+            if worker.process.is_alive():
+                self._idle.put(worker)
+
+        if status == "cancelled":
+            with self._lock:
+                self._cancelled += 1
+            raise GenerationCancelled("Generation cancelled")
+        if status == "error":
+            with self._lock:
+                self._errors += 1
+            raise RuntimeError(value)
+        return value
+
+    def _take_worker(self) -> _Worker:
+        """Wait for an idle worker that is still alive."""
+        while True:
+            if not self.available:
+                raise WorkerUnavailable("No inference worker processes are running")
+            try:
+                worker = self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if worker.process.is_alive():
+                return worker
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker layout and call counters."""
+        with self._lock:
+            return {
+                "processes": len(self._workers),
+                "alive": sum(1 for worker in self._workers if worker.process.is_alive()),
+                "busy": self._busy,
+                "calls": self._calls,
+                "cancelled": self._cancelled,
+                "errors": self._errors,
+                "workers": [
+                    {
+                        "pid": worker.process.pid,
+                        "cores": worker.cores,
+                        "threads": worker.num_threads,
+                        "calls": worker.calls,
+                    }
+                    for worker in self._workers
+                ],
+            }
@@ -220,9 +220,9 @@ class ProgressManager:
             
             if initial_progress:
                 status = initial_progress.get('status')
-                # Only send initial progress if download is actually in progress
+                # Only send initial progress if a download (or warm-up) is in progress
                 # Don't send old 'complete' or 'error' status from previous downloads
-                if status in ('downloading', 'extracting'):
+                if status in ('downloading', 'extracting', 'warming'):
                     logger.info(f"Sending initial progress for {model_name}: {status}")
                     yield f"data: {json.dumps(initial_progress)}\n\n"
                 else:
@@ -0,0 +1,172 @@
+"""
+Pickle-free on-disk format for voice prompts.
+
+A prompt is stored as one safetensors file. Its tensors are the file's
+tensors. The header metadata carries a schema version, the id of the model
+that built the prompt, and a JSON description of how the tensors fit back
+into the prompt's structure of dicts, lists, scalars and dataclasses.
+Reading the header is cheap, so entries from another schema or model are
+rejected without touching tensor data. Tensors are read from the
+memory-mapped file only when a prompt is actually loaded.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import dataclasses
+import importlib
+import json
+import os
+
+import numpy as np
+import torch
+from safetensors import safe_open
+from safetensors.torch import save_file
+
+
+# Bump when the structure encoding changes; older files are then ignored
+SCHEMA_VERSION = "1"
+
+# File suffix of stored prompts
+PROMPT_SUFFIX = ".prompt.safetensors"
+
+# Top-level packages whose dataclasses may be rebuilt from a stored prompt.
+# Class names come from the file, so they are never imported from elsewhere.
+ALLOWED_DATACLASS_PACKAGES = {"qwen_tts", "mlx_audio"}
+
+
+class PromptFormatError(Exception):
+    """Raised when a prompt cannot be stored in, or read from, the format."""
+
+
+def _encode(obj: Any, tensors: Dict[str, torch.Tensor], seen: Dict[int, str]) -> Any:
+    """Describe obj as JSON, moving its tensors into the tensors dict."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"v": obj}
+    if isinstance(obj, torch.Tensor):
+        name = seen.get(id(obj))
+        if name is None:
+            name = f"t{len(tensors)}"
+            # Clone so tensors that share storage can be saved independently
+            tensors[name] = obj.detach().to("cpu").contiguous().clone()
+            seen[id(obj)] = name
+        return {"t": name, "device": str(obj.device)}
+    if isinstance(obj, np.ndarray):
+        name = f"t{len(tensors)}"
+        tensors[name] = torch.from_numpy(np.ascontiguousarray(obj)).clone()
+        return {"np": name}
+    if isinstance(obj, dict):
+        if not all(isinstance(key, str) for key in obj):
+            raise PromptFormatError("Only dicts with string keys can be stored")
+        return {"d": {key: _encode(value, tensors, seen) for key, value in obj.items()}}
+    if isinstance(obj, (list, tuple)):
+        kind = "l" if isinstance(obj, list) else "tu"
+        return {kind: [_encode(item, tensors, seen) for item in obj]}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        cls = type(obj)
+        return {
+            "dc": f"{cls.__module__}:{cls.__qualname__}",
+            "f": {
+                field.name: _encode(getattr(obj, field.name), tensors, seen)
+                for field in dataclasses.fields(obj)
+            },
+        }
+    raise PromptFormatError(f"Cannot store values of type {type(obj).__name__}")
+
+
+def _resolve_dataclass(path: str) -> type:
+    """Import a dataclass named in a stored prompt, within the allowed packages."""
+    module_name, _, qualname = path.partition(":")
+    if module_name.split(".")[0] not in ALLOWED_DATACLASS_PACKAGES:
+        raise PromptFormatError(f"Refusing to rebuild {path}")
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    if not (isinstance(target, type) and dataclasses.is_dataclass(target)):
+        raise PromptFormatError(f"{path} is not a dataclass")
+    return target
+
+
+def _decode(node: Dict[str, Any], handle) -> Any:
+    """Rebuild a value described by _encode, reading tensors from handle."""
+    if "v" in node:
+        return node["v"]
+    if "t" in node:
+        tensor = handle.get_tensor(node["t"])
+        device = node.get("device", "cpu")
+        if device != "cpu":
+            try:
+                tensor = tensor.to(device)
+            except (RuntimeError, AssertionError):
+                pass  # Device not available here; the model moves inputs as needed
+        return tensor
+    if "np" in node:
+        return handle.get_tensor(node["np"]).numpy()
+    if "d" in node:
+        return {key: _decode(value, handle) for key, value in node["d"].items()}
+    if "l" in node:
+        return [_decode(item, handle) for item in node["l"]]
+    if "tu" in node:
+        return tuple(_decode(item, handle) for item in node["tu"])
+    if "dc" in node:
+        cls = _resolve_dataclass(node["dc"])
+        return cls(**{name: _decode(value, handle) for name, value in node["f"].items()})
+    raise PromptFormatError(f"Unknown node {sorted(node)}")
+
+
+def save_prompt(path: Union[str, Path], prompt: Any, model_id: Optional[str] = None) -> None:
+    """
+    Write a prompt atomically.
+
+    Args:
+        path: Destination file
+        prompt: Voice prompt (nested dicts, lists, dataclasses, tensors)
+        model_id: Id of the model that built the prompt
+
+    Raises:
+        PromptFormatError: If the prompt contains values the format cannot hold
+    """
+    tensors: Dict[str, torch.Tensor] = {}
+    structure = _encode(prompt, tensors, {})
+    metadata = {
+        "schema": SCHEMA_VERSION,
+        "model": model_id or "",
+        "structure": json.dumps(structure),
+    }
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    save_file(tensors, str(tmp_path), metadata=metadata)
+    os.replace(tmp_path, path)
+
+
+def read_header(path: Union[str, Path]) -> Dict[str, str]:
+    """Read a stored prompt's metadata without loading any tensor."""
+    with safe_open(str(path), framework="pt", device="cpu") as handle:
+        return handle.metadata() or {}
+
+
+def load_prompt(path: Union[str, Path], model_id: Optional[str] = None) -> Tuple[Any, bool]:
+    """
+    Load a stored prompt if it matches the schema and model.
+
+    Args:
+        path: Stored prompt file
+        model_id: Expected model id (None accepts any)
+
+    Returns:
+        Tuple of (prompt, True), or (None, False) if the file is stale
+
+    Raises:
+        PromptFormatError: If the file is corrupt or names a disallowed type
+    """
+    try:
+        with safe_open(str(path), framework="pt", device="cpu") as handle:
+            metadata = handle.metadata() or {}
+            if metadata.get("schema") != SCHEMA_VERSION:
+                return None, False
+            if model_id is not None and metadata.get("model") != model_id:
+                return None, False
+            return _decode(json.loads(metadata["structure"]), handle), True
+    except PromptFormatError:
+        raise
+    except Exception as e:
+        raise PromptFormatError(f"Unreadable prompt file {path}: {e}")
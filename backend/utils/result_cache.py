@@ -0,0 +1,293 @@
+"""
+Content-addressed cache of rendered generation audio.
+
+Deterministic requests (seed set) with the same voice samples, text and
+generation settings always produce the same audio, so their output is kept in
+a size-bounded on-disk store and reused instead of re-running inference.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+
+from .. import config
+
+
+_INDEX_FILE = "index.json"
+
+# Hits only change last_used, so they are persisted at most this often (and
+# on flush at GC and shutdown) instead of rewriting the index on every hit
+_INDEX_FLUSH_SECONDS = 60.0
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (Unicode NFC, collapsed whitespace)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_result_key(
+    profile_fingerprint: str,
+    text: str,
+    language: str,
+    seed: Optional[int],
+    instruct: Optional[str],
+    model_size: str,
+    long_form: bool = False,
+) -> Optional[str]:
+    """
+    Build the cache key for a generation request.
+
+    Args:
+        profile_fingerprint: Fingerprint of the profile's voice samples
+        text: Text to synthesize
+        language: Language code
+        seed: Random seed; requests without one are not cacheable
+        instruct: Delivery instruction
+        model_size: Model size
+        long_form: Whether the text is rendered in chunks
+
+    Returns:
+        Hex key, or None if the request is not cacheable
+    """
+    if seed is None:
+        return None
+    payload = json.dumps(
+        [
+            profile_fingerprint,
+            normalize_text(text),
+            language,
+            seed,
+            normalize_text(instruct) if instruct else None,
+            model_size,
+            long_form,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(source: Path, dest: Path) -> None:
+    """Hardlink source to dest, falling back to a copy across filesystems."""
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
+
+class ResultCache:
+    """Size-bounded LRU store of rendered audio files keyed by request content."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Args:
+            cache_dir: Directory holding cached audio and the index
+            max_bytes: Disk budget; 0 disables the cache
+        """
+        self._dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._index_dirty = False
+        self._index_saved_at = time.monotonic()
+        if self.enabled:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.max_bytes > 0
+
+    def _load_index(self) -> None:
+        """Load the persisted index, dropping entries whose file is gone."""
+        index_path = self._dir / _INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable result cache index: {e}")
+            return
+
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].get("last_used", 0)):
+            if (self._dir / entry["file"]).exists():
+                self._entries[key] = entry
+                self._total_bytes += entry["size"]
+
+    def _save_index(self) -> None:
+        """Atomically persist the index. Caller holds the lock."""
+        index_path = self._dir / _INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, index_path)
+        self._index_dirty = False
+        self._index_saved_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Persist recency updates from hits that are not on disk yet."""
+        with self._lock:
+            if self._index_dirty and self.enabled:
+                self._save_index()
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Blocking (stats the file, sometimes saves the index); call it from a
+        worker thread.
+
+        Args:
+            key: Cache key (None counts as uncacheable and is ignored)
+
+        Returns:
+            Entry dict with "path", "duration" and "generation_id", or None
+        """
+        if key is None or not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not (self._dir / entry["file"]).exists():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(key)
+            self._index_dirty = True
+            if time.monotonic() - self._index_saved_at >= _INDEX_FLUSH_SECONDS:
+                self._save_index()
+            return {**entry, "path": str(self._dir / entry["file"])}
+
+    def put(
+        self,
+        key: Optional[str],
+        audio_path: str,
+        duration: float,
+        generation_id: Optional[str] = None,
+    ) -> None:
+        """
+        Store a rendered file, evicting least recently used entries as needed.
+
+        The file is hardlinked (or copied) into the cache, so deleting the
+        original generation does not invalidate the cached audio. Blocking;
+        call it from a worker thread.
+
+        Args:
+            key: Cache key (None is ignored)
+            audio_path: Path of the rendered audio
+            duration: Audio duration in seconds
+            generation_id: History entry the audio was first saved as
+        """
+        if key is None or not self.enabled:
+            return
+
+        source = Path(audio_path)
+        size = source.stat().st_size
+        if size > self.max_bytes:
+            return
+
+        filename = f"{key}{source.suffix or '.wav'}"
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            link_or_copy(source, self._dir / filename)
+            self._entries[key] = {
+                "file": filename,
+                "size": size,
+                "duration": duration,
+                "generation_id": generation_id,
+                "last_used": time.time(),
+            }
+            self._total_bytes += size
+            self._stores += 1
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+            self._save_index()
+
+    def set_generation_id(self, key: str, generation_id: str) -> None:
+        """Point an entry at a different history entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["generation_id"] = generation_id
+                self._save_index()
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its file. Caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry["size"]
+        try:
+            (self._dir / entry["file"]).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> int:
+        """
+        Remove every cached result.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self._entries)
+            for key in list(self._entries):
+                self._remove(key)
+            if self.enabled:
+                self._save_index()
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and disk usage."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
+
+
+# Global result cache instance
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the global result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            config.get_cache_dir() / "results",
+            config.get_result_cache_max_bytes(),
+        )
+    return _result_cache
@@ -0,0 +1,72 @@
+"""
+Single-flight coalescing of identical concurrent async calls.
+
+The first caller for a key starts the work; callers arriving with the same key
+while it runs await the same result instead of repeating it.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class _Flight:
+    """One in-flight call and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by request parameters."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() once per key among concurrent callers.
+
+        The shared call is cancelled only when every caller waiting on it has
+        been cancelled, so one impatient client does not fail the others.
+
+        Args:
+            key: Identity of the call
+            factory: Coroutine factory doing the work
+
+        Returns:
+            Result of the shared call
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        """Drop a finished flight so later calls start fresh."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get in-flight and coalescing counters."""
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+        }
@@ -1,10 +1,47 @@
 """
 Task tracking for active downloads and generations.
+
+Also hosts the generation job scheduler: a bounded priority queue drained by
+a configurable pool of async inference workers. Among jobs of equal priority,
+the scheduler prefers ones that use the model (and profile) of the last job
+it started, so interleaved model sizes do not force a reload per job. Jobs
+are persisted through their on_update callback (see jobs.py).
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any, Callable, Awaitable, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
+from collections import OrderedDict
+import asyncio
+import heapq
+import itertools
+
+from .. import config
+
+
+# Job lifecycle states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETE = "complete"
+JOB_ERROR = "error"
+JOB_CANCELLED = "cancelled"
+
+_FINISHED_JOB_STATES = (JOB_COMPLETE, JOB_ERROR, JOB_CANCELLED)
+
+# Job kinds: user generations, and background voice prompt precomputation
+JOB_KIND_GENERATION = "generation"
+JOB_KIND_PRECOMPUTE = "precompute"
+
+# Number of finished jobs kept around so clients can still poll their result
+MAX_FINISHED_JOBS = 1000
+
+# Queued background jobs, counted apart from the user queue bound; beyond
+# this the oldest queued one is dropped for a new one
+MAX_QUEUED_BACKGROUND_JOBS = 16
+
+
+class QueueFullError(Exception):
+    """Raised when the generation job queue has reached its capacity."""
 
 
 @dataclass
@@ -23,14 +60,51 @@ class GenerationTask:
     profile_id: str
     text_preview: str  # First 50 chars of text
     started_at: datetime = field(default_factory=datetime.utcnow)
+    cancel: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+
+@dataclass
+class GenerationJob:
+    """Represents a queued generation job and its outcome."""
+    job_id: str
+    profile_id: str
+    text: str
+    run: Callable[[], Awaitable[Any]] = field(repr=False)
+    priority: int = 0  # Higher runs first
+    model_size: Optional[str] = None
+    status: str = JOB_QUEUED  # queued, running, complete, error, cancelled
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    skips: int = 0  # Times a later job was started ahead of this one
+    kind: str = JOB_KIND_GENERATION
+    # Called after every status change, e.g. to persist the job
+    on_update: Optional[Callable[["GenerationJob"], None]] = field(default=None, repr=False)
 
 
 class TaskManager:
-    """Manages active downloads and generations."""
+    """Manages active downloads, generations and the generation job queue."""
     
-    def __init__(self):
+    def __init__(self, max_queue_size: int = 100, affinity_max_skips: int = 8):
         self._active_downloads: Dict[str, DownloadTask] = {}
         self._active_generations: Dict[str, GenerationTask] = {}
+        self._jobs: "OrderedDict[str, GenerationJob]" = OrderedDict()
+        self._queue: List[Tuple[int, int, str]] = []  # heap of (-priority, seq, job_id)
+        self._sequence = itertools.count()
+        self._max_queue_size = max_queue_size
+        self._queue_condition: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        # Model-affinity scheduling
+        self._affinity_max_skips = max(0, affinity_max_skips)
+        self._last_model_size: Optional[str] = None
+        self._last_profile_id: Optional[str] = None
+        self._model_switches = 0
+        self._switches_avoided = 0
+        self._affinity_picks = 0
     
     def start_download(self, model_name: str) -> None:
         """Mark a download as started."""
@@ -59,6 +133,11 @@ class TaskManager:
             text_preview=text_preview,
         )
     
+    def set_generation_cancel(self, task_id: str, cancel: Callable[[], None]) -> None:
+        """Attach the callback that cancels an active generation."""
+        if task_id in self._active_generations:
+            self._active_generations[task_id].cancel = cancel
+    
     def complete_generation(self, task_id: str) -> None:
         """Mark a generation as complete."""
         if task_id in self._active_generations:
@@ -80,6 +159,316 @@ class TaskManager:
         """Check if a generation is active."""
         return task_id in self._active_generations
 
+    def cancel_generation(self, task_id: str) -> bool:
+        """
+        Cancel a queued job or a running generation.
+
+        Queued jobs are removed from the queue and never run. Running work is
+        cancelled through its cancel callback and stops at the model's next
+        decoding step.
+
+        Args:
+            task_id: Generation or job ID
+
+        Returns:
+            True if something was cancelled, False if nothing cancellable matched
+        """
+        job = self._jobs.get(task_id)
+        if job is not None and job.status == JOB_QUEUED:
+            self._drop_queued_job(job)
+            return True
+
+        if job is not None and job.status == JOB_RUNNING and job.task is not None:
+            job.cancel_requested = True
+            job.task.cancel()
+            return True
+
+        generation = self._active_generations.get(task_id)
+        if generation is not None and generation.cancel is not None:
+            generation.cancel()
+            return True
+
+        return False
+
+    # ------------------------------------------------------------------
+    # Generation job queue
+    # ------------------------------------------------------------------
+
+    def _drop_queued_job(self, job: GenerationJob) -> None:
+        """Remove a job from the queue and mark it cancelled."""
+        self._queue = [entry for entry in self._queue if entry[2] != job.job_id]
+        heapq.heapify(self._queue)
+        job.status = JOB_CANCELLED
+        job.cancel_requested = True
+        job.completed_at = datetime.utcnow()
+        self._notify_update(job)
+        self._prune_finished_jobs()
+
+    def _queued_jobs(self, background: bool) -> List[GenerationJob]:
+        """Get queued user or background jobs, oldest first."""
+        queued = (self._jobs[job_id] for _, _, job_id in sorted(self._queue, key=lambda entry: entry[1]))
+        return [job for job in queued if (job.kind == JOB_KIND_PRECOMPUTE) == background]
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Get the queue condition, creating it inside the running loop."""
+        if self._queue_condition is None:
+            self._queue_condition = asyncio.Condition()
+        return self._queue_condition
+
+    def set_max_queue_size(self, max_queue_size: int) -> None:
+        """Change the maximum number of queued jobs."""
+        self._max_queue_size = max(1, max_queue_size)
+
+    async def submit_job(
+        self,
+        job_id: str,
+        profile_id: str,
+        text: str,
+        run: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        model_size: Optional[str] = None,
+        kind: str = JOB_KIND_GENERATION,
+        on_update: Optional[Callable[[GenerationJob], None]] = None,
+        created_at: Optional[datetime] = None,
+        restore: bool = False,
+    ) -> GenerationJob:
+        """
+        Enqueue a generation job.
+
+        Args:
+            job_id: Job ID
+            profile_id: Profile the job generates for
+            text: Text being generated (used for previews)
+            run: Coroutine factory doing the actual work
+            priority: Scheduling priority (higher runs first)
+            model_size: Model size the job needs, if any
+            kind: Job kind (JOB_KIND_GENERATION or JOB_KIND_PRECOMPUTE)
+            on_update: Called with the job once queued and after every
+                status change
+            created_at: Original submission time of a restored job
+            restore: Whether the job was queued before a restart; restored
+                jobs are never rejected by the queue bound
+
+        Background jobs do not count against the queue bound, so they never
+        push user jobs out. At most MAX_QUEUED_BACKGROUND_JOBS of them wait
+        at once; a new one replaces the oldest.
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue is at capacity (user jobs only)
+        """
+        if kind == JOB_KIND_PRECOMPUTE:
+            queued = self._queued_jobs(background=True)
+            for job in queued[:max(0, len(queued) - MAX_QUEUED_BACKGROUND_JOBS + 1)]:
+                self._drop_queued_job(job)
+        elif not restore and len(self._queued_jobs(background=False)) >= self._max_queue_size:
+            raise QueueFullError(
+                f"Generation queue is full ({self._max_queue_size} jobs queued)"
+            )
+
+        job = GenerationJob(
+            job_id=job_id,
+            profile_id=profile_id,
+            text=text,
+            run=run,
+            priority=priority,
+            model_size=model_size,
+            kind=kind,
+            on_update=on_update,
+        )
+        if created_at is not None:
+            job.created_at = created_at
+        self._jobs[job_id] = job
+        heapq.heappush(self._queue, (-priority, next(self._sequence), job_id))
+        self._notify_update(job)
+
+        condition = self._get_condition()
+        async with condition:
+            condition.notify()
+
+        return job
+
+    def get_job(self, job_id: str) -> Optional[GenerationJob]:
+        """Get a job by ID (queued, running or recently finished)."""
+        return self._jobs.get(job_id)
+
+    def get_active_jobs(self, kind: Optional[str] = None) -> List[GenerationJob]:
+        """Get queued and running jobs, optionally only those of one kind."""
+        return [
+            job for job in self._jobs.values()
+            if job.status in (JOB_QUEUED, JOB_RUNNING) and kind in (None, job.kind)
+        ]
+
+    def get_queue_position(self, job_id: str) -> Optional[int]:
+        """Get the zero-based position of a queued job, or None if not queued."""
+        for position, (_, _, queued_id) in enumerate(sorted(self._queue)):
+            if queued_id == job_id:
+                return position
+        return None
+
+    def get_queue_depth(self) -> int:
+        """Get the number of jobs waiting to run."""
+        return len(self._queue)
+
+    def get_running_job_count(self) -> int:
+        """Get the number of jobs currently running."""
+        return sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+
+    async def _next_job(self) -> GenerationJob:
+        """Wait for and pop the next job to run."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: bool(self._queue))
+            entry = self._select_entry()
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+        job = self._jobs[entry[2]]
+        self._record_model_use(job)
+        return job
+
+    def _select_entry(self) -> Tuple[int, int, str]:
+        """
+        Pick the queue entry to run next.
+
+        The highest-priority, oldest job runs unless a job of the same
+        priority can reuse the last job's model, preferably with the same
+        profile. A job is passed over at most affinity_max_skips times, so
+        jobs for another model still run under sustained load.
+        """
+        head = self._queue[0]
+        head_job = self._jobs[head[2]]
+        if (
+            self._affinity_max_skips == 0
+            or self._last_model_size is None
+            or head_job.skips >= self._affinity_max_skips
+            or (
+                head_job.model_size in (None, self._last_model_size)
+                and head_job.profile_id == self._last_profile_id
+            )
+        ):
+            return head
+
+        # Same-priority entries in queue order
+        peers = sorted(entry for entry in self._queue if entry[0] == head[0])
+
+        def affinity(entry: Tuple[int, int, str]) -> int:
+            job = self._jobs[entry[2]]
+            if job.model_size not in (None, self._last_model_size):
+                return 0
+            return 2 if job.profile_id == self._last_profile_id else 1
+
+        best = max(peers, key=affinity)  # First of the best affinity class
+        if affinity(best) <= affinity(head):
+            return head
+
+        for entry in peers:
+            if entry == best:
+                break
+            self._jobs[entry[2]].skips += 1
+        self._affinity_picks += 1
+        if head_job.model_size not in (None, self._last_model_size):
+            self._switches_avoided += 1
+        return best
+
+    def _record_model_use(self, job: GenerationJob) -> None:
+        """Remember the model and profile of the job about to start."""
+        if job.model_size is not None:
+            if self._last_model_size not in (None, job.model_size):
+                self._model_switches += 1
+            self._last_model_size = job.model_size
+        self._last_profile_id = job.profile_id
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get model-affinity scheduling counters."""
+        return {
+            "affinity_max_skips": self._affinity_max_skips,
+            "last_model_size": self._last_model_size,
+            "model_switches": self._model_switches,
+            "switches_avoided": self._switches_avoided,
+            "affinity_picks": self._affinity_picks,
+        }
+
+    async def _run_job(self, job: GenerationJob) -> None:
+        """Run a single job and record its outcome."""
+        job.status = JOB_RUNNING
+        job.started_at = datetime.utcnow()
+        self._notify_update(job)
+        # Run in its own task so cancelling the job leaves the worker alive
+        job.task = asyncio.ensure_future(job.run())
+        if job.kind == JOB_KIND_GENERATION:
+            self.start_generation(job.job_id, job.profile_id, job.text)
+        try:
+            job.result = await job.task
+            job.status = JOB_COMPLETE
+        except asyncio.CancelledError:
+            if job.cancel_requested and job.task.cancelled():
+                job.status = JOB_CANCELLED
+                return
+            job.task.cancel()
+            job.status = JOB_ERROR
+            job.error = "Worker stopped before the job finished"
+            raise
+        except Exception as e:
+            job.status = JOB_ERROR
+            job.error = str(e)
+        finally:
+            job.task = None
+            job.completed_at = datetime.utcnow()
+            self.complete_generation(job.job_id)
+            self._notify_update(job)
+            self._prune_finished_jobs()
+
+    def _notify_update(self, job: GenerationJob) -> None:
+        """Run a job's on_update callback; its failures never stop the scheduler."""
+        if job.on_update is None:
+            return
+        try:
+            job.on_update(job)
+        except Exception as e:
+            print(f"Failed to record state of job {job.job_id}: {e}")
+
+    def _prune_finished_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS."""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in _FINISHED_JOB_STATES
+        ]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    async def _worker_loop(self) -> None:
+        """Continuously drain the job queue."""
+        while True:
+            job = await self._next_job()
+            await self._run_job(job)
+
+    def start_workers(self, num_workers: int) -> None:
+        """
+        Start the inference worker pool.
+
+        Must be called from within the running event loop.
+
+        Args:
+            num_workers: Number of jobs allowed to run concurrently
+        """
+        if self._workers:
+            return
+        for _ in range(max(1, num_workers)):
+            self._workers.append(asyncio.create_task(self._worker_loop()))
+
+    async def stop_workers(self) -> None:
+        """Cancel all workers and wait for them to exit."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def get_worker_count(self) -> int:
+        """Get the number of running workers."""
+        return len(self._workers)
+
 
 # Global task manager instance
 _task_manager: Optional[TaskManager] = None
@@ -89,5 +478,8 @@ def get_task_manager() -> TaskManager:
     """Get or create the global task manager."""
     global _task_manager
     if _task_manager is None:
-        _task_manager = TaskManager()
+        _task_manager = TaskManager(
+            max_queue_size=config.get_generation_queue_size(),
+            affinity_max_skips=config.get_scheduler_affinity_max_skips(),
+        )
     return _task_manager
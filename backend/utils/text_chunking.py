@@ -0,0 +1,240 @@
+"""
+Sentence and clause chunking for long-form synthesis.
+
+Splitting rules depend on the language code so that scripts without
+Latin punctuation (CJK, Devanagari, Arabic, Thai...) still break at natural
+boundaries.
+"""
+
+import re
+from typing import List
+
+
+# Sentence-final punctuation shared by most languages
+_DEFAULT_SENTENCE_END = ".!?…"
+# Clause separators used when a sentence alone is longer than a chunk
+_DEFAULT_CLAUSE_BREAK = ",;:—–"
+
+# Language-specific additions, keyed by base language code
+_SENTENCE_END_BY_LANGUAGE = {
+    "zh": "。！？；",
+    "yue": "。！？；",
+    "ja": "。！？",
+    "ko": "。！？",
+    "hi": "।॥",
+    "mr": "।॥",
+    "ne": "।॥",
+    "bn": "।॥",
+    "pa": "।॥",
+    "as": "।॥",
+    "mai": "।॥",
+    "ar": "؟",
+    "fa": "؟",
+    "ur": "؟۔",
+    "ps": "؟۔",
+    "ckb": "؟",
+    "my": "။",
+    "km": "។",
+    "am": "።፧",
+    "ti": "።፧",
+    "bo": "།",
+    "el": ";",  # Greek question mark
+    "hy": "։՞",
+}
+
+_CLAUSE_BREAK_BY_LANGUAGE = {
+    "zh": "，、：",
+    "yue": "，、：",
+    "ja": "、，：",
+    "ko": "，",
+    "ar": "،؛",
+    "fa": "،؛",
+    "ur": "،؛",
+    "ps": "،؛",
+    "ckb": "،؛",
+    "my": "၊",
+    "am": "፣፤",
+    "ti": "፣፤",
+}
+
+# Scripts written without spaces between words: punctuation ends a sentence
+# even when no whitespace follows it.
+_NO_SPACE_LANGUAGES = {"zh", "yue", "ja", "th", "lo", "km", "my", "bo"}
+
+# Common abbreviations that should not end a sentence
+_ABBREVIATIONS = {
+    "en": {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "inc", "ltd", "no"},
+    "de": {"z.b", "bzw", "usw", "dr", "nr", "ca", "vgl", "hr", "fr"},
+    "fr": {"m", "mme", "mlle", "dr", "etc", "cf", "p.ex"},
+    "es": {"sr", "sra", "srta", "dr", "dra", "etc", "ud", "uds"},
+    "pt": {"sr", "sra", "dr", "dra", "etc"},
+    "it": {"sig", "sigg", "dott", "ecc"},
+    "nl": {"dhr", "mevr", "dr", "bijv", "enz", "o.a"},
+}
+
+
+def _base_language(language: str) -> str:
+    """Reduce a regional code such as pt_br or zh_hans to its base language."""
+    return (language or "en").lower().replace("-", "_").split("_")[0]
+
+
+def split_sentences(text: str, language: str = "en") -> List[str]:
+    """
+    Split text into sentences using language-aware punctuation rules.
+
+    Args:
+        text: Input text
+        language: Language code (ISO 639-1 or regional variant)
+
+    Returns:
+        List of non-empty sentences with surrounding whitespace stripped
+    """
+    base = _base_language(language)
+    enders = _DEFAULT_SENTENCE_END + _SENTENCE_END_BY_LANGUAGE.get(base, "")
+    abbreviations = _ABBREVIATIONS.get(base, set())
+    no_space = base in _NO_SPACE_LANGUAGES
+
+    sentences = []
+    current = []
+    length = len(text)
+    i = 0
+
+    while i < length:
+        char = text[i]
+        current.append(char)
+
+        if char in enders:
+            # Swallow runs of terminal punctuation and closing quotes/brackets
+            while i + 1 < length and (text[i + 1] in enders or text[i + 1] in "\"'”’»)]」』）"):
+                i += 1
+                current.append(text[i])
+
+            at_boundary = i + 1 >= length or text[i + 1].isspace() or no_space or char not in ".!?…;"
+            if at_boundary and not _is_false_boundary(text, i, char, abbreviations):
+                sentence = "".join(current).strip()
+                if sentence:
+                    sentences.append(sentence)
+                current = []
+        elif char == "\n" and i + 1 < length and text[i + 1] == "\n":
+            # Paragraph breaks always end a sentence
+            sentence = "".join(current).strip()
+            if sentence:
+                sentences.append(sentence)
+            current = []
+
+        i += 1
+
+    tail = "".join(current).strip()
+    if tail:
+        sentences.append(tail)
+
+    return sentences
+
+
+def _is_false_boundary(text: str, index: int, char: str, abbreviations: set) -> bool:
+    """Detect periods that belong to numbers or abbreviations."""
+    if char != ".":
+        return False
+
+    # Decimal numbers such as 3.14
+    if index + 1 < len(text) and text[index + 1].isdigit() and index > 0 and text[index - 1].isdigit():
+        return True
+
+    # Abbreviations and single-letter initials ("J. Smith")
+    match = re.search(r"([\w.]+)\.$", text[:index + 1])
+    if match:
+        word = match.group(1)
+        if word.lower() in abbreviations:
+            return True
+        if len(word) == 1 and word.isupper():
+            return True
+
+    return False
+
+
+def _split_long_sentence(sentence: str, language: str, max_chars: int) -> List[str]:
+    """Break a sentence longer than max_chars at clause boundaries, then words."""
+    base = _base_language(language)
+    breaks = _DEFAULT_CLAUSE_BREAK + _CLAUSE_BREAK_BY_LANGUAGE.get(base, "")
+
+    clauses = []
+    current = ""
+    for char in sentence:
+        current += char
+        if char in breaks:
+            clauses.append(current)
+            current = ""
+    if current:
+        clauses.append(current)
+
+    pieces = []
+    for clause in clauses:
+        clause = clause.strip()
+        if not clause:
+            continue
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        if base in _NO_SPACE_LANGUAGES:
+            # No word boundaries to respect: cut at the character limit
+            pieces.extend(clause[i:i + max_chars] for i in range(0, len(clause), max_chars))
+            continue
+        words = clause.split()
+        line = ""
+        for word in words:
+            candidate = f"{line} {word}" if line else word
+            if len(candidate) > max_chars and line:
+                pieces.append(line)
+                line = word
+            else:
+                line = candidate
+        if line:
+            pieces.append(line)
+
+    return _merge_pieces(pieces, max_chars, base)
+
+
+def _merge_pieces(pieces: List[str], max_chars: int, base_language: str) -> List[str]:
+    """Greedily merge adjacent pieces while they fit in max_chars."""
+    joiner = "" if base_language in _NO_SPACE_LANGUAGES else " "
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}{joiner}{piece}" if current else piece
+        if current and len(candidate) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text_into_chunks(
+    text: str,
+    language: str = "en",
+    max_chars: int = 300,
+) -> List[str]:
+    """
+    Split text into synthesis chunks of whole sentences.
+
+    Short sentences are merged up to max_chars; sentences longer than that are
+    broken at clause punctuation, then at word boundaries.
+
+    Args:
+        text: Input text
+        language: Language code (ISO 639-1 or regional variant)
+        max_chars: Target maximum characters per chunk
+
+    Returns:
+        List of chunks (at least one when text is non-empty)
+    """
+    max_chars = max(1, max_chars)
+    pieces = []
+    for sentence in split_sentences(text, language):
+        if len(sentence) > max_chars:
+            pieces.extend(_split_long_sentence(sentence, language, max_chars))
+        else:
+            pieces.append(sentence)
+    return _merge_pieces(pieces, max_chars, _base_language(language))
@@ -0,0 +1,196 @@
+"""
+Startup cache warming.
+
+After a restart every prompt cache is cold, so each profile's first request
+pays for a full prompt build. The warm-up loads the configured model and
+builds (or reloads from disk) the prompts of the most-used profiles, ranked
+by their number of generations, within a time budget. It runs in the
+background so the server answers requests meanwhile. Progress is published
+on the model progress SSE channel under WARMUP_PROGRESS_NAME.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import time
+
+from sqlalchemy import desc, func
+from sqlalchemy.orm import Session
+
+from . import config, database, profiles
+from .database import Generation as DBGeneration, ProfileSample as DBProfileSample
+from .tts import get_tts_model
+from .utils.progress import get_progress_manager
+
+
+# Name of the warm-up on the progress channel (/models/progress/{name})
+WARMUP_PROGRESS_NAME = "cache-warmup"
+
+# Warm-up states
+WARMUP_DISABLED = "disabled"
+WARMUP_WARMING = "warming"
+WARMUP_READY = "ready"
+WARMUP_SKIPPED = "skipped"
+WARMUP_ERROR = "error"
+
+
+def get_hot_profile_ids(db: Session, limit: int) -> List[str]:
+    """
+    Rank profiles that have samples by their number of generations.
+
+    Args:
+        db: Database session
+        limit: Maximum number of profiles
+
+    Returns:
+        Profile IDs, most-used first
+    """
+    generation_count = func.count(DBGeneration.id)
+    rows = (
+        db.query(DBGeneration.profile_id, generation_count)
+        .filter(DBGeneration.profile_id.in_(db.query(DBProfileSample.profile_id)))
+        .group_by(DBGeneration.profile_id)
+        .order_by(desc(generation_count), DBGeneration.profile_id)
+        .limit(limit)
+        .all()
+    )
+    return [profile_id for profile_id, _ in rows]
+
+
+class CacheWarmer:
+    """Runs the startup warm-up and reports its state."""
+
+    def __init__(self):
+        self.status = WARMUP_DISABLED
+        self.model_size: Optional[str] = None
+        self.total = 0
+        self.warmed = 0
+        self.failed = 0
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up is not (or no longer) running."""
+        return self.status != WARMUP_WARMING
+
+    def start(self, max_profiles: int, model_size: str, budget_seconds: float) -> None:
+        """
+        Start warming in the background.
+
+        Must be called from within the running event loop.
+
+        Args:
+            max_profiles: Number of most-used profiles to warm (0 disables)
+            model_size: Model size to load and build prompts for
+            budget_seconds: Time after which no further profile is started
+        """
+        if max_profiles <= 0 or self._task is not None:
+            return
+        self.status = WARMUP_WARMING
+        self.model_size = model_size
+        self.started_at = datetime.utcnow()
+        self._task = asyncio.create_task(self._run(max_profiles, model_size, budget_seconds))
+
+    async def stop(self) -> None:
+        """Cancel a running warm-up."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _report(self, message: str) -> None:
+        """Publish progress on the SSE channel."""
+        get_progress_manager().update_progress(
+            model_name=WARMUP_PROGRESS_NAME,
+            current=self.warmed + self.failed,
+            total=self.total,
+            filename=message,
+            status=WARMUP_WARMING,
+        )
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        """Record the outcome and close the SSE channel."""
+        self.status = status
+        self.error = error
+        self.completed_at = datetime.utcnow()
+        progress_manager = get_progress_manager()
+        if status == WARMUP_ERROR:
+            progress_manager.mark_error(WARMUP_PROGRESS_NAME, error or "Warm-up failed")
+        else:
+            progress_manager.mark_complete(WARMUP_PROGRESS_NAME)
+
+    async def _run(self, max_profiles: int, model_size: str, budget_seconds: float) -> None:
+        """Load the model and warm the most-used profiles."""
+        deadline = time.monotonic() + budget_seconds
+        db = database.SessionLocal()
+        try:
+            profile_ids = get_hot_profile_ids(db, max_profiles)
+            self.total = len(profile_ids)
+            if not profile_ids:
+                self._finish(WARMUP_READY)
+                return
+
+            tts_model = get_tts_model()
+            if not tts_model._is_model_cached(model_size):
+                # Never start a multi-GB download just to warm caches
+                print(f"Warm-up skipped: model {model_size} is not downloaded")
+                self._finish(WARMUP_SKIPPED, f"Model {model_size} is not downloaded")
+                return
+
+            self._report(f"Loading model {model_size}")
+            await tts_model.load_model_async(model_size)
+
+            for profile_id in profile_ids:
+                if time.monotonic() >= deadline:
+                    print(f"Warm-up budget of {budget_seconds:.0f}s used up")
+                    break
+                self._report(f"Warming profile {profile_id}")
+                try:
+                    await profiles.create_voice_prompt_for_profile(
+                        profile_id,
+                        db,
+                        model_size=model_size,
+                    )
+                    self.warmed += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"Warm-up failed for profile {profile_id}: {e}")
+
+            print(f"Warm-up done: {self.warmed}/{self.total} profiles warmed")
+            self._finish(WARMUP_READY)
+        except asyncio.CancelledError:
+            self._finish(WARMUP_ERROR, "Warm-up cancelled")
+            raise
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+            self._finish(WARMUP_ERROR, str(e))
+        finally:
+            db.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the warm-up state and counters."""
+        return {
+            "status": self.status,
+            "model_size": self.model_size,
+            "total": self.total,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error": self.error,
+        }
+
+
+# Global cache warmer instance
+_cache_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create the global cache warmer."""
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer()
+    return _cache_warmer